@@ -8,6 +8,9 @@ from app.agents.prompts import ANALYZER_PROMPT
 from app.tools.meta_api import (
     list_campaigns,
     get_campaign_insights,
+    get_campaign_insights_batch,
+    get_daily_insights,
+    get_breakdown_insights,
 )
 from app.tools.database import get_monthly_summary
 
@@ -40,24 +43,24 @@ def create_analyzer_tools() -> list:
             else:
                 return "🟢" if value <= good else "🔴" if value >= bad else "🟡"
         
-        ctr_status = classify(i["ctr"], 1.5, 0.5)
-        cpc_status = classify(i["cpc"], 1.0, 3.0, higher_is_better=False)
+        ctr_status = classify(i.ctr, 1.5, 0.5)
+        cpc_status = classify(i.cpc, 1.0, 3.0, higher_is_better=False)
         
         lines = [
             f"📊 **Métricas - Período: {period}**\n",
             "| Métrica | Valor | Status |",
             "|---------|-------|--------|",
-            f"| Impressões | {i['impressions']:,} | - |",
-            f"| Cliques | {i['clicks']:,} | - |",
-            f"| CTR | {i['ctr']:.2f}% | {ctr_status} |",
-            f"| CPC | R$ {i['cpc']:.2f} | {cpc_status} |",
-            f"| CPM | R$ {i['cpm']:.2f} | - |",
-            f"| Alcance | {i['reach']:,} | - |",
-            f"| Gasto | R$ {i['spend']:.2f} | - |",
+            f"| Impressões | {i.impressions:,} | - |",
+            f"| Cliques | {i.clicks:,} | - |",
+            f"| CTR | {i.ctr:.2f}% | {ctr_status} |",
+            f"| CPC | R$ {i.cpc:.2f} | {cpc_status} |",
+            f"| CPM | R$ {i.cpm:.2f} | - |",
+            f"| Alcance | {i.reach:,} | - |",
+            f"| Gasto | R$ {i.spend:.2f} | - |",
         ]
         
-        if i["conversions"]:
-            lines.append(f"| Conversões | {i['conversions']} | - |")
+        if i.conversions:
+            lines.append(f"| Conversões | {i.conversions} | - |")
         
         return "\n".join(lines)
     
@@ -68,7 +71,7 @@ def create_analyzer_tools() -> list:
         Args:
             limit: Número de campanhas para comparar (padrão: 5)
         """
-        campaigns_result = await list_campaigns(status="ACTIVE", limit=limit)
+        campaigns_result = await list_campaigns(status="ACTIVE", limit=limit, fields="minimal")
         
         if not campaigns_result["success"]:
             return f"❌ Erro: {campaigns_result['error']}"
@@ -80,13 +83,20 @@ def create_analyzer_tools() -> list:
         lines.append("| Campanha | Gasto | CTR | CPC |")
         lines.append("|----------|-------|-----|-----|")
         
+        batch_result = await get_campaign_insights_batch(
+            [camp.id for camp in campaigns_result["campaigns"]],
+            "last_7d",
+            fields="dashboard",
+        )
+        insights_by_campaign = batch_result.get("results", {})
+        
         for camp in campaigns_result["campaigns"]:
-            insights = await get_campaign_insights(camp["id"], "last_7d")
+            insights = insights_by_campaign.get(camp.id, {"success": False})
             if insights["success"]:
                 i = insights["insights"]
-                lines.append(f"| {camp['name'][:20]} | R$ {i['spend']:.0f} | {i['ctr']:.2f}% | R$ {i['cpc']:.2f} |")
+                lines.append(f"| {camp.name[:20]} | R$ {i.spend:.0f} | {i.ctr:.2f}% | R$ {i.cpc:.2f} |")
             else:
-                lines.append(f"| {camp['name'][:20]} | - | - | - |")
+                lines.append(f"| {camp.name[:20]} | - | - | - |")
         
         return "\n".join(lines)
     
@@ -142,20 +152,20 @@ def create_analyzer_tools() -> list:
         suggestions = []
         
         # Analisar CTR
-        if i["ctr"] < 0.5:
+        if i.ctr < 0.5:
             problems.append("🔴 CTR muito baixo (< 0.5%)")
             suggestions.append("• Testar novos criativos com gatilhos diferentes")
             suggestions.append("• Revisar segmentação de público")
-        elif i["ctr"] < 1.0:
+        elif i.ctr < 1.0:
             problems.append("🟡 CTR abaixo da média (< 1.0%)")
             suggestions.append("• Considerar teste A/B de criativos")
         
         # Analisar CPC
-        if i["cpc"] > 3.0:
+        if i.cpc > 3.0:
             problems.append("🔴 CPC muito alto (> R$ 3,00)")
             suggestions.append("• Público pode estar muito competitivo")
             suggestions.append("• Testar horários diferentes de veiculação")
-        elif i["cpc"] > 1.5:
+        elif i.cpc > 1.5:
             problems.append("🟡 CPC acima da média")
         
         # Resultado
@@ -179,11 +189,101 @@ def create_analyzer_tools() -> list:
         
         return "\n".join(lines)
     
+    async def tool_get_daily_trend(campaign_id: str, days: int = 7) -> str:
+        """
+        Mostra a tendência diária de uma campanha: últimos N dias contra os
+        N dias anteriores.
+        
+        Args:
+            campaign_id: ID da campanha no Meta
+            days: Tamanho da janela em dias (padrão: 7)
+        """
+        result = await get_daily_insights("last_30d", campaign_ids=[campaign_id])
+        
+        if not result["success"]:
+            return f"❌ Erro: {result['error']}"
+        
+        series = result["series"]
+        if len(series.days) < days:
+            return "📭 Sem dados diários suficientes para essa campanha."
+        
+        current = series.totals(campaign_id, last=days)
+        previous = series.totals(
+            campaign_id,
+            start=series.days[max(0, len(series.days) - 2 * days)],
+            end=series.days[-days - 1],
+        ) if len(series.days) > days else None
+        
+        def change(metric):
+            if not previous or not previous[metric]:
+                return "-"
+            delta = (current[metric] - previous[metric]) / previous[metric] * 100
+            return f"{'🔺' if delta > 0 else '🔻'} {delta:+.0f}%"
+        
+        spend_by_day = series.series(campaign_id, "spend", last=days)
+        
+        lines = [
+            f"📈 **Tendência - últimos {days} dias**\n",
+            "| Métrica | Atual | Variação |",
+            "|---------|-------|----------|",
+            f"| Gasto | R$ {current['spend']:.2f} | {change('spend')} |",
+            f"| CTR | {current['ctr']:.2f}% | {change('ctr')} |",
+            f"| CPC | R$ {current['cpc']:.2f} | {change('cpc')} |",
+            f"| Conversões | {current['conversions']:.0f} | {change('conversions')} |",
+            "",
+            "**Gasto por dia:** " + " | ".join(f"R$ {v:.0f}" for v in spend_by_day),
+        ]
+        
+        return "\n".join(lines)
+    
+    async def tool_get_breakdown(
+        breakdown: str = "placement",
+        campaign_id: str = None,
+        period: str = "last_7d",
+        top: int = 10
+    ) -> str:
+        """
+        Mostra resultados quebrados por posicionamento ou público.
+        
+        Args:
+            breakdown: placement, demographic, age, gender, region, country,
+                publisher_platform, platform_position ou device_platform
+            campaign_id: ID da campanha (opcional; sem ele, a conta toda)
+            period: today, yesterday, last_7d, last_14d, last_30d, this_month
+            top: Quantos grupos mostrar (padrão: 10, ordenados por gasto)
+        """
+        result = await get_breakdown_insights(breakdown, period, campaign_id=campaign_id)
+        
+        if not result["success"]:
+            return f"❌ Erro: {result['error']}"
+        
+        groups = result["store"].query(top=top)
+        if not groups:
+            return "📭 Sem dados para esse breakdown no período."
+        
+        dimensions = result["breakdowns"]
+        lines = [
+            f"🧩 **Resultados por {', '.join(dimensions)} - Período: {period}**\n",
+            "| Segmento | Gasto | CTR | CPC | Conversões |",
+            "|----------|-------|-----|-----|------------|",
+        ]
+        
+        for g in groups:
+            segment = " / ".join(g[d] or "-" for d in dimensions)
+            lines.append(
+                f"| {segment} | R$ {g['spend']:.2f} | {g['ctr']:.2f}% | "
+                f"R$ {g['cpc']:.2f} | {g['conversions']:.0f} |"
+            )
+        
+        return "\n".join(lines)
+    
     return [
         tool_get_campaign_metrics,
         tool_compare_campaigns,
         tool_get_account_summary,
         tool_diagnose_campaign,
+        tool_get_daily_trend,
+        tool_get_breakdown,
     ]
 
 
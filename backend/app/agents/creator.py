@@ -8,7 +8,7 @@ from app.agents.prompts import CREATOR_PROMPT
 from app.tools.meta_api import (
     create_campaign,
     list_campaigns,
-    get_campaign_details,
+    load_campaign_hierarchy,
 )
 
 
@@ -50,7 +50,7 @@ def create_creator_tools() -> list:
             status: Filtrar por ACTIVE, PAUSED, ou ARCHIVED (opcional)
             limit: Número máximo de campanhas (padrão: 10)
         """
-        result = await list_campaigns(status=status, limit=limit)
+        result = await list_campaigns(status=status, limit=limit, fields="dashboard")
         
         if not result["success"]:
             return f"❌ Erro: {result['error']}"
@@ -60,9 +60,9 @@ def create_creator_tools() -> list:
         
         lines = [f"📋 **{result['total']} campanhas encontradas:**\n"]
         for camp in result["campaigns"]:
-            status_emoji = "🟢" if camp["status"] == "ACTIVE" else "🟡" if camp["status"] == "PAUSED" else "⚫"
-            lines.append(f"{status_emoji} **{camp['name']}**")
-            lines.append(f"   ID: {camp['id']} | Objetivo: {camp['objective']}")
+            status_emoji = "🟢" if camp.status == "ACTIVE" else "🟡" if camp.status == "PAUSED" else "⚫"
+            lines.append(f"{status_emoji} **{camp.name}**")
+            lines.append(f"   ID: {camp.id} | Objetivo: {camp.objective}")
         
         return "\n".join(lines)
     
@@ -73,27 +73,31 @@ def create_creator_tools() -> list:
         Args:
             campaign_id: ID da campanha no Meta (ex: "123456789")
         """
-        result = await get_campaign_details(campaign_id)
+        result = await load_campaign_hierarchy(campaign_id, fields="dashboard")
         
         if not result["success"]:
             return f"❌ Erro: {result['error']}"
         
-        camp = result["campaign"]
+        tree = result["tree"]
+        camp = tree.campaign
         lines = [
-            f"📢 **{camp['name']}**",
-            f"ID: {camp['id']}",
-            f"Objetivo: {camp['objective']}",
-            f"Status: {camp['status']}",
+            f"📢 **{camp.name}**",
+            f"ID: {camp.id}",
+            f"Objetivo: {camp.objective}",
+            f"Status: {camp.status}",
         ]
         
-        if camp.get("daily_budget"):
-            lines.append(f"Orçamento Diário: R$ {int(camp['daily_budget'])/100:.2f}")
+        if camp.daily_budget:
+            lines.append(f"Orçamento Diário: R$ {camp.daily_budget/100:.2f}")
         
-        adsets = camp.get("adsets", {}).get("data", [])
+        adsets = tree.adsets()
         if adsets:
-            lines.append(f"\n📦 **{len(adsets)} Ad Set(s):**")
+            lines.append(f"\n📦 **{len(adsets)} Ad Set(s), {result['ads_total']} anúncio(s):**")
             for adset in adsets:
-                lines.append(f"  • {adset['name']} ({adset['status']})")
+                lines.append(f"  • {adset.name} ({adset.status}) - {len(tree.ads(adset.id))} anúncio(s)")
+        
+        if result["partial"]:
+            lines.append(f"\n⚠️ Lista incompleta: {result['error']}")
         
         return "\n".join(lines)
     
@@ -7,9 +7,16 @@ from app.config import settings
 from app.agents.prompts import OPTIMIZER_PROMPT
 from app.tools.meta_api import (
     list_campaigns,
-    get_campaign_insights,
+    get_account_insights_by_object,
+    get_daily_insights,
     update_campaign_status,
+    update_campaigns_status,
 )
+from app.tools.meta_records import InsightRow
+
+
+# Métricas de campanhas sem entrega no período (ausentes no relatório da Meta)
+EMPTY_INSIGHTS = InsightRow.empty()
 
 
 def create_optimizer_tools() -> list:
@@ -22,27 +29,40 @@ def create_optimizer_tools() -> list:
         Args:
             threshold_roas: ROAS mínimo aceitável (padrão: 1.0x = break-even)
         """
-        campaigns_result = await list_campaigns(status="ACTIVE", limit=20)
+        campaigns_result = await list_campaigns(status="ACTIVE", limit=20, fields="minimal")
         
         if not campaigns_result["success"]:
             return f"❌ Erro: {campaigns_result['error']}"
         
         underperformers = []
         
+        # Métricas de todas as campanhas ativas em poucas chamadas paginadas
+        insights_result = await get_account_insights_by_object(
+            "campaign", "last_7d", status="ACTIVE", fields="dashboard"
+        )
+        
+        if not insights_result["success"]:
+            return f"❌ Erro: {insights_result['error']}"
+        
         for camp in campaigns_result["campaigns"]:
-            insights = await get_campaign_insights(camp["id"], "last_7d")
-            if insights["success"]:
-                i = insights["insights"]
-                # Calcular ROAS aproximado (se tiver conversões)
-                # Por simplicidade, usando CTR como proxy
-                if i["ctr"] < 0.5:
-                    underperformers.append({
-                        "name": camp["name"],
-                        "id": camp["id"],
-                        "ctr": i["ctr"],
-                        "spend": i["spend"],
-                        "reason": "CTR muito baixo"
-                    })
+            i = insights_result["insights"].get(camp.id, EMPTY_INSIGHTS)
+            # ROAS = receita (action_values dos tipos de ação da conta) / gasto;
+            # sem receita (contas de leads ou tráfego) o ROAS não diz nada e
+            # vale só o critério de CTR
+            if i.spend > 0 and i.revenue > 0 and i.roas < threshold_roas:
+                reason = f"ROAS {i.roas:.2f}x abaixo da meta de {threshold_roas:.2f}x"
+            elif i.ctr < 0.5:
+                reason = "CTR muito baixo"
+            else:
+                continue
+            underperformers.append({
+                "name": camp.name,
+                "id": camp.id,
+                "ctr": i.ctr,
+                "roas": i.roas,
+                "spend": i.spend,
+                "reason": reason
+            })
         
         if not underperformers:
             return "✅ Nenhuma campanha com performance crítica encontrada!"
@@ -54,7 +74,7 @@ def create_optimizer_tools() -> list:
         total_waste = 0
         for camp in underperformers:
             lines.append(f"🔴 **{camp['name']}**")
-            lines.append(f"   CTR: {camp['ctr']:.2f}% | Gasto: R$ {camp['spend']:.2f}")
+            lines.append(f"   ROAS: {camp['roas']:.2f}x | CTR: {camp['ctr']:.2f}% | Gasto: R$ {camp['spend']:.2f}")
             lines.append(f"   Motivo: {camp['reason']}")
             total_waste += camp["spend"]
         
@@ -70,31 +90,38 @@ def create_optimizer_tools() -> list:
         Args:
             min_ctr: CTR mínimo para considerar vencedora (padrão: 1.5%)
         """
-        campaigns_result = await list_campaigns(status="ACTIVE", limit=20)
+        campaigns_result = await list_campaigns(status="ACTIVE", limit=20, fields="minimal")
         
         if not campaigns_result["success"]:
             return f"❌ Erro: {campaigns_result['error']}"
         
         winners = []
         
+        # Métricas de todas as campanhas ativas em poucas chamadas paginadas
+        insights_result = await get_account_insights_by_object(
+            "campaign", "last_7d", status="ACTIVE", fields="dashboard"
+        )
+        
+        if not insights_result["success"]:
+            return f"❌ Erro: {insights_result['error']}"
+        
         for camp in campaigns_result["campaigns"]:
-            insights = await get_campaign_insights(camp["id"], "last_7d")
-            if insights["success"]:
-                i = insights["insights"]
-                if i["ctr"] >= min_ctr and i["spend"] > 0:
-                    winners.append({
-                        "name": camp["name"],
-                        "id": camp["id"],
-                        "ctr": i["ctr"],
-                        "cpc": i["cpc"],
-                        "spend": i["spend"],
-                    })
+            i = insights_result["insights"].get(camp.id, EMPTY_INSIGHTS)
+            if i.ctr >= min_ctr and i.spend > 0:
+                winners.append({
+                    "name": camp.name,
+                    "id": camp.id,
+                    "ctr": i.ctr,
+                    "cpc": i.cpc,
+                    "roas": i.roas,
+                    "spend": i.spend,
+                })
         
         if not winners:
             return "📊 Nenhuma campanha atingiu os critérios de vencedora no período."
         
-        # Ordenar por CTR
-        winners.sort(key=lambda x: x["ctr"], reverse=True)
+        # Ordenar por ROAS e, no empate (contas sem receita), por CTR
+        winners.sort(key=lambda x: (x["roas"], x["ctr"]), reverse=True)
         
         lines = [
             f"🏆 **{len(winners)} campanha(s) vencedora(s):**\n"
@@ -102,7 +129,7 @@ def create_optimizer_tools() -> list:
         
         for camp in winners:
             lines.append(f"🟢 **{camp['name']}**")
-            lines.append(f"   CTR: {camp['ctr']:.2f}% | CPC: R$ {camp['cpc']:.2f}")
+            lines.append(f"   ROAS: {camp['roas']:.2f}x | CTR: {camp['ctr']:.2f}% | CPC: R$ {camp['cpc']:.2f}")
             lines.append(f"   Gasto atual: R$ {camp['spend']:.2f}/semana")
             # Sugerir aumento de 30%
             new_budget = camp["spend"] * 1.3
@@ -128,6 +155,30 @@ def create_optimizer_tools() -> list:
         else:
             return f"❌ Erro ao pausar: {result['error']}"
     
+    async def tool_pause_campaigns(campaign_ids: list[str], reason: str = "") -> str:
+        """
+        Pausa várias campanhas de uma vez (use em vez de chamar
+        tool_pause_campaign uma vez por campanha).
+        
+        Args:
+            campaign_ids: IDs das campanhas a serem pausadas
+            reason: Motivo da pausa (para registro)
+        """
+        result = await update_campaigns_status(campaign_ids, "PAUSED")
+        
+        if "results" not in result:
+            return f"❌ Erro ao pausar: {result['error']}"
+        
+        lines = [f"⏸️ {result['updated']} de {result['total']} campanhas pausadas"]
+        if reason:
+            lines.append(f"Motivo: {reason}")
+        
+        for campaign_id, item in result["results"].items():
+            if not item["success"]:
+                lines.append(f"❌ {campaign_id}: {item['error']}")
+        
+        return "\n".join(lines)
+    
     async def tool_activate_campaign(campaign_id: str) -> str:
         """
         Ativa uma campanha que estava pausada.
@@ -146,7 +197,7 @@ def create_optimizer_tools() -> list:
         """
         Gera um plano de otimização completo para a conta.
         """
-        campaigns_result = await list_campaigns(status="ACTIVE", limit=20)
+        campaigns_result = await list_campaigns(status="ACTIVE", limit=20, fields="minimal")
         
         if not campaigns_result["success"]:
             return f"❌ Erro: {campaigns_result['error']}"
@@ -154,20 +205,30 @@ def create_optimizer_tools() -> list:
         immediate_actions = []
         planned_actions = []
         
+        # Métricas de todas as campanhas ativas em poucas chamadas paginadas
+        insights_result = await get_account_insights_by_object(
+            "campaign", "last_7d", status="ACTIVE", fields="dashboard"
+        )
+        
+        if not insights_result["success"]:
+            return f"❌ Erro: {insights_result['error']}"
+        
         for camp in campaigns_result["campaigns"]:
-            insights = await get_campaign_insights(camp["id"], "last_7d")
-            if insights["success"]:
-                i = insights["insights"]
-                
-                # Ações imediatas
-                if i["ctr"] < 0.3:
-                    immediate_actions.append(f"⏸️ **Pausar** '{camp['name']}' - CTR crítico ({i['ctr']:.2f}%)")
-                elif i["ctr"] > 2.0:
-                    immediate_actions.append(f"💰 **Escalar** '{camp['name']}' - CTR excelente ({i['ctr']:.2f}%)")
-                
-                # Ações planejadas
-                if 0.3 <= i["ctr"] < 1.0:
-                    planned_actions.append(f"🔧 Testar novos criativos para '{camp['name']}'")
+            i = insights_result["insights"].get(camp.id, EMPTY_INSIGHTS)
+            
+            # Ações imediatas (cortar com ROAS < 1x, escalar com ROAS > 4x)
+            if i.spend > 0 and i.revenue > 0 and i.roas < 1.0:
+                immediate_actions.append(f"⏸️ **Pausar** '{camp.name}' - ROAS abaixo do break-even ({i.roas:.2f}x)")
+            elif i.roas > 4.0:
+                immediate_actions.append(f"💰 **Escalar** '{camp.name}' - ROAS excelente ({i.roas:.2f}x)")
+            elif i.ctr < 0.3:
+                immediate_actions.append(f"⏸️ **Pausar** '{camp.name}' - CTR crítico ({i.ctr:.2f}%)")
+            elif i.ctr > 2.0:
+                immediate_actions.append(f"💰 **Escalar** '{camp.name}' - CTR excelente ({i.ctr:.2f}%)")
+            
+            # Ações planejadas
+            if 0.3 <= i.ctr < 1.0:
+                planned_actions.append(f"🔧 Testar novos criativos para '{camp.name}'")
         
         lines = ["🔧 **Plano de Otimização**\n"]
         
@@ -188,12 +249,59 @@ def create_optimizer_tools() -> list:
         
         return "\n".join(lines)
     
+    async def tool_check_budget_pacing(days: int = 3) -> str:
+        """
+        Verifica o ritmo de gasto das campanhas ativas em relação ao
+        orçamento diário (gasto médio dos últimos dias).
+        
+        Args:
+            days: Quantos dias recentes considerar (padrão: 3)
+        """
+        campaigns_result = await list_campaigns(status="ACTIVE", limit=50, fields="dashboard")
+        
+        if not campaigns_result["success"]:
+            return f"❌ Erro: {campaigns_result['error']}"
+        
+        budgeted = [c for c in campaigns_result["campaigns"] if c.daily_budget]
+        if not budgeted:
+            return "📭 Nenhuma campanha ativa com orçamento diário."
+        
+        daily_result = await get_daily_insights(
+            "last_7d", campaign_ids=[c.id for c in budgeted]
+        )
+        
+        if not daily_result["success"]:
+            return f"❌ Erro: {daily_result['error']}"
+        
+        series = daily_result["series"]
+        lines = [f"⏱️ **Ritmo de gasto (média dos últimos {days} dias)**\n"]
+        
+        for camp in budgeted:
+            budget = camp.daily_budget / 100
+            window = series.series(camp.id, "spend", last=days)
+            avg_spend = sum(window) / len(window) if window else 0.0
+            pacing = avg_spend / budget * 100 if budget else 0
+            
+            if pacing < 50:
+                flag = "🔴 Subentregando"
+            elif pacing > 110:
+                flag = "🟠 Acima do orçamento"
+            else:
+                flag = "🟢 No ritmo"
+            
+            lines.append(f"{flag} **{camp.name}**")
+            lines.append(f"   Média: R$ {avg_spend:.2f}/dia de R$ {budget:.2f} ({pacing:.0f}%)")
+        
+        return "\n".join(lines)
+    
     return [
         tool_identify_underperformers,
         tool_identify_winners,
         tool_pause_campaign,
+        tool_pause_campaigns,
         tool_activate_campaign,
         tool_generate_optimization_plan,
+        tool_check_budget_pacing,
     ]
 
 
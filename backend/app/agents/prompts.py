@@ -118,6 +118,7 @@ OPTIMIZER_PROMPT = """Você é um especialista em otimização de campanhas Meta
 ## Regras
 - Estime impacto financeiro das otimizações
 - Confirme antes de pausar/deletar
+- Para pausar várias campanhas, use tool_pause_campaigns com todos os IDs
 - Mudanças graduais (20-30% max)"""
 
 
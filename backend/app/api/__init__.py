@@ -5,6 +5,7 @@ from fastapi import APIRouter
 from app.api.chat import router as chat_router
 from app.api.campaigns import router as campaigns_router
 from app.api.sync import router as sync_router
+from app.api.webhooks import router as webhooks_router
 
 router = APIRouter()
 
@@ -12,3 +13,4 @@ router = APIRouter()
 router.include_router(chat_router, prefix="/agent", tags=["Agent"])
 router.include_router(campaigns_router, prefix="/campaigns", tags=["Campaigns"])
 router.include_router(sync_router, prefix="/sync", tags=["Sync"])
+router.include_router(webhooks_router, prefix="/webhooks", tags=["Webhooks"])
@@ -4,16 +4,23 @@ API de Campanhas - Proxy para Meta API
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
 
 from app.tools.meta_api import (
     list_campaigns,
     get_campaign_details,
     create_campaign,
     update_campaign_status,
+    update_campaigns_status,
     get_campaign_insights,
     get_account_insights,
+    get_breakdown_insights,
     duplicate_campaign,
+    copy_campaign_in_chunks,
+    COPY_TOO_LARGE,
 )
+from app.jobs import jobs, JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_RUNNING
+from app.store import store
 
 
 router = APIRouter()
@@ -32,18 +39,26 @@ class UpdateStatusRequest(BaseModel):
     status: str  # ACTIVE, PAUSED, ARCHIVED
 
 
+class BulkUpdateStatusRequest(BaseModel):
+    """Request para atualizar o status de várias campanhas."""
+    campaign_ids: list[str]
+    status: str  # ACTIVE, PAUSED, ARCHIVED
+
+
 class DuplicateCampaignRequest(BaseModel):
     """Request para duplicar campanha."""
     name_suffix: str = " - Cópia"
     deep_copy: bool = False  # Copiar ad sets e ads também (padrão False para evitar limite)
     status_option: str = "PAUSED"  # Status da nova campanha
+    chunked: bool = False  # Cópia profunda em partes, como job em segundo plano
 
 
 @router.get("/")
 async def get_campaigns(
     status: Optional[str] = None,
     limit: int = 50,
-    include_drafts: bool = True
+    include_drafts: bool = True,
+    fields: Optional[str] = None
 ):
     """
     Lista campanhas da conta Meta Ads.
@@ -52,8 +67,14 @@ async def get_campaigns(
         status: Filtrar por ACTIVE, PAUSED, ARCHIVED
         limit: Número máximo de campanhas (padrão: 50)
         include_drafts: Incluir rascunhos (padrão: True)
+        fields: Perfil (minimal, dashboard, full) ou campos separados por vírgula
     """
-    result = await list_campaigns(status=status, limit=limit, include_drafts=include_drafts)
+    result = await list_campaigns(
+        status=status,
+        limit=limit,
+        include_drafts=include_drafts,
+        fields=fields,
+    )
     
     if not result["success"]:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -62,14 +83,16 @@ async def get_campaigns(
 
 
 @router.get("/{campaign_id}")
-async def get_campaign(campaign_id: str):
+async def get_campaign(campaign_id: str, fields: Optional[str] = None):
     """
-    Busca detalhes de uma campanha específica.
+    Busca detalhes de uma campanha específica, com todos os ad sets e
+    anúncios (os cursores dos edges aninhados são seguidos em paralelo).
     
     Args:
         campaign_id: ID da campanha no Meta
+        fields: Perfil (minimal, dashboard, full) ou campos separados por vírgula
     """
-    result = await get_campaign_details(campaign_id)
+    result = await get_campaign_details(campaign_id, fields=fields)
     
     if not result["success"]:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -102,6 +125,29 @@ async def create_new_campaign(request: CreateCampaignRequest):
     return result
 
 
+@router.patch("/status")
+async def update_status_bulk(request: BulkUpdateStatusRequest):
+    """
+    Atualiza o status de várias campanhas em uma operação.
+    
+    Status válidos: ACTIVE, PAUSED, ARCHIVED. O resultado de cada campanha
+    vem em "results"; falhas parciais não derrubam a requisição (só dá 400
+    se nenhuma campanha foi atualizada).
+    """
+    if request.status not in ["ACTIVE", "PAUSED", "ARCHIVED"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Status deve ser ACTIVE, PAUSED ou ARCHIVED"
+        )
+    
+    result = await update_campaigns_status(request.campaign_ids, request.status)
+    
+    if not result["success"] and not result.get("updated"):
+        raise HTTPException(status_code=400, detail=result.get("error") or result.get("results"))
+    
+    return result
+
+
 @router.patch("/{campaign_id}/status")
 async def update_status(campaign_id: str, request: UpdateStatusRequest):
     """
@@ -126,7 +172,8 @@ async def update_status(campaign_id: str, request: UpdateStatusRequest):
 @router.get("/{campaign_id}/insights")
 async def get_insights(
     campaign_id: str,
-    date_preset: str = "last_7d"
+    date_preset: str = "last_7d",
+    fields: Optional[str] = None
 ):
     """
     Busca insights/métricas de uma campanha.
@@ -135,6 +182,8 @@ async def get_insights(
     - today, yesterday
     - last_7d, last_14d, last_30d
     - this_month, last_month
+    
+    fields: perfil (minimal, dashboard, full) ou métricas separadas por vírgula
     """
     valid_presets = [
         "today", "yesterday",
@@ -148,7 +197,7 @@ async def get_insights(
             detail=f"date_preset deve ser um de: {', '.join(valid_presets)}"
         )
     
-    result = await get_campaign_insights(campaign_id, date_preset)
+    result = await get_campaign_insights(campaign_id, date_preset, fields=fields)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -156,15 +205,64 @@ async def get_insights(
     return result
 
 
+@router.get("/{campaign_id}/insights/breakdown")
+async def get_insights_breakdown(
+    campaign_id: str,
+    breakdown: str = "age",
+    date_preset: str = "last_7d",
+    top: Optional[int] = None
+):
+    """
+    Busca métricas de uma campanha quebradas por dimensão.
+    
+    breakdown: age, gender, country, region, publisher_platform,
+    platform_position, device_platform ou os atalhos placement
+    (plataforma + posição) e demographic (idade + gênero). Vários podem
+    ser combinados com vírgula.
+    """
+    valid_presets = [
+        "today", "yesterday",
+        "last_7d", "last_14d", "last_30d",
+        "this_month", "last_month"
+    ]
+    
+    if date_preset not in valid_presets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"date_preset deve ser um de: {', '.join(valid_presets)}"
+        )
+    
+    result = await get_breakdown_insights(breakdown, date_preset, campaign_id=campaign_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    
+    return {
+        "success": True,
+        "campaign_id": campaign_id,
+        "period": date_preset,
+        "breakdowns": result["breakdowns"],
+        "rows": result["rows"],
+        "results": result["store"].query(top=top),
+    }
+
+
 @router.post("/{campaign_id}/duplicate")
 async def duplicate(campaign_id: str, request: DuplicateCampaignRequest):
     """
     Duplica uma campanha existente na Meta API usando o endpoint /copies.
 
+    Com deep_copy, campanhas grandes demais para uma única cópia (ou com
+    chunked=true) são copiadas em partes por um job em segundo plano; a
+    resposta traz o job_id.
+
     Args:
         campaign_id: ID da campanha original no Meta
         request: Request com opções de duplicação
     """
+    if request.chunked:
+        return _start_copy_job(campaign_id, request)
+
     result = await duplicate_campaign(
         campaign_id,
         name_suffix=request.name_suffix,
@@ -172,14 +270,127 @@ async def duplicate(campaign_id: str, request: DuplicateCampaignRequest):
         status_option=request.status_option
     )
 
+    # Cópia profunda grande demais para um /copies: copiar em partes
+    if (
+        request.deep_copy
+        and not result["success"]
+        and (result.get("error_code"), result.get("error_subcode")) == COPY_TOO_LARGE
+    ):
+        return _start_copy_job(campaign_id, request)
+
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
 
     return result
 
 
+@router.post("/copies/{job_id}/resume")
+async def resume_copy(job_id: str):
+    """
+    Retoma uma cópia em partes que falhou, foi cancelada ou foi
+    interrompida por um reinício do servidor.
+
+    Reaproveita o checkpoint do job anterior: o que já foi copiado não é
+    copiado de novo. Jobs de antes de um reinício são retomados pelo
+    checkpoint gravado no banco local (meta_copy_checkpoints); sem
+    DATABASE_URL só os jobs do processo atual podem ser retomados.
+    Retorna um novo job.
+    """
+    job = jobs.get(job_id)
+
+    if job is not None:
+        if job.kind != "campaign_copy":
+            raise HTTPException(status_code=404, detail="Job de cópia não encontrado")
+        if job.status not in (JOB_FAILED, JOB_CANCELLED):
+            raise HTTPException(status_code=400, detail="Só cópias com falha ou canceladas podem ser retomadas")
+        campaign_id, request, checkpoint = job.params["campaign_id"], job.params["request"], job.state.get("checkpoint")
+    else:
+        saved = await store.copy_checkpoint(job_id)
+        if saved is None:
+            detail = "Job de cópia não encontrado"
+            if not store.enabled:
+                detail += " (sem DATABASE_URL, cópias de antes de um reinício não podem ser retomadas)"
+            raise HTTPException(status_code=404, detail=detail)
+        if saved["status"] == JOB_COMPLETED:
+            raise HTTPException(status_code=400, detail="Cópia já concluída")
+        # Status "running" sem job no processo: interrompida por um reinício
+        campaign_id, request, checkpoint = saved["campaign_id"], saved["request"], saved["checkpoint"]
+
+    return _start_copy_job(campaign_id, DuplicateCampaignRequest(**request), checkpoint)
+
+
+def _start_copy_job(
+    campaign_id: str,
+    request: DuplicateCampaignRequest,
+    checkpoint: Optional[dict] = None
+) -> dict:
+    """
+    Agenda copy_campaign_in_chunks como job; acompanhe em GET /api/sync/jobs/{id}.
+
+    O progresso do job traz só as contagens. O mapa origem -> cópia fica
+    em job.state e vai para o banco local (meta_copy_checkpoints) a cada
+    etapa e quando o job termina (inclusive cancelado ou no desligamento
+    do servidor).
+    """
+    params = {"campaign_id": campaign_id, "request": request.model_dump()}
+
+    async def run(job):
+        saves = []
+        stage = None
+
+        async def save(status: str) -> None:
+            try:
+                await store.save_copy_checkpoint(
+                    job.id, campaign_id, params["request"], job.state.get("checkpoint"), status
+                )
+            except Exception as e:
+                print(f"⚠️ Checkpoint da cópia {job.id} não foi gravado: {e}")
+
+        def on_progress(progress: dict) -> None:
+            nonlocal stage
+            progress = dict(progress)
+            job.state["checkpoint"] = progress.pop("checkpoint", job.state.get("checkpoint"))
+            job.progress.update(progress)
+            if progress.get("stage") != stage:
+                stage = progress.get("stage")
+                saves.append(asyncio.create_task(save(JOB_RUNNING)))
+
+        status = JOB_FAILED
+        try:
+            result = await copy_campaign_in_chunks(
+                campaign_id,
+                name_suffix=request.name_suffix,
+                status_option=request.status_option,
+                checkpoint=checkpoint,
+                on_progress=on_progress,
+            )
+            result = dict(result)
+            if result.get("checkpoint") is not None:
+                job.state["checkpoint"] = result["checkpoint"]
+            result.pop("checkpoint", None)
+            status = JOB_COMPLETED if result.get("success") else JOB_FAILED
+            return result
+        except asyncio.CancelledError:
+            status = JOB_CANCELLED
+            raise
+        finally:
+            await asyncio.gather(*saves, return_exceptions=True)
+            await save(status)
+
+    job = jobs.start("campaign_copy", run, params=params)
+
+    return {
+        "success": True,
+        "message": "Cópia em partes iniciada",
+        **job.to_dict(include_result=False),
+    }
+
+
 @router.get("/insights/account")
-async def get_account_insights_endpoint(date_preset: str = "last_7d"):
+async def get_account_insights_endpoint(
+    date_preset: str = "last_7d",
+    fields: Optional[str] = None
+):
     """
     Busca insights/métricas da conta Meta Ads (nível de conta).
 
@@ -188,6 +399,8 @@ async def get_account_insights_endpoint(date_preset: str = "last_7d"):
     - last_7d, last_14d, last_30d
     - this_month, last_month
 
+    fields: perfil (minimal, dashboard, full) ou métricas separadas por vírgula
+
     Retorna métricas agregadas de todas as campanhas.
     """
     valid_presets = [
@@ -202,7 +415,7 @@ async def get_account_insights_endpoint(date_preset: str = "last_7d"):
             detail=f"date_preset deve ser um de: {', '.join(valid_presets)}"
         )
 
-    result = await get_account_insights(date_preset)
+    result = await get_account_insights(date_preset, fields=fields)
 
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
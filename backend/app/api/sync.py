@@ -4,8 +4,20 @@ API de Sincronização - Sincroniza dados entre Meta e banco local
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import time
 
-from app.tools.meta_api import list_campaigns, get_campaign_insights
+from app.config import settings
+from app.jobs import Job, count_progress, jobs
+from app.store import store
+from app.sync_pipeline import AccountSyncPipeline, group_failures
+from app.sync_state import sync_state, parse_graph_time
+from app.tools.meta_api import (
+    iter_campaigns,
+    get_daily_insights,
+    run_insights_report,
+)
+from app.tools.meta_accounts import fan_out, parse_accounts, configured_accounts
 
 
 router = APIRouter()
@@ -18,98 +30,476 @@ class SyncResult(BaseModel):
     metrics_synced: int = 0
     errors: list = []
     message: str = ""
+    accounts: dict = {}  # Resumo por conta de anúncios
+    wall_time: Optional[float] = None  # segundos (métricas e completa)
+    requests_per_second: Optional[float] = None  # requisições de insights/s (métricas e completa)
 
 
-@router.post("/campaigns")
-async def sync_campaigns():
+class InsightsReportRequest(BaseModel):
+    """Request para gerar um relatório assíncrono de insights."""
+    level: str = "ad"  # campaign, adset, ad
+    date_preset: str = "last_30d"
+
+
+def _resolve_accounts(account_ids: Optional[str]) -> list:
+    """Contas pedidas na query (?account_ids=1,2) ou as configuradas."""
+    accounts = parse_accounts(account_ids) if account_ids else configured_accounts()
+    
+    if not accounts:
+        raise HTTPException(status_code=400, detail="Nenhuma conta de anúncios configurada")
+    
+    return accounts
+
+
+def _merge_account_results(results: dict) -> dict:
+    """
+    Soma os resultados por conta do fan-out.
+    
+    Falha ({"success": False, "error"}) só se nenhuma conta pôde ser
+    lida; erros de contas isoladas ficam em "errors", prefixados pela
+    conta quando há várias.
     """
-    Sincroniza campanhas do Meta para o banco local.
+    if all("error" in result for result in results.values()):
+        return {"success": False, "error": next(iter(results.values()))["error"]}
     
-    - Busca todas as campanhas ativas e pausadas
-    - Cria/atualiza registros no banco local
-    - Retorna estatísticas da sincronização
+    prefix = len(results) > 1
+    errors = []
+    for account_id, result in results.items():
+        account_errors = [result["error"]] if "error" in result else result.get("errors", [])
+        errors.extend(f"{account_id}: {e}" if prefix else e for e in account_errors)
+    
+    return {
+        "campaigns_synced": sum(r.get("campaigns_synced", 0) for r in results.values()),
+        "metrics_synced": sum(r.get("metrics_synced", 0) for r in results.values()),
+        "total": sum(r.get("total", 0) for r in results.values()),
+        "errors": errors,
+        "accounts": results,
+    }
+
+
+async def _sync_account_campaigns(account_id: str, full: bool = False) -> dict:
     """
-    result = await list_campaigns(limit=100)
+    Sincroniza as campanhas de uma conta.
     
-    if not result["success"]:
-        raise HTTPException(status_code=500, detail=result["error"])
+    Incremental por padrão: só as campanhas com updated_time depois da
+    marca d'água da conta. A passada completa (primeira vez, full=True ou
+    reconciliação vencida) lista tudo e detecta campanhas excluídas.
+    """
+    state = sync_state.for_account(account_id)
+    full = full or state.needs_full_sync()
+    updated_since = None if full else state.updated_since()
     
-    campaigns = result.get("campaigns", [])
     synced = 0
+    total = 0
     errors = []
+    seen = set()
+    watermark = state.watermark or 0
+    complete = True
+    pending = []
     
-    for camp in campaigns:
+    async def flush() -> bool:
+        """Grava as campanhas pendentes em um upsert em lote."""
+        nonlocal synced, pending
+        batch, pending = pending, []
         try:
-            # Em produção, salvaria no banco via Prisma/SQLAlchemy
-            # await db.campaign.upsert(...)
-            synced += 1
+            written = await store.upsert_campaigns(account_id, batch)
+            synced += written
+            count_progress("rows_written", written)
+            return True
         except Exception as e:
-            errors.append(f"Erro ao sincronizar {camp['name']}: {str(e)}")
+            errors.append(f"Erro ao gravar {len(batch)} campanhas: {str(e)}")
+            return False
     
-    return SyncResult(
-        success=len(errors) == 0,
-        campaigns_synced=synced,
-        errors=errors,
-        message=f"Sincronizadas {synced} de {len(campaigns)} campanhas"
-    )
+    # Processar campanhas conforme as páginas chegam, gravando em lotes
+    try:
+        async for camp in iter_campaigns(account_id=account_id, updated_since=updated_since, max_pages=None):
+            total += 1
+            seen.add(camp.id)
+            if camp.updated_time:
+                watermark = max(watermark, parse_graph_time(camp.updated_time))
+            pending.append(camp)
+            if len(pending) >= settings.database_upsert_batch_size:
+                complete = await flush() and complete
+    except Exception as e:
+        # Erro da Meta API ou de rede ao buscar uma página
+        if total == 0:
+            return {"success": False, "error": str(e)}
+        errors.append(f"Listagem interrompida após {total} campanhas: {str(e)}")
+        complete = False
+    
+    if pending:
+        complete = await flush() and complete
+    
+    deleted = []
+    
+    # Só avança a marca d'água se a listagem chegou ao fim e tudo foi
+    # gravado; senão a próxima sincronização repete o intervalo
+    if complete:
+        if full:
+            # Campanhas conhecidas (em memória ou no banco, que sobrevive a
+            # reinícios) que sumiram da listagem completa foram excluídas
+            deleted = []
+            try:
+                known = state.campaign_ids | await store.active_campaign_ids(account_id)
+                deleted = sorted(known - seen)
+                await store.mark_deleted(account_id, deleted)
+            except Exception as e:
+                errors.append(f"Erro ao marcar campanhas excluídas: {str(e)}")
+            state.campaign_ids = seen
+            state.last_full_sync = time.time()
+        else:
+            state.campaign_ids |= seen
+        state.watermark = watermark or state.watermark
+    
+    return {
+        "success": len(errors) == 0,
+        "mode": "full" if full else "incremental",
+        "campaigns_synced": synced,
+        "campaigns_deleted": deleted,
+        "total": total,
+        "errors": errors,
+    }
 
 
-@router.post("/metrics")
-async def sync_metrics(date_preset: str = "last_7d"):
+async def _sync_account_metrics(
+    account_id: str,
+    date_preset: str,
+    campaign_ids: Optional[list] = None
+) -> dict:
     """
-    Sincroniza métricas das campanhas do Meta para o banco local.
+    Sincroniza as métricas diárias das campanhas de uma conta.
+    
+    As campanhas são divididas em lotes de sync_metrics_chunk_size, e a
+    série diária de cada lote (level=campaign, time_increment=1, filtrada
+    pelos IDs) é buscada em paralelo, no máximo
+    sync_metrics_max_concurrency lotes por vez. Cada requisição passa pelo
+    limitador de taxa compartilhado da conta (meta_client.send). Cada lote
+    é gravado em meta_campaign_metrics assim que chega, uma linha por
+    campanha e dia com entrega.
     
     Args:
-        date_preset: Período para sincronizar (last_7d, last_14d, last_30d)
+        campaign_ids: Campanhas da conta (padrão: lista as campanhas)
     """
-    # Buscar campanhas
-    campaigns_result = await list_campaigns(limit=100)
+    started = time.perf_counter()
     
-    if not campaigns_result["success"]:
-        raise HTTPException(status_code=500, detail=campaigns_result["error"])
+    if campaign_ids is None:
+        try:
+            campaign_ids = [
+                camp.id async for camp in iter_campaigns(fields="minimal", account_id=account_id, max_pages=None)
+            ]
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    size = settings.sync_metrics_chunk_size
+    chunks = [campaign_ids[i:i + size] for i in range(0, len(campaign_ids), size)]
+    semaphore = asyncio.Semaphore(settings.sync_metrics_max_concurrency)
+    
+    async def fetch(chunk: list) -> tuple:
+        async with semaphore:
+            try:
+                return chunk, await get_daily_insights(date_preset, campaign_ids=chunk, account_id=account_id)
+            except Exception as e:
+                return chunk, {"success": False, "error": str(e)}
     
-    campaigns = campaigns_result.get("campaigns", [])
     metrics_synced = 0
-    errors = []
+    requests = 0
+    days = set()
+    failed = {}  # campanha -> erro
     
-    for camp in campaigns:
-        try:
-            # Buscar insights
-            insights = await get_campaign_insights(camp["id"], date_preset)
+    tasks = [asyncio.create_task(fetch(chunk)) for chunk in chunks]
+    try:
+        # Gravar cada lote assim que chega, na ordem em que terminam
+        for next_done in asyncio.as_completed(tasks):
+            chunk, result = await next_done
+            if not result["success"]:
+                failed.update(dict.fromkeys(chunk, result["error"]))
+                continue
             
-            if insights["success"]:
-                # Em produção, salvaria no banco
-                # await db.campaign_metric.create(...)
-                metrics_synced += 1
-            else:
-                errors.append(f"Erro ao buscar métricas de {camp['name']}")
-                
-        except Exception as e:
-            errors.append(f"Erro ao sincronizar métricas de {camp['name']}: {str(e)}")
+            requests += result.get("pages_fetched", 0)
+            series = result["series"]
+            try:
+                written = await store.upsert_daily_metrics(account_id, series.rows())
+            except Exception as e:
+                failed.update(dict.fromkeys(chunk, f"Erro ao gravar métricas: {str(e)}"))
+                continue
+            
+            metrics_synced += written
+            days.update(series.days)
+            count_progress("rows_written", written)
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    wall_time = time.perf_counter() - started
+    
+    if chunks and len(failed) == len(campaign_ids):
+        return {"success": False, "error": next(iter(failed.values())), "errors_by_campaign": failed}
+    
+    return {
+        "success": not failed,
+        "campaigns_synced": len(campaign_ids) - len(failed),
+        "metrics_synced": metrics_synced,
+        "days": len(days),
+        "errors": group_failures(failed),
+        "errors_by_campaign": failed,
+        "requests": requests,
+        "wall_time": round(wall_time, 3),
+        "requests_per_second": round(requests / wall_time, 2) if wall_time > 0 else 0.0,
+    }
+
+
+async def _run_campaign_sync(accounts: list, full: bool = False) -> dict:
+    """Sincroniza as campanhas das contas, em paralelo (ver _sync_account_campaigns)."""
+    async def sync_account(account_id: str) -> dict:
+        try:
+            return await _sync_account_campaigns(account_id, full)
+        finally:
+            count_progress("accounts_done")
+    
+    merged = _merge_account_results(await fan_out(sync_account, accounts))
+    if "error" in merged:
+        return merged
+    
+    return SyncResult(
+        success=len(merged["errors"]) == 0,
+        campaigns_synced=merged["campaigns_synced"],
+        errors=merged["errors"],
+        message=f"Sincronizadas {merged['campaigns_synced']} de {merged['total']} campanhas",
+        accounts=merged["accounts"],
+    ).model_dump()
+
+
+async def _run_metrics_sync(accounts: list, date_preset: str) -> dict:
+    """Sincroniza as métricas diárias das contas, em paralelo (ver _sync_account_metrics)."""
+    async def sync_account(account_id: str) -> dict:
+        try:
+            return await _sync_account_metrics(account_id, date_preset)
+        finally:
+            count_progress("accounts_done")
+    
+    started = time.perf_counter()
+    merged = _merge_account_results(await fan_out(sync_account, accounts))
+    wall_time = time.perf_counter() - started
+    if "error" in merged:
+        return merged
+    
+    requests = sum(r.get("requests", 0) for r in merged["accounts"].values())
+    requests_per_second = requests / wall_time if wall_time > 0 else 0.0
     
     return SyncResult(
-        success=len(errors) == 0,
-        campaigns_synced=len(campaigns),
-        metrics_synced=metrics_synced,
-        errors=errors,
-        message=f"Sincronizadas métricas de {metrics_synced} campanhas"
-    )
+        success=len(merged["errors"]) == 0,
+        campaigns_synced=merged["campaigns_synced"],
+        metrics_synced=merged["metrics_synced"],
+        errors=merged["errors"],
+        message=(
+            f"Sincronizadas {merged['metrics_synced']} linhas diárias de métricas "
+            f"de {merged['campaigns_synced']} campanhas em {wall_time:.1f}s "
+            f"({requests_per_second:.1f} req/s)"
+        ),
+        accounts=merged["accounts"],
+        wall_time=round(wall_time, 3),
+        requests_per_second=round(requests_per_second, 2),
+    ).model_dump()
 
 
-@router.post("/full")
-async def full_sync():
+async def _run_full_sync(accounts: list, date_preset: str) -> dict:
     """
-    Sincronização completa: campanhas + métricas.
+    Sincroniza campanhas e métricas das contas, em paralelo, com uma
+    listagem de campanhas por conta (ver app.sync_pipeline).
     """
-    # Sincronizar campanhas
-    campaigns_result = await sync_campaigns()
+    async def sync_account(account_id: str) -> dict:
+        try:
+            return await AccountSyncPipeline(account_id, date_preset).run()
+        finally:
+            count_progress("accounts_done")
     
-    # Sincronizar métricas
-    metrics_result = await sync_metrics("last_7d")
+    started = time.perf_counter()
+    merged = _merge_account_results(await fan_out(sync_account, accounts))
+    wall_time = time.perf_counter() - started
+    if "error" in merged:
+        return merged
     
-    return {
-        "success": campaigns_result.success and metrics_result.success,
-        "campaigns": campaigns_result.dict(),
-        "metrics": metrics_result.dict(),
-        "message": "Sincronização completa executada"
-    }
+    requests = sum(r.get("requests", 0) for r in merged["accounts"].values())
+    requests_per_second = requests / wall_time if wall_time > 0 else 0.0
+    
+    return SyncResult(
+        success=len(merged["errors"]) == 0,
+        campaigns_synced=merged["campaigns_synced"],
+        metrics_synced=merged["metrics_synced"],
+        errors=merged["errors"],
+        message=(
+            f"Sincronizadas {merged['total']} campanhas ({merged['campaigns_synced']} gravadas) "
+            f"e {merged['metrics_synced']} linhas diárias de métricas em {wall_time:.1f}s "
+            f"({requests_per_second:.1f} req/s)"
+        ),
+        accounts=merged["accounts"],
+        wall_time=round(wall_time, 3),
+        requests_per_second=round(requests_per_second, 2),
+    ).model_dump()
+
+
+def _enqueue(kind: str, params: dict, run) -> Job:
+    """
+    Cria o job de sincronização, ou devolve o que já está rodando com os
+    mesmos parâmetros (duas sincronizações iguais não rodam juntas).
+    """
+    running = jobs.running(kind, params)
+    if running:
+        return running
+    
+    async def run_job(job: Job):
+        job.progress.update(accounts_total=len(params["accounts"]), accounts_done=0)
+        return await run(job)
+    
+    return jobs.start(kind, run_job, params=params)
+
+
+def start_campaign_sync(account_ids: Optional[str] = None, full: bool = False) -> Job:
+    """Enfileira a sincronização de campanhas (rotas e agendador)."""
+    accounts = _resolve_accounts(account_ids)
+    
+    async def run(job: Job) -> dict:
+        return await _run_campaign_sync(accounts, full)
+    
+    return _enqueue("sync_campaigns", {"accounts": accounts, "full": full}, run)
+
+
+def start_metrics_sync(date_preset: str = "last_7d", account_ids: Optional[str] = None) -> Job:
+    """Enfileira a sincronização de métricas (rotas e agendador)."""
+    accounts = _resolve_accounts(account_ids)
+    
+    async def run(job: Job) -> dict:
+        return await _run_metrics_sync(accounts, date_preset)
+    
+    return _enqueue("sync_metrics", {"accounts": accounts, "date_preset": date_preset}, run)
+
+
+def start_full_sync(account_ids: Optional[str] = None) -> Job:
+    """Enfileira campanhas + métricas (last_7d) em um único job."""
+    accounts = _resolve_accounts(account_ids)
+    
+    async def run(job: Job) -> dict:
+        return await _run_full_sync(accounts, "last_7d")
+    
+    return _enqueue("sync_full", {"accounts": accounts}, run)
+
+
+@router.post("/campaigns", status_code=202)
+async def sync_campaigns(account_ids: Optional[str] = None, full: bool = False):
+    """
+    Sincroniza campanhas do Meta para o banco local, em segundo plano.
+    
+    - Busca as campanhas alteradas desde a última sincronização de cada
+      conta (marca d'água em updated_time), com as contas em paralelo
+      (cada uma com seus próprios limites na Meta)
+    - Periodicamente (ou com full=true) lista tudo para detectar exclusões
+    - Grava no banco local em upserts em lote (ver app.store)
+    
+    Retorna o job na hora; acompanhe em GET /api/sync/jobs/{job_id}
+    (o resultado, no total e por conta, fica em "result").
+    
+    Args:
+        account_ids: Contas separadas por vírgula (padrão: as configuradas)
+        full: Forçar a passada completa (reconciliação)
+    """
+    return start_campaign_sync(account_ids, full).to_dict(include_result=False)
+
+
+@router.post("/metrics", status_code=202)
+async def sync_metrics(date_preset: str = "last_7d", account_ids: Optional[str] = None):
+    """
+    Sincroniza métricas diárias das campanhas do Meta para o banco local
+    (uma linha por conta, campanha e dia), em segundo plano.
+    
+    Args:
+        date_preset: Período para sincronizar (last_7d, last_14d, last_30d)
+        account_ids: Contas separadas por vírgula (padrão: as configuradas)
+    """
+    return start_metrics_sync(date_preset, account_ids).to_dict(include_result=False)
+
+
+@router.post("/full", status_code=202)
+async def full_sync(account_ids: Optional[str] = None):
+    """
+    Sincronização completa (campanhas + métricas), em segundo plano.
+    
+    As campanhas de cada conta são listadas uma única vez: enquanto a
+    listagem avança, as alteradas são gravadas e os insights diários são
+    pedidos em lotes, com os estágios ligados por filas limitadas. A
+    listagem completa também reconcilia as campanhas excluídas.
+    
+    Args:
+        account_ids: Contas separadas por vírgula (padrão: as configuradas)
+    """
+    return start_full_sync(account_ids).to_dict(include_result=False)
+
+
+@router.post("/reports", status_code=202)
+async def start_insights_report(request: InsightsReportRequest):
+    """
+    Gera um relatório assíncrono de insights em segundo plano.
+    
+    Para relatórios pesados (level=ad, last_30d, contas grandes). Retorna
+    imediatamente o ID do job; acompanhe em GET /api/sync/jobs/{job_id}.
+    """
+    if request.level not in ["campaign", "adset", "ad"]:
+        raise HTTPException(
+            status_code=400,
+            detail="level deve ser campaign, adset ou ad"
+        )
+    
+    async def run(job):
+        return await run_insights_report(
+            level=request.level,
+            date_preset=request.date_preset,
+            on_progress=job.progress.update,
+        )
+    
+    job = jobs.start("insights_report", run, params=request.model_dump())
+    
+    return job.to_dict(include_result=False)
+
+
+@router.get("/jobs")
+async def list_jobs(kind: Optional[str] = None):
+    """
+    Jobs do mais recente para o mais antigo (sem os resultados).
+    
+    Args:
+        kind: Filtrar por tipo (sync_campaigns, sync_metrics, sync_full, insights_report)
+    """
+    return {"jobs": [job.to_dict(include_result=False) for job in jobs.list(kind)]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Retorna status, progresso e (quando concluído) o resultado de um job.
+    """
+    job = jobs.get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    
+    return job.to_dict()
+
+
+
+@router.post("/jobs/{job_id}/cancel", status_code=202)
+async def cancel_job(job_id: str):
+    """
+    Cancela um job em execução.
+    
+    O job para no próximo ponto de espera (chamada à Meta ou ao banco) e
+    fica com status "cancelled"; lotes ainda não gravados são descartados
+    e a marca d'água da sincronização não avança.
+    """
+    job = jobs.get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    
+    if not jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job já finalizado ({job.status})")
+    
+    return job.to_dict(include_result=False)
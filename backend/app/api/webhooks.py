@@ -0,0 +1,61 @@
+"""
+API de Webhooks - Notificações de alteração enviadas pela Meta
+"""
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+import hmac
+import json
+
+from app.config import settings
+from app.webhooks import change_refresher, parse_notification, verify_signature
+
+
+router = APIRouter()
+
+
+@router.get("/meta", response_class=PlainTextResponse)
+async def verify_meta_webhook(
+    mode: str = Query("", alias="hub.mode"),
+    verify_token: str = Query("", alias="hub.verify_token"),
+    challenge: str = Query("", alias="hub.challenge"),
+):
+    """
+    Handshake de verificação da assinatura do webhook.
+
+    A Meta chama com hub.mode=subscribe e o token configurado no app;
+    respondemos com o hub.challenge recebido.
+    """
+    if (
+        mode != "subscribe"
+        or not settings.meta_webhook_verify_token
+        or not hmac.compare_digest(verify_token.encode(), settings.meta_webhook_verify_token.encode())
+    ):
+        raise HTTPException(status_code=403, detail="Token de verificação inválido")
+
+    return challenge
+
+
+@router.post("/meta")
+async def receive_meta_webhook(request: Request):
+    """
+    Recebe notificações de alteração de campanhas, ad sets e anúncios.
+
+    A assinatura (X-Hub-Signature-256) é conferida com o corpo cru. Os
+    objetos alterados são só enfileirados: a releitura e a gravação no
+    banco local acontecem em segundo plano (ver app.webhooks), e a Meta
+    recebe a resposta na hora.
+    """
+    body = await request.body()
+
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256")):
+        raise HTTPException(status_code=403, detail="Assinatura inválida")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Payload inválido")
+
+    changes = parse_notification(payload) if isinstance(payload, dict) else []
+    queued = change_refresher.enqueue(changes)
+
+    return {"success": True, "changes": len(changes), "queued": queued}
@@ -19,12 +19,108 @@ class Settings(BaseSettings):
     
     # Database (Supabase)
     database_url: str = ""
+    # Pool de conexões do banco local e linhas por instrução de upsert
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_upsert_batch_size: int = 1000
     
     # Meta Ads API
     meta_app_id: str = ""
     meta_app_secret: str = ""
     meta_access_token: str = ""
     meta_ad_account_id: str = ""
+    # Várias contas de clientes (separadas por vírgula); vazio usa meta_ad_account_id
+    meta_ad_account_ids: str = ""
+    
+    # Webhook de alterações de objetos de anúncio (/api/webhooks/meta):
+    # token do handshake de verificação e segundos de espera para juntar
+    # notificações antes de reler os objetos (a assinatura usa meta_app_secret)
+    meta_webhook_verify_token: str = ""
+    meta_webhook_debounce: float = 2.0
+    
+    # Meta Graph API - cliente HTTP compartilhado
+    meta_graph_api_url: str = "https://graph.facebook.com/v24.0"
+    meta_http2: bool = True
+    meta_http_max_connections: int = 100
+    meta_http_max_keepalive_connections: int = 20
+    meta_http_keepalive_expiry: float = 30.0
+    meta_http_connect_timeout: float = 10.0
+    meta_timeout_default: float = 30.0
+    meta_timeout_insights: float = 60.0
+    meta_timeout_copies: float = 120.0
+    
+    # Meta Graph API - várias contas: requisições simultâneas por conta e
+    # contas processadas ao mesmo tempo pelo fan-out
+    meta_account_max_concurrency: int = 8
+    meta_accounts_max_concurrency: int = 10
+    
+    # Meta Graph API - limitador de taxa (baseado nos headers de uso, por conta)
+    meta_rate_limit_slowdown_pct: float = 50.0
+    meta_rate_limit_max_delay: float = 5.0
+    meta_rate_limit_max_wait: float = 300.0
+    meta_rate_limit_max_retries: int = 2
+    
+    # Meta Graph API - retentativas (só GET) e circuit breaker por conta
+    meta_retry_max_attempts: int = 3
+    meta_retry_base_delay: float = 0.5
+    meta_retry_max_delay: float = 8.0
+    meta_retry_budget_ratio: float = 0.2
+    meta_retry_budget_max: float = 10.0
+    meta_breaker_failure_threshold: int = 5
+    meta_breaker_reset_timeout: float = 30.0
+    
+    # Meta Graph API - relatórios assíncronos de insights
+    meta_async_report_timeout: float = 900.0
+    meta_async_report_max_poll_interval: float = 30.0
+    
+    # Meta Graph API - chamadas /batch (50 operações cada) simultâneas
+    meta_batch_max_concurrency: int = 4
+    
+    # Meta Graph API - cópia profunda em partes (chamadas /copies simultâneas)
+    meta_copy_max_concurrency: int = 5
+    
+    # Meta Graph API - hierarquia campanha → ad sets → anúncios (páginas de
+    # edges aninhados buscadas ao mesmo tempo e tamanho de cada página)
+    meta_hierarchy_max_concurrency: int = 5
+    meta_hierarchy_page_size: int = 100
+    
+    # Meta Graph API - cache de leituras (TTL em segundos)
+    meta_cache_enabled: bool = True
+    meta_cache_max_entries: int = 1000
+    meta_cache_ttl_campaign: float = 60.0
+    meta_cache_ttl_insights: float = 300.0
+    
+    # Meta Graph API - tipos de ação (actions/action_values) contados como
+    # conversão e como receita, separados por vírgula. meta_conversion_mapping
+    # sobrescreve por conta, em JSON:
+    # {"act_123": {"conversions": "lead,complete_registration", "revenue": ""}}
+    meta_conversion_actions: str = "purchase,omni_purchase,add_to_cart"
+    meta_revenue_actions: str = "purchase,omni_purchase"
+    meta_conversion_mapping: str = ""
+    
+    # Sincronização incremental de campanhas: intervalo da reconciliação
+    # completa (detecta exclusões) e folga aplicada à marca d'água, em segundos
+    sync_full_reconcile_interval: float = 21600.0
+    sync_watermark_overlap: int = 60
+    
+    # Agendador de sincronizações em segundo plano: segundos entre execuções
+    # (0 desliga) e período das métricas sincronizadas
+    sync_campaigns_interval: float = 900.0
+    sync_metrics_interval: float = 3600.0
+    sync_metrics_date_preset: str = "last_7d"
+    # Com o webhook da Meta configurado (ver app.webhooks), as alterações
+    # chegam por notificação e a listagem de campanhas vira só uma rede de
+    # segurança, bem mais espaçada
+    sync_campaigns_webhook_interval: float = 21600.0
+    
+    # Sincronização de métricas: campanhas por requisição de insights e
+    # requisições simultâneas por conta
+    sync_metrics_chunk_size: int = 50
+    sync_metrics_max_concurrency: int = 4
+    
+    # Sincronização completa (app.sync_pipeline): itens em espera entre os
+    # estágios antes de a fila segurar o estágio anterior
+    sync_pipeline_queue_size: int = 500
     
     # Evolution API (WhatsApp)
     evolution_api_url: str = ""
@@ -0,0 +1,177 @@
+"""
+Jobs em segundo plano
+
+Registro em memória de tarefas longas (relatórios, sincronizações) que não
+devem segurar uma requisição HTTP aberta. A rota cria o job, devolve o ID na
+hora e o cliente acompanha o progresso por GET /api/sync/jobs/{id}.
+
+Código que roda dentro de um job (e das tarefas que ele cria) pode somar
+contadores ao progresso com count_progress, sem receber o Job: chamadas à
+Graph API, páginas lidas e linhas gravadas aparecem assim no progresso.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import uuid
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# Quantos jobs finalizados manter no histórico
+MAX_FINISHED_JOBS = 100
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Job executado pela tarefa atual (herdado pelas tarefas filhas)
+_current_job: ContextVar[Optional["Job"]] = ContextVar("current_job", default=None)
+
+
+def count_progress(key: str, amount: int = 1) -> None:
+    """Soma amount ao contador key do progresso do job atual, se houver um."""
+    job = _current_job.get()
+    if job is not None:
+        job.progress[key] = job.progress.get(key, 0) + amount
+
+
+@dataclass
+class Job:
+    """Um job em execução ou finalizado."""
+    kind: str
+    params: dict = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_PENDING
+    progress: dict = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=_now)
+    finished_at: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Estado interno do job (ex: checkpoint de uma cópia), fora da API
+    state: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in (JOB_PENDING, JOB_RUNNING)
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        """Representação serializável do job (para a API)."""
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobRegistry:
+    """Cria, executa e guarda os jobs do processo."""
+
+    def __init__(self):
+        self._jobs: dict = {}
+
+    def start(
+        self,
+        kind: str,
+        run: Callable[[Job], Awaitable[Any]],
+        params: Optional[dict] = None
+    ) -> Job:
+        """
+        Cria um job e agenda sua execução no event loop atual.
+
+        Args:
+            kind: Tipo do job (ex: "insights_report")
+            run: Corrotina que recebe o Job (para atualizar job.progress)
+                e retorna o resultado
+            params: Parâmetros usados, para exibição
+        """
+        job = Job(kind=kind, params=params or {})
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, run))
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def running(self, kind: str, params: Optional[dict] = None) -> Optional[Job]:
+        """Job ainda não finalizado do tipo (e com os parâmetros) dados."""
+        for job in self._jobs.values():
+            if job.kind == kind and not job.finished and (params is None or job.params == params):
+                return job
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancela um job em execução.
+
+        O cancelamento chega ao job como asyncio.CancelledError no próximo
+        await; transações abertas são desfeitas.
+
+        Returns:
+            False se o job não existe ou já terminou
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancela os jobs em execução e espera que terminem."""
+        tasks = [job.task for job in self._jobs.values() if not job.finished and job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def list(self, kind: Optional[str] = None) -> list:
+        """Jobs do mais recente para o mais antigo."""
+        jobs = [j for j in self._jobs.values() if kind is None or j.kind == kind]
+        return list(reversed(jobs))
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[Any]]) -> None:
+        job.status = JOB_RUNNING
+        _current_job.set(job)
+        try:
+            result = await run(job)
+            # Funções de meta_api sinalizam falha com success=False e "error";
+            # sincronizações com erros só em parte das contas terminam normalmente
+            if isinstance(result, dict) and result.get("success") is False and "error" in result:
+                job.status = JOB_FAILED
+                job.error = result.get("error")
+            else:
+                job.status = JOB_COMPLETED
+            job.result = result
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+            job.error = "Job cancelado"
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = _now()
+
+    def _prune(self) -> None:
+        """Descarta os jobs finalizados mais antigos além do limite."""
+        finished = [j for j in self._jobs.values() if j.finished]
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job.id]
+
+
+# Registro único do processo
+jobs = JobRegistry()
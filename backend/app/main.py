@@ -8,6 +8,17 @@ from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.api import router as api_router
+from app.api.sync import start_campaign_sync, start_metrics_sync
+from app.jobs import jobs
+from app.scheduler import scheduler
+from app.tools.meta_client import init_meta_client, close_meta_client, account_concurrency
+from app.tools.meta_rate_limit import rate_limiters
+from app.tools.meta_accounts import configured_accounts
+from app.store import store
+from app.sync_state import sync_state
+from app.webhooks import change_refresher, webhooks_enabled
+from app.tools.meta_cache import response_cache, single_flight
+from app.tools.meta_resilience import breakers, retry_budget
 
 
 @asynccontextmanager
@@ -16,12 +27,46 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Iniciando Meta Campaign Manager Backend...")
     print(f"   OpenAI Model: {settings.openai_model}")
-    print(f"   Meta Ad Account: {settings.meta_ad_account_id or 'Não configurado'}")
+    print(f"   Meta Ad Accounts: {', '.join(configured_accounts()) or 'Não configurado'}")
     print(f"   Evolution API: {settings.evolution_api_url or 'Não configurado'}")
     
+    # Cliente HTTP compartilhado da Graph API (pool + keep-alive + HTTP/2)
+    await init_meta_client()
+    
+    # Banco local (tabelas criadas se ainda não existirem)
+    if store.enabled:
+        try:
+            await store.init()
+            print(f"   Banco local: {store.dialect}")
+        except Exception as e:
+            print(f"⚠️ Banco local indisponível: {e}")
+    
+    # Sincronizações periódicas em segundo plano (só com a Meta configurada)
+    if settings.meta_access_token and configured_accounts():
+        # Com o webhook, as alterações chegam por notificação e a listagem
+        # periódica só cobre o que a Meta não avisou
+        if webhooks_enabled():
+            change_refresher.start()
+        campaigns_interval = (
+            settings.sync_campaigns_webhook_interval if webhooks_enabled()
+            else settings.sync_campaigns_interval
+        )
+        scheduler.every("campaigns", campaigns_interval, start_campaign_sync)
+        scheduler.every(
+            "metrics",
+            settings.sync_metrics_interval,
+            lambda: start_metrics_sync(settings.sync_metrics_date_preset),
+        )
+        scheduler.start()
+    
     yield
     
     # Shutdown
+    await scheduler.stop()
+    await change_refresher.stop()
+    await jobs.shutdown()
+    await close_meta_client()
+    await store.close()
     print("👋 Encerrando servidor...")
 
 
@@ -68,6 +113,17 @@ async def health():
         "meta_configured": bool(settings.meta_access_token),
         "evolution_configured": bool(settings.evolution_api_key),
         "database_configured": bool(settings.database_url),
+        "database": store.stats(),
+        "meta_accounts": configured_accounts(),
+        "meta_rate_limit": rate_limiters.stats(),
+        "meta_requests_in_flight": account_concurrency.stats(),
+        "meta_cache": response_cache.stats(),
+        "meta_single_flight": single_flight.stats(),
+        "meta_circuit_breakers": breakers.stats(),
+        "meta_retry_budget": retry_budget.stats(),
+        "sync_state": sync_state.stats(),
+        "sync_scheduler": scheduler.stats(),
+        "meta_webhooks": change_refresher.stats(),
     }
 
 
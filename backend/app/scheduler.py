@@ -0,0 +1,111 @@
+"""
+Agendador de sincronizações em segundo plano
+
+Roda dentro do processo da API: cada entrada enfileira um job (ver
+app.jobs) a cada `interval` segundos, sem depender de uma requisição
+HTTP. Se o job anterior da mesma entrada ainda não terminou, a rodada é
+pulada em vez de empilhar execuções.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import asyncio
+from app.jobs import Job
+
+
+@dataclass
+class ScheduledSync:
+    """Uma entrada do agendador."""
+    name: str
+    interval: float
+    start: Callable[[], Job]
+    last_job: Optional[Job] = None
+    last_run_at: Optional[str] = None
+    runs: int = 0
+    skipped: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "last_run_at": self.last_run_at,
+            "last_job_id": self.last_job.id if self.last_job else None,
+            "last_status": self.last_job.status if self.last_job else None,
+        }
+
+
+class SyncScheduler:
+    """Executa entradas periódicas enquanto a aplicação está no ar."""
+
+    def __init__(self):
+        self._entries: dict = {}
+
+    def every(self, name: str, interval: float, start: Callable[[], Job]) -> None:
+        """
+        Registra uma entrada.
+
+        Args:
+            name: Nome da entrada (para /health)
+            interval: Segundos entre execuções; 0 ou menos desliga a entrada
+            start: Enfileira o job e o devolve (ex: sync.start_campaign_sync)
+        """
+        if interval > 0:
+            self._entries[name] = ScheduledSync(name, interval, start)
+
+    def start(self) -> None:
+        """Inicia os loops das entradas (chamado no startup)."""
+        for entry in self._entries.values():
+            if entry.task is None or entry.task.done():
+                entry.task = asyncio.create_task(self._loop(entry))
+                print(f"⏱️ Sincronização '{entry.name}' agendada a cada {entry.interval:.0f}s")
+
+    async def stop(self) -> None:
+        """Para os loops (os jobs já enfileirados seguem até jobs.shutdown)."""
+        tasks = [entry.task for entry in self._entries.values() if entry.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for entry in self._entries.values():
+            entry.task = None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def run_once(self, name: str) -> Optional[Job]:
+        """
+        Executa uma rodada da entrada agora.
+
+        Returns:
+            O job enfileirado, ou None se a rodada foi pulada
+        """
+        entry = self._entries[name]
+
+        if entry.last_job is not None and not entry.last_job.finished:
+            entry.skipped += 1
+            return None
+
+        try:
+            entry.last_job = entry.start()
+        except Exception as e:
+            print(f"❌ Sincronização agendada '{name}' não pôde começar: {e}")
+            return None
+
+        entry.runs += 1
+        entry.last_run_at = datetime.now(timezone.utc).isoformat()
+        return entry.last_job
+
+    async def _loop(self, entry: ScheduledSync) -> None:
+        # A primeira rodada espera um intervalo (reinícios não disparam sincronizações)
+        while True:
+            await asyncio.sleep(entry.interval)
+            self.run_once(entry.name)
+
+    def stats(self) -> dict:
+        """Estado de cada entrada (para /health)."""
+        return {name: entry.to_dict() for name, entry in self._entries.items()}
+
+
+# Agendador único do processo
+scheduler = SyncScheduler()
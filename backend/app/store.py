@@ -0,0 +1,464 @@
+"""
+Banco local de campanhas e métricas (SQLAlchemy assíncrono)
+
+A sincronização grava aqui o que leu da Meta:
+
+- meta_campaigns: uma linha por (conta, campanha); campanhas que sumiram
+  da conta ficam com deleted_at preenchido
+- meta_campaign_metrics: uma linha por (conta, campanha, dia), com as
+  métricas somáveis de DAILY_METRICS
+- meta_copy_checkpoints: checkpoint de cada cópia em partes
+  (copy_campaign_in_chunks), para retomá-la mesmo depois de um reinício
+
+As escritas são upserts em lote: cada instrução grava até
+database_upsert_batch_size linhas (INSERT ... VALUES (...), (...) ON
+CONFLICT DO UPDATE), então 5 mil campanhas viram poucas instruções em vez
+de 5 mil idas ao banco. No Postgres as métricas entram por COPY em uma
+tabela temporária e um único INSERT ... SELECT ... ON CONFLICT.
+
+Usa DATABASE_URL (postgresql:// vira postgresql+asyncpg://; sqlite://
+serve para desenvolvimento e testes). Sem DATABASE_URL o store fica
+desligado e as escritas só contam as linhas. Atrás do PgBouncer da
+Supabase (?pgbouncer=true, porta 6543) o cache de prepared statements do
+asyncpg fica desligado.
+"""
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    JSON,
+    MetaData,
+    String,
+    Table,
+    column,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from app.config import settings
+from app.tools.meta_records import Campaign
+from app.tools.meta_timeseries import DAILY_METRICS
+
+
+metadata = MetaData()
+
+campaigns_table = Table(
+    "meta_campaigns",
+    metadata,
+    Column("account_id", String(32), primary_key=True),
+    Column("campaign_id", String(32), primary_key=True),
+    Column("name", String),
+    Column("objective", String(64)),
+    Column("status", String(32)),
+    Column("effective_status", String(32)),
+    Column("daily_budget", BigInteger),  # centavos
+    Column("lifetime_budget", BigInteger),  # centavos
+    Column("created_time", String(32)),
+    Column("updated_time", String(32)),
+    Column("synced_at", DateTime(timezone=True), nullable=False),
+    Column("deleted_at", DateTime(timezone=True)),
+)
+
+campaign_metrics_table = Table(
+    "meta_campaign_metrics",
+    metadata,
+    Column("account_id", String(32), primary_key=True),
+    Column("campaign_id", String(32), primary_key=True),
+    Column("date", Date, primary_key=True),
+    *(Column(metric, Float, nullable=False, default=0.0) for metric in DAILY_METRICS),
+    Column("synced_at", DateTime(timezone=True), nullable=False),
+)
+
+copy_checkpoints_table = Table(
+    "meta_copy_checkpoints",
+    metadata,
+    Column("job_id", String(32), primary_key=True),
+    Column("campaign_id", String(32), nullable=False),  # campanha de origem
+    Column("request", JSON, nullable=False),  # opções da cópia
+    Column("checkpoint", JSON),
+    Column("status", String(16), nullable=False),  # status do job
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
+
+CAMPAIGN_KEYS = ("account_id", "campaign_id")
+METRIC_KEYS = ("account_id", "campaign_id", "date")
+
+# Campos de Campaign gravados em meta_campaigns
+CAMPAIGN_COLUMNS = (
+    "name", "objective", "status", "effective_status", "daily_budget",
+    "lifetime_budget", "created_time", "updated_time",
+)
+
+METRIC_COLUMNS = ("account_id", "campaign_id", "date", *DAILY_METRICS, "synced_at")
+
+# Tabela temporária (por conexão) que recebe o COPY das métricas no Postgres
+METRICS_STAGE_TABLE = "meta_campaign_metrics_stage"
+
+
+# Parâmetros de URL do libpq/Prisma (ex: o ?pgbouncer=true da Supabase)
+# que chegariam ao asyncpg.connect() como argumentos desconhecidos
+ASYNCPG_IGNORED_PARAMS = ("pgbouncer", "connection_limit", "pool_timeout")
+
+# Porta do pooler em modo transaction da Supabase
+PGBOUNCER_TRANSACTION_PORT = 6543
+
+
+def async_database_url(url: str) -> str:
+    """
+    Troca o driver da URL pelo assíncrono (asyncpg, aiosqlite).
+
+    No Postgres, os parâmetros que o asyncpg não aceita saem da query
+    (ASYNCPG_IGNORED_PARAMS) e sslmode vira ssl.
+    """
+    for prefix, driver in (
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefix):
+            url = driver + url[len(prefix):]
+            break
+
+    if not url.startswith("postgresql+asyncpg://") or "?" not in url:
+        return url
+
+    parsed = make_url(url)
+    query = {key: value for key, value in parsed.query.items() if key not in ASYNCPG_IGNORED_PARAMS}
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(query=query).render_as_string(hide_password=False)
+
+
+def uses_transaction_pooler(url: str) -> bool:
+    """
+    URL de um PgBouncer em modo transaction (?pgbouncer=true ou a porta
+    6543 da Supabase): cada transação pode cair em outra conexão do
+    servidor, então prepared statements nomeados não podem ser reaproveitados.
+    """
+    if not url.startswith(("postgresql", "postgres:")):
+        return False
+    parsed = make_url(url)
+    return str(parsed.query.get("pgbouncer", "")).lower() == "true" or parsed.port == PGBOUNCER_TRANSACTION_PORT
+
+
+def engine_options(url: str) -> dict:
+    """Argumentos de create_async_engine para a URL configurada (antes de async_database_url)."""
+    options = {"pool_pre_ping": True}
+    if url.startswith("sqlite"):
+        return options
+    options["pool_size"] = settings.database_pool_size
+    options["max_overflow"] = settings.database_max_overflow
+    if uses_transaction_pooler(url):
+        # Sem cache de prepared statements no asyncpg nem no SQLAlchemy
+        options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return options
+
+
+def _batches(rows: list, size: int) -> Iterable[list]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class MetricsStore:
+    """
+    Engine assíncrona (com pool) e as escritas em lote da sincronização.
+
+    O engine é criado no primeiro uso; init() cria as tabelas que não
+    existirem e close() devolve as conexões do pool.
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        # None: usa settings.database_url (lido no primeiro uso)
+        self._url = url
+        self._engine: Optional[AsyncEngine] = None
+        self._schema_ready = False
+        self.statements = 0
+        self.rows_written = 0
+
+    @property
+    def configured_url(self) -> str:
+        return self._url if self._url is not None else settings.database_url
+
+    @property
+    def url(self) -> str:
+        return async_database_url(self.configured_url)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(self.url, **engine_options(self.configured_url))
+        return self._engine
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    async def init(self) -> None:
+        """Cria as tabelas que ainda não existem."""
+        if not self.enabled or self._schema_ready:
+            return
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+        self._schema_ready = True
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._schema_ready = False
+
+    def _insert(self, target: Table):
+        return (postgresql if self.dialect == "postgresql" else sqlite).insert(target)
+
+    @staticmethod
+    def _on_conflict_update(stmt, keys: tuple, columns: tuple):
+        """Completa um INSERT com ON CONFLICT (keys) DO UPDATE das colunas dadas."""
+        return stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: stmt.excluded[name] for name in columns},
+        )
+
+    async def _execute(self, conn: AsyncConnection, stmt, rows: int = 0) -> None:
+        await conn.execute(stmt)
+        self.statements += 1
+        self.rows_written += rows
+
+    async def upsert_campaigns(
+        self,
+        account_id: str,
+        campaigns: Iterable[Campaign],
+        synced_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Grava (insere ou atualiza) campanhas de uma conta.
+
+        Uma campanha regravada deixa de estar excluída.
+
+        Returns:
+            Número de campanhas recebidas
+        """
+        synced_at = synced_at or datetime.now(timezone.utc)
+        rows = [
+            {
+                "account_id": account_id,
+                "campaign_id": camp.id,
+                **{name: getattr(camp, name) for name in CAMPAIGN_COLUMNS},
+                "synced_at": synced_at,
+                "deleted_at": None,
+            }
+            for camp in campaigns
+        ]
+        if not rows or not self.enabled:
+            return len(rows)
+
+        await self.init()
+        async with self.engine.begin() as conn:
+            for batch in _batches(rows, settings.database_upsert_batch_size):
+                stmt = self._insert(campaigns_table).values(batch)
+                await self._execute(
+                    conn,
+                    self._on_conflict_update(stmt, CAMPAIGN_KEYS, (*CAMPAIGN_COLUMNS, "synced_at", "deleted_at")),
+                    len(batch),
+                )
+        return len(rows)
+
+    async def mark_deleted(self, account_id: str, campaign_ids: Iterable[str]) -> int:
+        """Marca campanhas que sumiram da conta (deleted_at), sem apagar as métricas."""
+        campaign_ids = list(campaign_ids)
+        if not campaign_ids or not self.enabled:
+            return len(campaign_ids)
+
+        await self.init()
+        now = datetime.now(timezone.utc)
+        async with self.engine.begin() as conn:
+            for batch in _batches(campaign_ids, settings.database_upsert_batch_size):
+                await self._execute(
+                    conn,
+                    update(campaigns_table)
+                    .where(campaigns_table.c.account_id == account_id)
+                    .where(campaigns_table.c.campaign_id.in_(batch))
+                    .values(deleted_at=now),
+                    len(batch),
+                )
+        return len(campaign_ids)
+
+    async def upsert_daily_metrics(
+        self,
+        account_id: str,
+        rows: Iterable[tuple],
+        synced_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Grava métricas diárias, chaveadas por (conta, campanha, dia).
+
+        Args:
+            rows: (campaign_id, dia ISO, valores na ordem de DAILY_METRICS),
+                como DailySeries.rows()
+
+        Returns:
+            Número de linhas recebidas
+        """
+        synced_at = synced_at or datetime.now(timezone.utc)
+        records = [
+            (account_id, campaign_id, date.fromisoformat(day), *map(float, values), synced_at)
+            for campaign_id, day, values in rows
+        ]
+        if not records or not self.enabled:
+            return len(records)
+
+        await self.init()
+        async with self.engine.begin() as conn:
+            if self.dialect == "postgresql":
+                await self._copy_metrics(conn, records)
+            else:
+                for batch in _batches(records, settings.database_upsert_batch_size):
+                    stmt = self._insert(campaign_metrics_table).values(
+                        [dict(zip(METRIC_COLUMNS, record)) for record in batch]
+                    )
+                    await self._execute(
+                        conn,
+                        self._on_conflict_update(stmt, METRIC_KEYS, (*DAILY_METRICS, "synced_at")),
+                        len(batch),
+                    )
+        return len(records)
+
+    async def _copy_metrics(self, conn: AsyncConnection, records: list) -> None:
+        """
+        COPY para uma tabela temporária e um único upsert a partir dela
+        (Postgres/asyncpg). Três instruções, qualquer que seja o volume.
+        """
+        # Pela conexão do SQLAlchemy, para ficar na mesma transação do COPY
+        await conn.exec_driver_sql(
+            f"CREATE TEMP TABLE IF NOT EXISTS {METRICS_STAGE_TABLE} "
+            f"(LIKE {campaign_metrics_table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        self.statements += 1
+
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            METRICS_STAGE_TABLE, records=records, columns=METRIC_COLUMNS
+        )
+        self.statements += 1
+
+        stage = table(METRICS_STAGE_TABLE, *(column(name) for name in METRIC_COLUMNS))
+        stmt = self._insert(campaign_metrics_table).from_select(METRIC_COLUMNS, select(stage))
+        await self._execute(
+            conn,
+            self._on_conflict_update(stmt, METRIC_KEYS, (*DAILY_METRICS, "synced_at")),
+            len(records),
+        )
+
+    async def save_copy_checkpoint(
+        self,
+        job_id: str,
+        campaign_id: str,
+        request: dict,
+        checkpoint: Optional[dict],
+        status: str
+    ) -> None:
+        """Grava (ou atualiza) o checkpoint de uma cópia em partes."""
+        if not self.enabled:
+            return
+
+        await self.init()
+        stmt = self._insert(copy_checkpoints_table).values(
+            job_id=job_id,
+            campaign_id=campaign_id,
+            request=request,
+            checkpoint=checkpoint,
+            status=status,
+            updated_at=datetime.now(timezone.utc),
+        )
+        async with self.engine.begin() as conn:
+            await self._execute(
+                conn,
+                self._on_conflict_update(stmt, ("job_id",), ("checkpoint", "status", "updated_at")),
+                1,
+            )
+
+    async def copy_checkpoint(self, job_id: str) -> Optional[dict]:
+        """Checkpoint gravado de uma cópia ({campaign_id, request, checkpoint, status}), se houver."""
+        if not self.enabled:
+            return None
+        await self.init()
+        query = select(copy_checkpoints_table).where(copy_checkpoints_table.c.job_id == job_id)
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(query)).mappings().first()
+        return dict(row) if row else None
+
+    async def active_campaign_ids(self, account_id: str) -> set:
+        """
+        IDs das campanhas gravadas e não excluídas de uma conta.
+
+        A reconciliação compara a listagem completa com eles (além dos IDs
+        em memória), então exclusões feitas com o processo parado também
+        são detectadas na primeira passada depois de um reinício.
+        """
+        if not self.enabled:
+            return set()
+        await self.init()
+        query = select(campaigns_table.c.campaign_id).where(
+            campaigns_table.c.account_id == account_id,
+            campaigns_table.c.deleted_at.is_(None),
+        )
+        async with self.engine.connect() as conn:
+            return set((await conn.execute(query)).scalars())
+
+    async def campaigns(self, account_id: str, include_deleted: bool = False) -> list:
+        """Campanhas gravadas de uma conta, como dicts."""
+        if not self.enabled:
+            return []
+        await self.init()
+        query = select(campaigns_table).where(campaigns_table.c.account_id == account_id)
+        if not include_deleted:
+            query = query.where(campaigns_table.c.deleted_at.is_(None))
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query.order_by(campaigns_table.c.campaign_id))
+            return [dict(row) for row in result.mappings()]
+
+    async def daily_metrics(
+        self,
+        account_id: str,
+        campaign_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> list:
+        """Métricas diárias gravadas de uma conta (ou campanha), por dia."""
+        if not self.enabled:
+            return []
+        await self.init()
+        metrics = campaign_metrics_table.c
+        query = select(campaign_metrics_table).where(metrics.account_id == account_id)
+        if campaign_id:
+            query = query.where(metrics.campaign_id == campaign_id)
+        if start:
+            query = query.where(metrics.date >= date.fromisoformat(start))
+        if end:
+            query = query.where(metrics.date <= date.fromisoformat(end))
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query.order_by(metrics.campaign_id, metrics.date))
+            return [dict(row) for row in result.mappings()]
+
+    def stats(self) -> dict:
+        """Estado do store (para /health)."""
+        return {
+            "enabled": self.enabled,
+            "dialect": self.dialect if self._engine is not None else None,
+            "statements": self.statements,
+            "rows_written": self.rows_written,
+        }
+
+
+# Store único do processo
+store = MetricsStore()
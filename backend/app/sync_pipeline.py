@@ -0,0 +1,224 @@
+"""
+Pipeline da sincronização completa (campanhas + métricas) de uma conta
+
+Quatro estágios rodando ao mesmo tempo, ligados por filas limitadas
+(asyncio.Queue com maxsize):
+
+    listar ──> comparar ──> buscar insights (N workers) ──> gravar
+                   └────────── campanhas alteradas ───────────┘
+
+- listar: percorre as campanhas da conta uma única vez por execução
+- comparar: separa as campanhas alteradas desde a marca d'água (vão para
+  meta_campaigns) e agrupa os IDs em lotes de sync_metrics_chunk_size
+- buscar insights: sync_metrics_max_concurrency workers pedem a série
+  diária de cada lote (get_daily_insights)
+- gravar: um único escritor faz os upserts em lote (app.store)
+
+Os insights dos primeiros lotes são pedidos enquanto a listagem ainda
+está no meio, e uma fila cheia segura o estágio anterior: a listagem não
+corre à frente dos insights nem a memória cresce com o tamanho da conta.
+"""
+from typing import Optional
+import asyncio
+import time
+from app.config import settings
+from app.jobs import count_progress
+from app.store import store
+from app.sync_state import sync_state, parse_graph_time
+from app.tools.meta_api import iter_campaigns, get_daily_insights
+
+
+# Fim de fila: cada estágio avisa o seguinte que não há mais itens
+_DONE = object()
+
+
+def group_failures(failed: dict) -> list:
+    """Um erro por mensagem, com quantas campanhas ele atingiu."""
+    grouped = {}
+    for campaign_id, error in failed.items():
+        grouped.setdefault(error, []).append(campaign_id)
+    return [f"{len(ids)} campanha(s) sem métricas: {error}" for error, ids in grouped.items()]
+
+
+class AccountSyncPipeline:
+    """
+    Sincronização completa de uma conta em uma listagem só.
+
+    Como a listagem é sempre completa, toda execução que chega ao fim
+    também reconcilia as exclusões; full=True (ou reconciliação vencida)
+    só muda quais campanhas são regravadas: todas em vez das alteradas.
+    """
+
+    def __init__(self, account_id: str, date_preset: str = "last_7d", full: bool = False):
+        self.account_id = account_id
+        self.date_preset = date_preset
+        self.state = sync_state.for_account(account_id)
+        self.full = full or self.state.needs_full_sync()
+        self.changed_since = None if self.full else self.state.updated_since()
+        self.workers = max(1, settings.sync_metrics_max_concurrency)
+
+        self.listed = asyncio.Queue(maxsize=settings.sync_pipeline_queue_size)
+        self.chunks = asyncio.Queue(maxsize=self.workers * 2)
+        self.writes = asyncio.Queue(maxsize=settings.sync_pipeline_queue_size)
+
+        self.total = 0
+        self.seen = set()
+        self.watermark = self.state.watermark or 0
+        self.listing_error: Optional[str] = None
+        self.campaigns_synced = 0
+        self.campaign_write_failed = False
+        self.metrics_synced = 0
+        self.days = set()
+        self.requests = 0
+        self.errors = []
+        self.failed = {}  # campanha -> erro de métricas
+
+    async def run(self) -> dict:
+        """Roda os estágios até a última gravação e devolve o resumo da conta."""
+        started = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._list())
+                group.create_task(self._diff())
+                fetchers = [group.create_task(self._fetch()) for _ in range(self.workers)]
+                group.create_task(self._close_writes(fetchers))
+                group.create_task(self._persist())
+        except ExceptionGroup as e:
+            # Um estágio quebrou e os outros foram cancelados: propaga o erro original
+            raise e.exceptions[0]
+        wall_time = time.perf_counter() - started
+
+        if self.listing_error is not None and self.total == 0:
+            return {"success": False, "error": self.listing_error}
+
+        deleted = await self._reconcile()
+        errors = self.errors + group_failures(self.failed)
+
+        return {
+            "success": not errors,
+            "mode": "full" if self.full else "incremental",
+            "campaigns_synced": self.campaigns_synced,
+            "campaigns_deleted": deleted,
+            "total": self.total,
+            "metrics_synced": self.metrics_synced,
+            "days": len(self.days),
+            "errors": errors,
+            "errors_by_campaign": self.failed,
+            "requests": self.requests,
+            "wall_time": round(wall_time, 3),
+            "requests_per_second": round(self.requests / wall_time, 2) if wall_time > 0 else 0.0,
+        }
+
+    async def _list(self) -> None:
+        listed = 0
+        try:
+            # Sem limite de páginas: uma listagem cortada não pode reconciliar exclusões
+            async for camp in iter_campaigns(account_id=self.account_id, max_pages=None):
+                await self.listed.put(camp)
+                listed += 1
+        except Exception as e:
+            # Erro da Meta API ou de rede ao buscar uma página
+            self.listing_error = str(e)
+            if listed:
+                self.errors.append(f"Listagem interrompida após {listed} campanhas: {str(e)}")
+        await self.listed.put(_DONE)
+
+    async def _diff(self) -> None:
+        batch = []
+        chunk = []
+        while (camp := await self.listed.get()) is not _DONE:
+            self.total += 1
+            self.seen.add(camp.id)
+            count_progress("campaigns_listed")
+
+            updated = parse_graph_time(camp.updated_time) if camp.updated_time else None
+            if updated:
+                self.watermark = max(self.watermark, updated)
+            if self.changed_since is None or updated is None or updated > self.changed_since:
+                batch.append(camp)
+                if len(batch) >= settings.database_upsert_batch_size:
+                    await self.writes.put(("campaigns", batch))
+                    batch = []
+
+            chunk.append(camp.id)
+            if len(chunk) >= settings.sync_metrics_chunk_size:
+                await self.chunks.put(chunk)
+                chunk = []
+
+        if batch:
+            await self.writes.put(("campaigns", batch))
+        if chunk:
+            await self.chunks.put(chunk)
+        for _ in range(self.workers):
+            await self.chunks.put(_DONE)
+
+    async def _fetch(self) -> None:
+        while (chunk := await self.chunks.get()) is not _DONE:
+            try:
+                result = await get_daily_insights(
+                    self.date_preset, campaign_ids=chunk, account_id=self.account_id
+                )
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            await self.writes.put(("metrics", chunk, result))
+
+    async def _close_writes(self, fetchers: list) -> None:
+        # As campanhas alteradas entram na fila antes do fim dos lotes,
+        # então depois dos fetchers não chega mais nada para gravar
+        await asyncio.gather(*fetchers)
+        await self.writes.put(_DONE)
+
+    async def _persist(self) -> None:
+        while (item := await self.writes.get()) is not _DONE:
+            if item[0] == "campaigns":
+                await self._write_campaigns(item[1])
+            else:
+                await self._write_metrics(item[1], item[2])
+
+    async def _write_campaigns(self, batch: list) -> None:
+        try:
+            written = await store.upsert_campaigns(self.account_id, batch)
+        except Exception as e:
+            self.errors.append(f"Erro ao gravar {len(batch)} campanhas: {str(e)}")
+            self.campaign_write_failed = True
+            return
+        self.campaigns_synced += written
+        count_progress("rows_written", written)
+
+    async def _write_metrics(self, chunk: list, result: dict) -> None:
+        if not result["success"]:
+            self.failed.update(dict.fromkeys(chunk, result["error"]))
+            return
+
+        self.requests += result.get("pages_fetched", 0)
+        series = result["series"]
+        try:
+            written = await store.upsert_daily_metrics(self.account_id, series.rows())
+        except Exception as e:
+            self.failed.update(dict.fromkeys(chunk, f"Erro ao gravar métricas: {str(e)}"))
+            return
+        self.metrics_synced += written
+        self.days.update(series.days)
+        count_progress("rows_written", written)
+
+    async def _reconcile(self) -> list:
+        """
+        Marca as exclusões e avança a marca d'água, só se a listagem chegou
+        ao fim e todas as campanhas foram gravadas (senão a próxima execução
+        repete o intervalo).
+        """
+        if self.listing_error is not None or self.campaign_write_failed:
+            return []
+
+        # Conhecidas em memória ou no banco: o banco sobrevive a reinícios
+        deleted = []
+        try:
+            known = self.state.campaign_ids | await store.active_campaign_ids(self.account_id)
+            deleted = sorted(known - self.seen)
+            await store.mark_deleted(self.account_id, deleted)
+        except Exception as e:
+            self.errors.append(f"Erro ao marcar campanhas excluídas: {str(e)}")
+        self.state.campaign_ids = self.seen
+        self.state.last_full_sync = time.time()
+        self.state.watermark = self.watermark or self.state.watermark
+        return deleted
@@ -0,0 +1,76 @@
+"""
+Estado da sincronização incremental de campanhas
+
+Para cada conta de anúncios guardamos a marca d'água (o maior updated_time
+já sincronizado) e os IDs de campanhas conhecidos. A sincronização normal
+pede à Meta só o que mudou depois da marca; de tempos em tempos
+(sync_full_reconcile_interval) uma passada completa lista tudo e detecta
+campanhas excluídas, que nunca aparecem como "alteradas".
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+import time
+from app.config import settings
+
+
+def parse_graph_time(value: str) -> int:
+    """Converte um horário da Graph API ("2026-01-15T12:00:00+0000") em timestamp Unix."""
+    return int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+
+@dataclass
+class AccountSyncState:
+    """Marca d'água e campanhas conhecidas de uma conta."""
+    account_id: str
+    watermark: Optional[int] = None  # maior updated_time sincronizado (Unix)
+    last_full_sync: Optional[float] = None  # time.time() da última passada completa
+    campaign_ids: set = field(default_factory=set)
+
+    def needs_full_sync(self) -> bool:
+        """Primeira sincronização ou reconciliação vencida."""
+        if self.watermark is None or self.last_full_sync is None:
+            return True
+        return time.time() - self.last_full_sync >= settings.sync_full_reconcile_interval
+
+    def updated_since(self) -> Optional[int]:
+        """
+        Filtro de updated_time da próxima sincronização incremental.
+
+        Recua sync_watermark_overlap segundos para não perder alterações
+        gravadas na Meta com o mesmo segundo da marca (o upsert é idempotente).
+        """
+        if self.watermark is None:
+            return None
+        return self.watermark - settings.sync_watermark_overlap
+
+    def to_dict(self) -> dict:
+        return {
+            "watermark": self.watermark,
+            "last_full_sync": self.last_full_sync,
+            "campaigns_known": len(self.campaign_ids),
+        }
+
+
+class SyncStateStore:
+    """Um AccountSyncState por conta de anúncios."""
+
+    def __init__(self):
+        self._states: dict = {}
+
+    def reset(self) -> None:
+        self._states.clear()
+
+    def for_account(self, account_id: str) -> AccountSyncState:
+        state = self._states.get(account_id)
+        if state is None:
+            state = self._states[account_id] = AccountSyncState(account_id)
+        return state
+
+    def stats(self) -> dict:
+        """Estado de cada conta (para /health)."""
+        return {account: state.to_dict() for account, state in self._states.items()}
+
+
+# Registro único do processo
+sync_state = SyncStateStore()
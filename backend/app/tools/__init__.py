@@ -4,11 +4,17 @@ Cada tool é uma função que pode ser chamada pelos agentes para executar açõ
 """
 from app.tools.meta_api import (
     list_campaigns,
+    iter_campaigns,
     get_campaign_details,
+    load_campaign_hierarchy,
     create_campaign,
     update_campaign_status,
+    update_campaigns_status,
     get_campaign_insights,
+    get_campaign_insights_batch,
+    get_daily_insights,
     duplicate_campaign,
+    copy_campaign_in_chunks,
 )
 from app.tools.database import (
     get_user_settings,
@@ -24,11 +30,17 @@ from app.tools.whatsapp import (
 __all__ = [
     # Meta API
     "list_campaigns",
+    "iter_campaigns",
     "get_campaign_details",
+    "load_campaign_hierarchy",
     "create_campaign",
     "update_campaign_status",
+    "update_campaigns_status",
     "get_campaign_insights",
+    "get_campaign_insights_batch",
+    "get_daily_insights",
     "duplicate_campaign",
+    "copy_campaign_in_chunks",
     # Database
     "get_user_settings",
     "get_alerts",
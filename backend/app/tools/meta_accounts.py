@@ -0,0 +1,70 @@
+"""
+Várias contas de anúncios na mesma instalação
+
+configured_accounts() lê as contas das configurações e fan_out() executa
+uma função para cada conta em paralelo, cada uma dentro de
+meta_client.account_scope. Limitador de taxa, circuit breaker e limite de
+requisições simultâneas são por conta (a Meta limita por conta), então uma
+conta perto do limite não atrasa as outras.
+"""
+from typing import Any, Awaitable, Callable, Iterable, Optional
+import asyncio
+from app.config import settings
+from app.tools.meta_client import account_scope, normalize_account_id
+
+
+def parse_accounts(accounts) -> list:
+    """
+    Normaliza uma lista de contas ("123,act_456" ou lista).
+
+    Returns:
+        IDs com o prefixo act_, sem repetição, na ordem recebida
+    """
+    if isinstance(accounts, str):
+        accounts = accounts.split(",")
+
+    ids = (str(account).strip() for account in accounts if account)
+    return list(dict.fromkeys(normalize_account_id(a) for a in ids if a))
+
+
+def configured_accounts() -> list:
+    """Contas de meta_ad_account_ids; sem ela, a conta única de meta_ad_account_id."""
+    return parse_accounts(settings.meta_ad_account_ids or settings.meta_ad_account_id)
+
+
+async def fan_out(
+    call: Callable[[str], Awaitable[Any]],
+    accounts: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None
+) -> dict:
+    """
+    Executa call(account_id) para cada conta, em paralelo.
+
+    No máximo meta_accounts_max_concurrency contas ao mesmo tempo. Dentro
+    de cada conta as chamadas à Meta seguem os limites dela (ver
+    meta_client.send). Uma conta que falha não afeta as outras.
+
+    Args:
+        call: Corrotina que recebe o ID da conta (com act_)
+        accounts: Contas (padrão: configured_accounts())
+        max_concurrency: Contas simultâneas (padrão: meta_accounts_max_concurrency)
+
+    Returns:
+        Dict conta -> resultado de call; exceções viram
+        {"success": False, "error": ...}
+    """
+    accounts = parse_accounts(accounts) if accounts is not None else configured_accounts()
+    semaphore = asyncio.Semaphore(max_concurrency or settings.meta_accounts_max_concurrency)
+
+    async def run(account_id: str) -> Any:
+        async with semaphore:
+            # Cada conta roda na própria tarefa (gather), com o próprio escopo
+            with account_scope(account_id):
+                try:
+                    return await call(account_id)
+                except Exception as e:
+                    print(f"❌ Erro na conta {account_id}: {e}")
+                    return {"success": False, "error": str(e)}
+
+    results = await asyncio.gather(*(run(account_id) for account_id in accounts))
+    return dict(zip(accounts, results))
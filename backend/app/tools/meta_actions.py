@@ -0,0 +1,157 @@
+"""
+Extração de conversões e receita de actions/action_values
+
+A Meta devolve conversões e receita como listas de
+{"action_type": ..., "value": "..."} em cada linha de insights. Quais
+tipos de ação contam (purchase, lead, complete_registration...) depende
+do negócio de cada conta: o padrão vem de meta_conversion_actions e
+meta_revenue_actions, e meta_conversion_mapping sobrescreve por conta.
+
+Cada mapeamento é compilado uma vez em um ActionExtractor (frozensets,
+consultados em O(1) por ação) e reaproveitado entre chamadas.
+ActionExtractor.extract converte uma página inteira de linhas em colunas
+(array de floats) em uma única passada, sem criar objetos por ação.
+"""
+from array import array
+from functools import lru_cache
+from typing import Iterable, Optional
+import json
+from app.config import settings
+from app.tools.meta_client import normalize_account_id, scoped_account
+
+
+def _action_types(value) -> tuple:
+    """Lista de tipos de ação a partir de "a,b" ou ["a", "b"], sem repetição."""
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(sorted({item.strip() for item in value or () if item and item.strip()}))
+
+
+class ActionExtractor:
+    """
+    Mapeamento compilado de tipos de ação para conversões e receita.
+
+    Instâncias são imutáveis e compartilhadas; use extractor_for() para
+    obter a da conta em vez de criar uma nova.
+    """
+
+    __slots__ = ("conversion_actions", "revenue_actions")
+
+    def __init__(self, conversion_actions: Iterable[str], revenue_actions: Iterable[str]):
+        self.conversion_actions = frozenset(conversion_actions)
+        self.revenue_actions = frozenset(revenue_actions)
+
+    def __repr__(self) -> str:
+        return (
+            f"ActionExtractor(conversions={sorted(self.conversion_actions)}, "
+            f"revenue={sorted(self.revenue_actions)})"
+        )
+
+    def conversions(self, actions: Optional[list]) -> int:
+        """Soma das ações de conversão de uma linha."""
+        if not actions:
+            return 0
+        types = self.conversion_actions
+        total = 0.0
+        for action in actions:
+            if action.get("action_type") in types:
+                total += float(action.get("value", 0))
+        return int(total)
+
+    def revenue(self, action_values: Optional[list]) -> float:
+        """Soma dos valores de receita de uma linha."""
+        if not action_values:
+            return 0.0
+        types = self.revenue_actions
+        total = 0.0
+        for value in action_values:
+            if value.get("action_type") in types:
+                total += float(value.get("value", 0))
+        return total
+
+    def extract(self, rows: list) -> tuple:
+        """
+        Conversões, receita e ROAS de uma página de linhas em uma passada.
+
+        Args:
+            rows: Linhas de /insights (com actions, action_values e spend)
+
+        Returns:
+            (conversions, revenue, roas): arrays de floats alinhados com rows
+        """
+        conversion_types = self.conversion_actions
+        revenue_types = self.revenue_actions
+        conversions = array("d", bytes(8 * len(rows)))
+        revenue = array("d", bytes(8 * len(rows)))
+        roas = array("d", bytes(8 * len(rows)))
+
+        # Laços explícitos: geradores com sum() custam mais que a própria soma
+        for i, row in enumerate(rows):
+            actions = row.get("actions")
+            if actions:
+                total = 0.0
+                for action in actions:
+                    if action.get("action_type") in conversion_types:
+                        total += float(action.get("value", 0))
+                conversions[i] = total
+            action_values = row.get("action_values")
+            if action_values:
+                total = 0.0
+                for value in action_values:
+                    if value.get("action_type") in revenue_types:
+                        total += float(value.get("value", 0))
+                revenue[i] = total
+                spend = float(row.get("spend") or 0)
+                if spend > 0:
+                    roas[i] = total / spend
+
+        return conversions, revenue, roas
+
+
+@lru_cache(maxsize=8)
+def _parse_mapping(raw: str) -> dict:
+    """meta_conversion_mapping (JSON) indexado pela conta com prefixo act_."""
+    if not raw.strip():
+        return {}
+    try:
+        mapping = json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"⚠️ meta_conversion_mapping inválido, usando o padrão: {e}")
+        return {}
+    return {normalize_account_id(account): rules or {} for account, rules in mapping.items()}
+
+
+@lru_cache(maxsize=128)
+def _shared(conversion_actions: tuple, revenue_actions: tuple) -> ActionExtractor:
+    """Uma instância por par de tipos: contas com o mesmo mapeamento a compartilham."""
+    return ActionExtractor(conversion_actions, revenue_actions)
+
+
+@lru_cache(maxsize=256)
+def _compile(mapping: str, conversion_actions: str, revenue_actions: str, account: str) -> ActionExtractor:
+    """
+    Extractor da conta, indexado pelas strings cruas das configurações:
+    nada é relido nem reordenado enquanto elas não mudarem.
+    """
+    rules = _parse_mapping(mapping).get(account, {})
+    return _shared(
+        _action_types(rules.get("conversions", conversion_actions)),
+        _action_types(rules.get("revenue", revenue_actions)),
+    )
+
+
+def extractor_for(account_id: Optional[str] = None) -> ActionExtractor:
+    """
+    ActionExtractor da conta (padrão: a de account_scope ou a configurada).
+
+    Contas sem entrada em meta_conversion_mapping usam
+    meta_conversion_actions e meta_revenue_actions; uma entrada pode
+    sobrescrever só "conversions" ou só "revenue".
+    """
+    account = account_id or scoped_account() or settings.meta_ad_account_id
+    return _compile(
+        settings.meta_conversion_mapping or "",
+        settings.meta_conversion_actions or "",
+        settings.meta_revenue_actions or "",
+        normalize_account_id(account) if account else "",
+    )
@@ -1,10 +1,97 @@
 """
 Tools para interação com Meta Marketing API
 """
-from typing import Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Optional
+from urllib.parse import urlencode
 import asyncio
+import json
+import math
 import httpx
 from app.config import settings
+from app.jobs import count_progress
+from app.tools.meta_cache import response_cache, single_flight, cache_key
+from app.tools.meta_client import (
+    graph_client,
+    graph_url,
+    endpoint_timeout,
+    send,
+    normalize_account_id,
+    scoped_account,
+)
+from app.tools.meta_json import decode_json, StreamedPage
+from app.tools.meta_timeseries import DailySeries, DAILY_METRICS
+from app.tools.meta_breakdowns import BreakdownStore, resolve_breakdowns
+from app.tools.meta_hierarchy import CampaignTree, split_nested_fields, join_nested_fields
+from app.tools.meta_records import Campaign, AdSet, Ad, InsightRow
+from app.tools.meta_actions import extractor_for
+
+
+# Máximo de sub-requisições aceitas pela Graph API em uma chamada /batch
+GRAPH_BATCH_SIZE = 50
+
+CAMPAIGN_LIST_FIELDS = "id,name,objective,status,effective_status,daily_budget,lifetime_budget,special_ad_categories,created_time,updated_time"
+
+CAMPAIGN_DETAILS_FIELDS = "id,name,objective,status,daily_budget,lifetime_budget,special_ad_categories,created_time,adsets{id,name,status,daily_budget,targeting},ads{id,name,status,adset_id,creative}"
+
+CAMPAIGN_INSIGHTS_FIELDS = "impressions,clicks,spend,cpc,cpm,ctr,reach,actions,action_values"
+
+ACCOUNT_INSIGHTS_FIELDS = "spend,impressions,clicks,ctr,cpm,cpc,reach,actions,action_values"
+
+# Perfis de campos por recurso. "full" é o padrão (comportamento original);
+# "minimal" e "dashboard" evitam baixar e decodificar campos que não serão
+# usados, principalmente os blobs de targeting e creative.
+FIELD_PROFILES = {
+    "campaign": {
+        "minimal": "id,name,status,effective_status",
+        "dashboard": "id,name,objective,status,effective_status,daily_budget,lifetime_budget,updated_time",
+        "full": CAMPAIGN_LIST_FIELDS,
+    },
+    "campaign_details": {
+        "minimal": "id,name,status",
+        "dashboard": "id,name,objective,status,daily_budget,lifetime_budget,special_ad_categories,created_time,adsets{id,name,status,daily_budget},ads{id,name,status,adset_id}",
+        "full": CAMPAIGN_DETAILS_FIELDS,
+    },
+    "campaign_insights": {
+        "minimal": "impressions,clicks,spend",
+        "dashboard": "impressions,clicks,spend,cpc,ctr,actions,action_values",
+        "full": CAMPAIGN_INSIGHTS_FIELDS,
+    },
+    "account_insights": {
+        "minimal": "spend,impressions,clicks",
+        "dashboard": "spend,impressions,clicks,ctr,cpc,actions,action_values",
+        "full": ACCOUNT_INSIGHTS_FIELDS,
+    },
+}
+
+# Níveis aceitos por /act_x/insights para uma linha por objeto
+INSIGHTS_OBJECT_LEVELS = ("campaign", "adset", "ad")
+
+
+def resolve_fields(resource: str, fields=None) -> str:
+    """
+    Resolve o parâmetro `fields` de uma leitura da Graph API.
+    
+    Args:
+        resource: Chave de FIELD_PROFILES (campaign, campaign_details,
+            campaign_insights, account_insights)
+        fields: Nome de perfil (minimal, dashboard, full), lista de campos
+            ou string separada por vírgulas. None usa o perfil "full".
+        
+    Returns:
+        String de campos no formato aceito pela Graph API
+    """
+    profiles = FIELD_PROFILES[resource]
+    
+    if fields is None:
+        return profiles["full"]
+    
+    if isinstance(fields, str):
+        if fields in profiles:
+            return profiles[fields]
+        fields = fields.split(",")
+    
+    return ",".join(f.strip() for f in fields if f.strip())
 
 
 def _get_auth_headers() -> dict:
@@ -17,18 +104,348 @@ def _get_auth_headers() -> dict:
     }
 
 
+def _account_id(account_id: Optional[str] = None) -> str:
+    """
+    Conta de anúncios de uma chamada, com o prefixo act_.
+    
+    Ordem: account_id explícito, conta de meta_client.account_scope (fan-out
+    por várias contas) e, por fim, a conta padrão das configurações.
+    """
+    return normalize_account_id(account_id or scoped_account() or settings.meta_ad_account_id)
+
+
+async def _get_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[dict],
+    headers: dict,
+    timeout: httpx.Timeout,
+    resource: str,
+    tags: tuple = (),
+    account: Optional[str] = None
+) -> dict:
+    """
+    GET na Graph API passando pelo cache de respostas.
+    
+    Respostas bem-sucedidas ficam guardadas pelo TTL do recurso
+    (ver meta_cache); erros nunca são guardados. Chamadas idênticas
+    simultâneas compartilham uma única requisição. O dict devolvido pode
+    vir do cache ou de outra chamada, então não deve ser alterado.
+    
+    Args:
+        resource: campaign ou insights (define o TTL)
+        tags: IDs de objetos afetados, para invalidação após escritas
+        account: Conta de anúncios (padrão: _account_id())
+    """
+    account = account or _account_id()
+    key = cache_key(url, params, account)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    async def fetch() -> dict:
+        if params is None:
+            response = await send(client, "get", url, account, headers=headers, timeout=timeout)
+        else:
+            response = await send(client, "get", url, account, params=params, headers=headers, timeout=timeout)
+        data = decode_json(response)
+        
+        if response.status_code == 200 and "error" not in data:
+            response_cache.set(key, data, resource, tags)
+        
+        return data
+    
+    return await single_flight.run(key, fetch)
+
+
+def _invalidate_after_write(*object_ids: str) -> None:
+    """Descarta do cache listagens de campanhas e leituras dos objetos alterados."""
+    response_cache.invalidate(resources=("campaign",), tags=object_ids)
+
+
+class MetaAPIError(Exception):
+    """Erro retornado pela Graph API (campo "error" da resposta)."""
+
+    def __init__(self, message: str, code: Optional[int] = None, subcode: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.subcode = subcode
+
+    @classmethod
+    def from_error(cls, error: dict) -> "MetaAPIError":
+        """Cria a exceção a partir do objeto "error" da Graph API."""
+        return cls(
+            error.get("message", "Erro desconhecido"),
+            code=error.get("code"),
+            subcode=error.get("error_subcode"),
+        )
+
+
+class MetaListingTruncated(MetaAPIError):
+    """A listagem parou no limite de páginas, com mais páginas na Meta."""
+
+    def __init__(self, max_pages: int):
+        super().__init__(f"Listagem interrompida no limite de {max_pages} páginas; há mais campanhas na conta")
+        self.max_pages = max_pages
+
+
+# Limite de páginas por listagem, para evitar loops infinitos
+MAX_CAMPAIGN_PAGES = 50
+
+def _campaigns_query(
+    status: Optional[str],
+    page_size: int,
+    fields,
+    account_id: Optional[str] = None,
+    updated_since: Optional[int] = None
+) -> tuple:
+    """
+    Monta (account_id, url, params) da listagem de campanhas da conta.
+    
+    Com updated_since (timestamp Unix), a Meta só devolve campanhas
+    alteradas depois dele (filtro em updated_time).
+    
+    Raises:
+        MetaAPIError: Meta API não configurada
+    """
+    if not settings.meta_access_token:
+        raise MetaAPIError("Meta API não configurada. Configure META_ACCESS_TOKEN no .env")
+    
+    account_id = _account_id(account_id)
+    url = graph_url(f"{account_id}/campaigns")
+    params = {
+        "fields": resolve_fields("campaign", fields),
+        "limit": page_size,
+    }
+    
+    filters = []
+    if status:
+        filters.append({"field": "effective_status", "operator": "IN", "value": [status]})
+    if updated_since:
+        filters.append({"field": "updated_time", "operator": "GREATER_THAN", "value": int(updated_since)})
+    if filters:
+        params["filtering"] = json.dumps(filters)
+    
+    return account_id, url, params
+
+
+async def _stream_records(
+    url: str,
+    params: Optional[dict],
+    headers: dict,
+    timeout: httpx.Timeout,
+    max_pages: Optional[int] = None,
+    account: Optional[str] = None,
+    strict: bool = False
+) -> AsyncIterator[dict]:
+    """
+    Percorre um endpoint paginado decodificando o JSON de forma incremental.
+    
+    Cada item de "data" é entregue assim que seus bytes chegam, sem montar
+    a página inteira em memória (ver meta_json.StreamedPage). Não passa pelo
+    cache de respostas: é o caminho para páginas grandes lidas uma vez.
+    
+    Com strict=True, parar em max_pages com mais páginas na Meta levanta
+    MetaListingTruncated em vez de encerrar em silêncio.
+    
+    Raises:
+        MetaAPIError: Erro retornado pela Graph API
+    """
+    account = account or _account_id()
+    pages = 0
+    
+    async with graph_client() as client:
+        while url:
+            response = await send(
+                client, "get", url, account, stream=True, params=params, headers=headers, timeout=timeout
+            )
+            page = StreamedPage(response)
+            try:
+                async for record in page.records():
+                    yield record
+            finally:
+                await response.aclose()
+            
+            if page.error:
+                raise MetaAPIError.from_error(page.error)
+            
+            pages += 1
+            count_progress("pages_fetched")
+            if max_pages and pages >= max_pages:
+                if strict and page.next_url:
+                    raise MetaListingTruncated(max_pages)
+                return
+            
+            # paging.next já traz a query completa
+            url, params = page.next_url, None
+
+
+async def iter_campaign_pages(
+    status: Optional[str] = None,
+    page_size: int = 50,
+    max_pages: Optional[int] = MAX_CAMPAIGN_PAGES,
+    fields=None,
+    account_id: Optional[str] = None,
+    updated_since: Optional[int] = None
+) -> AsyncIterator[tuple]:
+    """
+    Percorre as páginas de campanhas da conta sob demanda.
+    
+    Cada página só é pedida à Meta quando o consumidor pede o próximo item,
+    então parar a iteração (break) interrompe a paginação. Use com
+    contextlib.aclosing para liberar a conexão ao sair antes do fim.
+    
+    Args:
+        status: Filtrar por effective_status (ACTIVE, PAUSED, ARCHIVED)
+        page_size: Campanhas por página pedidas à Meta
+        max_pages: Número máximo de páginas (None = sem limite)
+        fields: Perfil (minimal, dashboard, full) ou lista de campos
+        account_id: Conta de anúncios (padrão: ver _account_id)
+        updated_since: Só campanhas alteradas depois deste timestamp Unix
+        
+    Yields:
+        (campanhas da página como Campaign, True se a Meta indicou uma
+        próxima página)
+        
+    Raises:
+        MetaAPIError: Erro retornado pela Graph API
+    """
+    account_id, url, params = _campaigns_query(status, page_size, fields, account_id, updated_since)
+    headers = _get_auth_headers()
+    
+    async with graph_client() as client:
+        data = await _get_json(
+            client, url, params, headers, endpoint_timeout(), "campaign", (account_id,), account_id
+        )
+        pages = 0
+        
+        while True:
+            if "error" in data:
+                raise MetaAPIError.from_error(data["error"])
+            
+            pages += 1
+            count_progress("pages_fetched")
+            next_url = data.get("paging", {}).get("next")
+            
+            yield [Campaign.from_graph(c) for c in data.get("data", [])], next_url is not None
+            
+            if not next_url or (max_pages and pages >= max_pages):
+                return
+            
+            # Sem pausa fixa: o limitador compartilhado espaça as chamadas
+            # conforme o uso informado pela Meta
+            data = await _get_json(
+                client, next_url, None, headers, endpoint_timeout(), "campaign", (account_id,), account_id
+            )
+
+
+async def iter_campaigns(
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    include_drafts: bool = True,
+    page_size: int = 50,
+    fields=None,
+    stream: bool = False,
+    account_id: Optional[str] = None,
+    updated_since: Optional[int] = None,
+    max_pages: Optional[int] = MAX_CAMPAIGN_PAGES
+) -> AsyncIterator[Campaign]:
+    """
+    Itera sobre as campanhas da conta, uma a uma, sem montar a lista inteira.
+    
+    Para de pedir páginas assim que `limit` campanhas forem entregues.
+    Com stream=True cada página também é decodificada de forma incremental,
+    o que vale a pena para páginas grandes (page_size alto).
+    
+    Se max_pages páginas não bastarem para chegar ao fim (ou a `limit`),
+    levanta MetaListingTruncated: a listagem nunca termina cortada em
+    silêncio. Quem precisa de todas as campanhas (sincronização) passa
+    max_pages=None.
+    
+    Args:
+        status: Filtrar por status (ACTIVE, PAUSED, ARCHIVED)
+        limit: Número máximo de campanhas (None = todas)
+        include_drafts: Incluir rascunhos (campanhas em preview/draft)
+        page_size: Campanhas por página pedidas à Meta
+        fields: Perfil (minimal, dashboard, full) ou lista de campos
+        stream: Decodificar as páginas de forma incremental (sem cache)
+        account_id: Conta de anúncios (padrão: ver _account_id)
+        updated_since: Só campanhas alteradas depois deste timestamp Unix
+            (sincronização incremental)
+        max_pages: Número máximo de páginas (None = sem limite)
+        
+    Raises:
+        MetaListingTruncated: max_pages atingido com mais páginas na Meta
+        MetaAPIError: Erro retornado pela Graph API
+    """
+    if limit:
+        page_size = min(page_size, limit)
+    
+    if stream:
+        account_id, url, params = _campaigns_query(status, page_size, fields, account_id, updated_since)
+        source = _stream_records(
+            url, params, _get_auth_headers(), endpoint_timeout(), max_pages, account_id, strict=True
+        )
+    else:
+        source = _page_items(iter_campaign_pages(
+            status, page_size, max_pages, fields=fields, account_id=account_id, updated_since=updated_since
+        ), max_pages)
+    
+    delivered = 0
+    
+    async with aclosing(source) as campaigns:
+        async for campaign in campaigns:
+            if stream:
+                campaign = Campaign.from_graph(campaign)
+            
+            if not include_drafts and campaign.is_draft:
+                continue
+            
+            yield campaign
+            delivered += 1
+            
+            if limit and delivered >= limit:
+                return
+
+
+async def _page_items(pages: AsyncIterator[tuple], max_pages: Optional[int] = None) -> AsyncIterator[Campaign]:
+    """
+    Achata (página, has_next) de iter_campaign_pages em itens.
+    
+    Raises:
+        MetaListingTruncated: a última página ainda tinha próxima (o
+            gerador parou em max_pages)
+    """
+    has_next = False
+    async with aclosing(pages):
+        async for page, has_next in pages:
+            for item in page:
+                yield item
+    
+    if has_next:
+        raise MetaListingTruncated(max_pages)
+
+
 async def list_campaigns(
     status: Optional[str] = None,
     limit: int = 50,
-    include_drafts: bool = True
+    include_drafts: bool = True,
+    fields=None,
+    account_id: Optional[str] = None
 ) -> dict:
     """
     Lista todas as campanhas da conta Meta Ads.
     
+    Construída sobre iter_campaign_pages: só busca as páginas necessárias
+    para chegar a `limit` campanhas.
+    
     Args:
         status: Filtrar por status (ACTIVE, PAUSED, ARCHIVED)
         limit: Número máximo de campanhas
         include_drafts: Incluir rascunhos (campanhas em preview/draft)
+        fields: Perfil (minimal, dashboard, full) ou lista de campos
+        account_id: Conta de anúncios (padrão: ver _account_id)
         
     Returns:
         Dict com lista de campanhas e métricas básicas
@@ -40,160 +457,223 @@ async def list_campaigns(
             "campaigns": []
         }
     
+    campaigns = []
+    page_count = 0
+    has_more = False
+    partial_error = None
+    
     try:
-        # Garantir que o Account ID tenha o prefixo 'act_'
-        account_id = settings.meta_ad_account_id
-        if not account_id.startswith('act_'):
-            account_id = f'act_{account_id}'
-        
-        url = f"https://graph.facebook.com/v24.0/{account_id}/campaigns"
-
-        # Use Authorization header instead of query param for security
-        headers = {
-            "Authorization": f"Bearer {settings.meta_access_token}",
-        }
-
-        params = {
-            "fields": "id,name,objective,status,effective_status,daily_budget,lifetime_budget,special_ad_categories,created_time,updated_time",
-            "limit": limit,
-        }
-        
-        # Incluir rascunhos se solicitado (campanhas com effective_status = PREVIEW ou status = PREPAUSED)
-        if include_drafts and not status:
-            # Buscar todas as campanhas incluindo rascunhos
-            pass  # Sem filtro para incluir tudo
-        elif status:
-            params["filtering"] = f'[{{"field":"effective_status","operator":"IN","value":["{status}"]}}]'
-        
-        all_campaigns = []
-        next_url = None
-        
-        async with httpx.AsyncClient() as client:
-            # Primeira requisição
-            response = await client.get(url, params=params, headers=headers, timeout=30)
-            data = response.json()
-            
-            if "error" in data:
-                error = data["error"]
-                error_code = error.get("code")
-                error_message = error.get("message", "Erro desconhecido")
+        async with aclosing(iter_campaign_pages(status, page_size=limit or 50, fields=fields, account_id=account_id)) as pages:
+            async for page, has_next in pages:
+                page_count += 1
                 
-                # Tratar rate limiting
-                if error_code == 80004 or "too many calls" in error_message.lower():
-                    return {
-                        "success": False,
-                        "error": "Muitas requisições à Meta API. Aguarde alguns segundos e tente novamente.",
-                        "error_code": error_code,
-                        "campaigns": []
-                    }
+                # Filtrar rascunhos se não solicitado
+                campaigns.extend(c for c in page if include_drafts or not c.is_draft)
+                has_more = has_next
                 
+                # Parar a paginação assim que o limite for atingido
+                if limit and len(campaigns) >= limit:
+                    has_more = has_next or len(campaigns) > limit
+                    break
+    
+    except MetaAPIError as e:
+        if page_count == 0:
+            # Tratar rate limiting
+            if e.code == 80004 or "too many calls" in e.message.lower():
                 return {
                     "success": False,
-                    "error": error_message,
-                    "error_code": error_code,
+                    "error": "Muitas requisições à Meta API. Aguarde alguns segundos e tente novamente.",
+                    "error_code": e.code,
                     "campaigns": []
                 }
             
-            # Adicionar campanhas da primeira página
-            campaigns = data.get("data", [])
-            all_campaigns.extend(campaigns)
-            
-            # Buscar páginas seguintes (paginação automática)
-            paging = data.get("paging", {})
-            next_url = paging.get("next")
-            page_count = 1
-            
-            # Limitar número de páginas para evitar loops infinitos ou rate limiting
-            max_pages = 50  # Máximo 50 páginas (50 * limit = muitas campanhas)
-            
-            while next_url and page_count < max_pages:
-                try:
-                    # Pequeno delay entre páginas para evitar rate limiting
-                    await asyncio.sleep(0.5)  # 500ms entre páginas
-                    
-                    response = await client.get(next_url, timeout=30)
-                    data = response.json()
-                    
-                    if "error" in data:
-                        error = data["error"]
-                        error_code = error.get("code")
-                        
-                        # Se for rate limiting, parar e retornar o que já temos
-                        if error_code == 80004 or "too many calls" in error.get("message", "").lower():
-                            break
-                        
-                        # Para outros erros, também parar
-                        break
-                    
-                    campaigns = data.get("data", [])
-                    all_campaigns.extend(campaigns)
-                    
-                    paging = data.get("paging", {})
-                    next_url = paging.get("next")
-                    page_count += 1
-                    
-                except Exception as e:
-                    # Se houver erro ao buscar próxima página, retornar o que já temos
-                    print(f"Aviso: Erro ao buscar página {page_count + 1}: {e}")
-                    break
-        
-        campaigns = all_campaigns
-        
-        # Filtrar rascunhos se não solicitado
-        if not include_drafts:
-            campaigns = [c for c in campaigns if c.get("effective_status") not in ["PREVIEW", "DRAFT"] and c.get("status") != "PREPAUSED"]
-        
-        # Aplicar limite se especificado (já aplicado nas requisições, mas garantir)
-        if limit and len(campaigns) > limit:
-            campaigns = campaigns[:limit]
-        
-        return {
-            "success": True,
-            "total": len(campaigns),
-            "campaigns": campaigns,
-            "pages_fetched": page_count,
-            "has_more": next_url is not None and page_count >= max_pages
-        }
+            return {
+                "success": False,
+                "error": e.message,
+                "error_code": e.code,
+                "campaigns": []
+            }
         
+        # Erro em página seguinte (inclusive rate limit que persistiu após as
+        # esperas do limitador): retornar o que já temos, sinalizando
+        print(f"Aviso: Erro ao buscar página {page_count + 1}: {e}")
+        partial_error = e.message
+    
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "campaigns": []
-        }
+        if page_count == 0:
+            return {
+                "success": False,
+                "error": str(e),
+                "campaigns": []
+            }
+        
+        # Se houver erro ao buscar próxima página (já após as retentativas),
+        # retornar o que já temos, sinalizando
+        print(f"Aviso: Erro ao buscar página {page_count + 1}: {e}")
+        partial_error = str(e)
+    
+    if limit and len(campaigns) > limit:
+        campaigns = campaigns[:limit]
+    
+    result = {
+        "success": True,
+        "total": len(campaigns),
+        "campaigns": campaigns,
+        "pages_fetched": page_count,
+        "has_more": has_more or partial_error is not None,
+        "partial": partial_error is not None,
+    }
+    
+    if partial_error:
+        result["error"] = partial_error
+    
+    return result
 
 
-async def get_campaign_details(campaign_id: str) -> dict:
+async def get_campaign_details(campaign_id: str, fields=None) -> dict:
     """
     Busca detalhes de uma campanha específica, incluindo ad sets e ads.
     
+    Todos os ad sets e anúncios, não só a primeira página de cada edge
+    (ver load_campaign_hierarchy).
+    
     Args:
         campaign_id: ID da campanha no Meta
+        fields: Perfil (minimal, dashboard, full) ou lista de campos.
+            "full" inclui targeting e creative, que são bem pesados.
         
     Returns:
         Dict com detalhes completos da campanha
     """
+    result = await load_campaign_hierarchy(campaign_id, fields)
+    
+    if not result["success"]:
+        return result
+    
+    tree = result.pop("tree")
+    return {**result, "campaign": tree.to_dict()}
+
+
+def _next_page(edge: dict) -> Optional[str]:
+    """URL da próxima página de um edge aninhado (None se acabou)."""
+    return (edge.get("paging") or {}).get("next")
+
+
+async def load_campaign_hierarchy(
+    campaign_id: str,
+    fields=None,
+    max_concurrency: Optional[int] = None
+) -> dict:
+    """
+    Carrega a campanha com todos os seus ad sets e anúncios.
+    
+    A primeira chamada traz a campanha e a primeira página de cada edge
+    aninhado (meta_hierarchy_page_size itens). Os edges que ainda têm
+    páginas são completados em paralelo: os ad sets seguindo o cursor e os
+    anúncios ad set por ad set (/{adset_id}/ads), em vez de um único
+    cursor de anúncios percorrido em série.
+    
+    Args:
+        campaign_id: ID da campanha no Meta
+        fields: Perfil (minimal, dashboard, full) ou lista de campos
+        max_concurrency: Cursores seguidos ao mesmo tempo
+            (padrão: meta_hierarchy_max_concurrency)
+        
+    Returns:
+        Dict com success, tree (CampaignTree), adsets_total e ads_total.
+        Se alguma página seguinte falhar, partial=True e error trazem o
+        motivo, com o que já foi carregado.
+    """
     if not settings.meta_access_token:
         return {"success": False, "error": "Meta API não configurada"}
     
+    plain, nested = split_nested_fields(resolve_fields("campaign_details", fields))
+    page_size = settings.meta_hierarchy_page_size
+    semaphore = asyncio.Semaphore(max_concurrency or settings.meta_hierarchy_max_concurrency)
+    headers = _get_auth_headers()
+    timeout = endpoint_timeout()
+    errors = []
+    
     try:
-        url = f"https://graph.facebook.com/v24.0/{campaign_id}"
-        headers = _get_auth_headers()
-        params = {
-            "fields": "id,name,objective,status,daily_budget,lifetime_budget,special_ad_categories,created_time,adsets{id,name,status,daily_budget,targeting},ads{id,name,status,creative}"
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=30)
-            data = response.json()
-        
-        if "error" in data:
-            return {"success": False, "error": data["error"].get("message")}
-        
-        return {"success": True, "campaign": data}
-        
+        params = {"fields": join_nested_fields(plain, nested, page_size)}
+        async with graph_client() as client:
+            data = await _get_json(
+                client, graph_url(campaign_id), params, headers, timeout, "campaign", (campaign_id,)
+            )
     except Exception as e:
         return {"success": False, "error": str(e)}
+    
+    if "error" in data:
+        return {"success": False, "error": data["error"].get("message")}
+    
+    async def follow(url: str, params: Optional[dict] = None) -> list:
+        # Um cursor é sequencial; o semáforo limita quantos seguem juntos
+        items = []
+        async with semaphore:
+            try:
+                async for item in _stream_records(url, params, headers, timeout):
+                    items.append(item)
+            except Exception as e:
+                print(f"⚠️ Erro ao paginar a hierarquia de {campaign_id}: {e}")
+                errors.append(str(e))
+        return items
+    
+    adsets_edge = data.get("adsets") or {}
+    ads_edge = data.get("ads") or {}
+    adsets = list(adsets_edge.get("data", []))
+    ads = list(ads_edge.get("data", []))
+    ads_by_adset = {}
+    
+    # Com o edge de anúncios incompleto, busca os anúncios de cada ad set
+    per_adset = "adsets" in nested and "ads" in nested and _next_page(ads_edge) is not None
+    ads_params = {"fields": nested.get("ads", ""), "limit": page_size}
+    
+    async def load_ads(adset_ids: list) -> None:
+        pages = await asyncio.gather(
+            *(follow(graph_url(f"{adset_id}/ads"), ads_params) for adset_id in adset_ids)
+        )
+        ads_by_adset.update(zip(adset_ids, pages))
+    
+    async def load_remaining_adsets() -> None:
+        if _next_page(adsets_edge):
+            more = await follow(_next_page(adsets_edge))
+            adsets.extend(more)
+            if per_adset:
+                await load_ads([adset["id"] for adset in more])
+    
+    first_adset_ids = [adset["id"] for adset in adsets]
+    
+    async def load_remaining_ads() -> None:
+        if per_adset:
+            await load_ads(first_adset_ids)
+        elif _next_page(ads_edge):
+            ads.extend(await follow(_next_page(ads_edge)))
+    
+    await asyncio.gather(load_remaining_adsets(), load_remaining_ads())
+    
+    tree = CampaignTree(Campaign.from_graph(data), nested)
+    for adset in adsets:
+        tree.add(AdSet.from_graph(adset))
+    if per_adset:
+        for adset in adsets:
+            for ad in ads_by_adset.get(adset["id"], ()):
+                tree.add(Ad.from_graph(ad), adset["id"])
+    else:
+        for ad in ads:
+            tree.add(Ad.from_graph(ad))
+    
+    result = {
+        "success": True,
+        "tree": tree,
+        "adsets_total": len(tree.adsets()),
+        "ads_total": len(tree.ads()),
+        "partial": bool(errors),
+    }
+    
+    if errors:
+        result["error"] = errors[0]
+    
+    return result
 
 
 async def create_campaign(
@@ -201,7 +681,8 @@ async def create_campaign(
     objective: str,
     status: str = "PAUSED",
     daily_budget: Optional[int] = None,
-    special_ad_categories: list = None
+    special_ad_categories: list = None,
+    account_id: Optional[str] = None
 ) -> dict:
     """
     Cria uma nova campanha no Meta Ads.
@@ -212,6 +693,7 @@ async def create_campaign(
         status: ACTIVE ou PAUSED
         daily_budget: Orçamento diário em centavos
         special_ad_categories: Lista de categorias especiais (HOUSING, EMPLOYMENT, etc.)
+        account_id: Conta de anúncios (padrão: ver _account_id)
         
     Returns:
         Dict com ID da campanha criada
@@ -220,12 +702,8 @@ async def create_campaign(
         return {"success": False, "error": "Meta API não configurada"}
     
     try:
-        # Garantir que o Account ID tenha o prefixo 'act_'
-        account_id = settings.meta_ad_account_id
-        if not account_id.startswith('act_'):
-            account_id = f'act_{account_id}'
-        
-        url = f"https://graph.facebook.com/v24.0/{account_id}/campaigns"
+        account_id = _account_id(account_id)
+        url = graph_url(f"{account_id}/campaigns")
         headers = _get_auth_headers()
 
         # Construir parâmetros
@@ -244,18 +722,20 @@ async def create_campaign(
         if daily_budget:
             data["daily_budget"] = daily_budget
         
-        async with httpx.AsyncClient() as client:
+        async with graph_client() as client:
             # Meta API requer special_ad_categories, mesmo que vazio
             # Enviar como JSON quando for array (vazio ou não)
             data["special_ad_categories"] = categories
 
             # Usar JSON para arrays funcionarem corretamente
-            response = await client.post(url, json=data, headers=headers, timeout=30)
-            result = response.json()
+            response = await send(client, "post", url, account_id, json=data, headers=headers, timeout=endpoint_timeout())
+            result = decode_json(response)
         
         if "error" in result:
             return {"success": False, "error": result["error"].get("message")}
         
+        _invalidate_after_write()
+        
         return {
             "success": True,
             "campaign_id": result.get("id"),
@@ -281,19 +761,22 @@ async def update_campaign_status(campaign_id: str, status: str) -> dict:
         return {"success": False, "error": "Meta API não configurada"}
     
     try:
-        url = f"https://graph.facebook.com/v24.0/{campaign_id}"
+        url = graph_url(campaign_id)
         headers = _get_auth_headers()
         data = {
             "status": status,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=data, headers=headers, timeout=30)
-            result = response.json()
+        async with graph_client() as client:
+            response = await send(client, "post", url, data=data, headers=headers, timeout=endpoint_timeout())
+            result = decode_json(response)
         
         if "error" in result:
             return {"success": False, "error": result["error"].get("message")}
         
+        # Status muda listagens, detalhes e insights filtrados por status
+        _invalidate_after_write(campaign_id, _account_id())
+        
         return {
             "success": True,
             "message": f"Campanha atualizada para {status}"
@@ -303,6 +786,91 @@ async def update_campaign_status(campaign_id: str, status: str) -> dict:
         return {"success": False, "error": str(e)}
 
 
+async def update_campaigns_status(campaign_ids: list, status: str) -> dict:
+    """
+    Atualiza o status de várias campanhas de uma vez (ACTIVE, PAUSED, ARCHIVED).
+    
+    As escritas vão em chamadas /batch (50 por chamada, ver graph_batch),
+    então pausar 80 campanhas custa 2 chamadas em vez de 80. Uma campanha
+    que falha não afeta as outras.
+    
+    Args:
+        campaign_ids: IDs das campanhas (duplicados são ignorados)
+        status: Novo status
+        
+    Returns:
+        Dict com contagens e o resultado por ID em "results"
+        ({"success": True} ou {"success": False, "error": ...})
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    campaign_ids = list(dict.fromkeys(str(cid) for cid in campaign_ids if cid))
+    if not campaign_ids:
+        return {"success": False, "error": "Nenhuma campanha informada"}
+    
+    operations = [
+        {"method": "POST", "relative_url": campaign_id, "body": {"status": status}}
+        for campaign_id in campaign_ids
+    ]
+    responses = await graph_batch(operations)
+    
+    results = {}
+    for campaign_id, response in zip(campaign_ids, responses):
+        if response["success"]:
+            results[campaign_id] = {"success": True}
+        else:
+            results[campaign_id] = {"success": False, "error": response.get("error")}
+    
+    updated = [cid for cid, result in results.items() if result["success"]]
+    failed = [cid for cid, result in results.items() if not result["success"]]
+    
+    if updated:
+        _invalidate_after_write(*updated, _account_id())
+    
+    print(f"🔁 Status {status}: {len(updated)} campanhas atualizadas, {len(failed)} falharam")
+    
+    return {
+        "success": not failed,
+        "status": status,
+        "total": len(campaign_ids),
+        "updated": len(updated),
+        "failed": len(failed),
+        "results": results,
+        "batch_requests": math.ceil(len(operations) / GRAPH_BATCH_SIZE),
+    }
+
+
+# Erro da Graph API para /copies com objetos demais (code, error_subcode)
+COPY_TOO_LARGE = (100, 1885194)
+
+
+def _rename_suffix(name_suffix: str) -> str:
+    """Sufixo de nome para /copies, sempre separado do nome original."""
+    clean_suffix = name_suffix.strip()
+    if not clean_suffix.startswith(" ") and not clean_suffix.startswith("-"):
+        clean_suffix = " " + clean_suffix
+    return clean_suffix
+
+
+def _copied_id(result: dict, object_type: str) -> Optional[str]:
+    """
+    ID do objeto criado por /copies (campaign, adset ou ad).
+    
+    A Meta devolve "copied_<tipo>_id" ou a lista "ad_object_ids"; "id" é o
+    formato alternativo.
+    """
+    copied = result.get(f"copied_{object_type}_id")
+    if copied:
+        return copied
+    
+    for obj in result.get("ad_object_ids") or []:
+        if obj.get("ad_object_type") == object_type:
+            return obj.get("copied_id")
+    
+    return result.get("id")
+
+
 async def duplicate_campaign(
     campaign_id: str, 
     name_suffix: str = " - Cópia",
@@ -328,7 +896,7 @@ async def duplicate_campaign(
         # Usar o endpoint nativo /copies da Meta API
         # Garantir que o Account ID tenha o prefixo 'act_' se necessário
         # Para campaigns, não precisa do prefixo, mas para ad accounts sim
-        url = f"https://graph.facebook.com/v24.0/{campaign_id}/copies"
+        url = graph_url(f"{campaign_id}/copies")
         headers = _get_auth_headers()
 
         # Preparar parâmetros - Meta API aceita form-data ou JSON
@@ -339,17 +907,12 @@ async def duplicate_campaign(
         
         # Adicionar sufixo no nome
         if name_suffix:
-            # Limpar sufixo (remover espaços extras)
-            clean_suffix = name_suffix.strip()
-            # Se não começa com espaço ou traço, adicionar
-            if not clean_suffix.startswith(" ") and not clean_suffix.startswith("-"):
-                clean_suffix = " " + clean_suffix
-            data["rename_suffix"] = clean_suffix
-        
-        async with httpx.AsyncClient() as client:
+            data["rename_suffix"] = _rename_suffix(name_suffix)
+        
+        async with graph_client() as client:
             # Meta API /copies aceita form-data
-            response = await client.post(url, data=data, headers=headers, timeout=30)
-            result = response.json()
+            response = await send(client, "post", url, data=data, headers=headers, timeout=endpoint_timeout("copies"))
+            result = decode_json(response)
         
         if "error" in result:
             error_info = result["error"]
@@ -358,15 +921,15 @@ async def duplicate_campaign(
             error_subcode = error_info.get("error_subcode")
             
             # Erro específico: solicitação de cópia muito grande
-            if error_code == 100 and error_subcode == 1885194:
-                # Tentar novamente sem deep_copy se estava habilitado
+            if (error_code, error_subcode) == COPY_TOO_LARGE:
                 if deep_copy:
                     return {
                         "success": False,
-                        "error": "A campanha tem muitos ad sets e anúncios. Use deep_copy=false ou use batch requests.",
+                        "error": "A campanha tem muitos ad sets e anúncios para uma única cópia.",
                         "error_code": error_code,
                         "error_type": error_info.get("type", "Unknown"),
-                        "suggestion": "Tente duplicar novamente com deep_copy=false ou divida em batch requests.",
+                        "error_subcode": error_subcode,
+                        "suggestion": "Use a cópia em partes (copy_campaign_in_chunks) ou deep_copy=false.",
                     }
             
             return {
@@ -377,22 +940,7 @@ async def duplicate_campaign(
                 "error_subcode": error_subcode,
             }
         
-        # A resposta da Meta API retorna o ID em "copied_campaign_id" ou "ad_object_ids"
-        new_campaign_id = result.get("copied_campaign_id")
-        
-        # Se não encontrou em copied_campaign_id, tentar em ad_object_ids
-        if not new_campaign_id and "ad_object_ids" in result:
-            ad_object_ids = result.get("ad_object_ids", [])
-            if ad_object_ids and len(ad_object_ids) > 0:
-                # Procurar o objeto do tipo "campaign"
-                for obj in ad_object_ids:
-                    if obj.get("ad_object_type") == "campaign":
-                        new_campaign_id = obj.get("copied_id")
-                        break
-        
-        # Fallback: tentar "id" (formato alternativo)
-        if not new_campaign_id:
-            new_campaign_id = result.get("id")
+        new_campaign_id = _copied_id(result, "campaign")
         
         if not new_campaign_id:
             return {
@@ -401,6 +949,8 @@ async def duplicate_campaign(
                 "response": result,
             }
         
+        _invalidate_after_write()
+        
         return {
             "success": True,
             "campaign_id": new_campaign_id,
@@ -415,93 +965,547 @@ async def duplicate_campaign(
         return {"success": False, "error": str(e)}
 
 
-async def get_campaign_insights(
-    campaign_id: str,
-    date_preset: str = "last_7d"
-) -> dict:
+async def _copy_object(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    object_id: str,
+    object_type: str,
+    data: dict
+) -> tuple:
     """
-    Busca insights/métricas de uma campanha.
+    POST {object_id}/copies.
     
-    Args:
-        campaign_id: ID da campanha
-        date_preset: today, yesterday, last_7d, last_14d, last_30d, this_month
-        
     Returns:
-        Dict com métricas da campanha
+        (ID da cópia, resposta completa)
+    
+    Raises:
+        MetaAPIError: Erro retornado pela Graph API
     """
-    if not settings.meta_access_token:
-        return {"success": False, "error": "Meta API não configurada"}
+    async with semaphore:
+        response = await send(
+            client,
+            "post",
+            graph_url(f"{object_id}/copies"),
+            data=data,
+            headers=_get_auth_headers(),
+            timeout=endpoint_timeout("copies"),
+        )
+        result = decode_json(response)
     
-    try:
-        url = f"https://graph.facebook.com/v24.0/{campaign_id}/insights"
-        headers = _get_auth_headers()
-        params = {
-            "fields": "impressions,clicks,spend,cpc,cpm,ctr,reach,conversions,cost_per_conversion",
-            "date_preset": date_preset,
-        }
+    if "error" in result:
+        raise MetaAPIError.from_error(result["error"])
+    
+    copied = _copied_id(result, object_type)
+    if not copied:
+        raise MetaAPIError(f"Resposta de /copies sem o ID do {object_type} copiado")
+    
+    return copied, result
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=30)
-            data = response.json()
-        
-        if "error" in data:
-            return {"success": False, "error": data["error"].get("message")}
+
+async def _child_ids(parent_id: str, edge: str) -> list:
+    """IDs de um edge paginado (ex: ad sets de uma campanha)."""
+    url = graph_url(f"{parent_id}/{edge}")
+    params = {"fields": "id", "limit": 500}
+    return [
+        item["id"]
+        async for item in _stream_records(url, params, _get_auth_headers(), endpoint_timeout())
+    ]
+
+
+async def _copy_adset(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    state: dict,
+    adset_id: str,
+    status_option: str,
+    report: Callable[[str], None]
+) -> None:
+    """
+    Copia um ad set (com seus anúncios) para a campanha nova do checkpoint.
+    
+    Tenta o ad set inteiro em um /copies; se ele for grande demais, copia o
+    ad set vazio e depois cada anúncio. Falhas ficam em state["failed"].
+    """
+    entry = state["adsets"].get(adset_id)
+    data = {
+        "campaign_id": state["campaign_id"],
+        "deep_copy": "true",
+        "status_option": status_option,
+    }
+    
+    try:
+        if entry is None:
+            try:
+                copied, result = await _copy_object(client, semaphore, adset_id, "adset", data)
+                state["adsets"][adset_id] = {"id": copied, "complete": True}
+                for obj in result.get("ad_object_ids") or []:
+                    if obj.get("ad_object_type") == "ad":
+                        state["ads"][obj.get("source_id")] = obj.get("copied_id")
+                return
+            except MetaAPIError as e:
+                if (e.code, e.subcode) != COPY_TOO_LARGE:
+                    raise
+            
+            copied, _ = await _copy_object(
+                client, semaphore, adset_id, "adset", {**data, "deep_copy": "false"}
+            )
+            entry = state["adsets"][adset_id] = {"id": copied, "complete": False}
         
-        insights = data.get("data", [{}])[0] if data.get("data") else {}
+        # Ad set grande demais para um /copies: anúncios um a um
+        ad_ids = await _child_ids(adset_id, "ads")
+        ad_data = {"adset_id": entry["id"], "status_option": status_option}
+        
+        async def copy_ad(ad_id: str) -> None:
+            try:
+                state["ads"][ad_id], _ = await _copy_object(client, semaphore, ad_id, "ad", ad_data)
+            except Exception as e:
+                state["failed"][ad_id] = str(e)
+            report("copying")
+        
+        await asyncio.gather(*(copy_ad(ad_id) for ad_id in ad_ids if ad_id not in state["ads"]))
+        entry["complete"] = all(ad_id in state["ads"] for ad_id in ad_ids)
+        
+    except Exception as e:
+        state["failed"][adset_id] = str(e)
+    finally:
+        report("copying")
+
+
+async def copy_campaign_in_chunks(
+    campaign_id: str,
+    name_suffix: str = " - Cópia",
+    status_option: str = "PAUSED",
+    checkpoint: Optional[dict] = None,
+    on_progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Cópia profunda de uma campanha grande, em partes.
+    
+    Para campanhas que o /copies com deep_copy recusa (erro 100/1885194):
+    copia a campanha sem filhos, depois cada ad set com seus anúncios pelo
+    /copies do ad set, em paralelo (no máximo meta_copy_max_concurrency
+    cópias ao mesmo tempo). Um ad set grande demais é copiado vazio e seus
+    anúncios um a um.
+    
+    O checkpoint guarda o que já foi copiado (origem -> cópia). Se a cópia
+    for interrompida ou falhar em parte, chamar de novo com o mesmo
+    checkpoint continua de onde parou, sem duplicar o que já existe.
+    
+    Args:
+        campaign_id: ID da campanha original
+        name_suffix: Sufixo para o nome da campanha copiada
+        status_option: Status das cópias (ACTIVE, PAUSED)
+        checkpoint: Estado de uma execução anterior; None começa do zero
+        on_progress: Chamado com {"stage", "adsets_total", "adsets_copied",
+            "ads_copied", "failed", "checkpoint"} durante a cópia
         
+    Returns:
+        Dict com o ID da nova campanha, contagens e o "checkpoint"
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    state = checkpoint if checkpoint is not None else {}
+    state.setdefault("source_campaign_id", campaign_id)
+    state.setdefault("campaign_id", None)
+    state.setdefault("adsets_total", 0)
+    state.setdefault("adsets", {})  # ad set de origem -> {"id": cópia, "complete": bool}
+    state.setdefault("ads", {})  # anúncio de origem -> cópia
+    state["failed"] = {}  # refeitos a cada execução
+    
+    def report(stage: str):
+        if on_progress:
+            on_progress({
+                "stage": stage,
+                "adsets_total": state["adsets_total"],
+                "adsets_copied": sum(1 for a in state["adsets"].values() if a["complete"]),
+                "ads_copied": len(state["ads"]),
+                "failed": len(state["failed"]),
+                "checkpoint": state,
+            })
+    
+    semaphore = asyncio.Semaphore(settings.meta_copy_max_concurrency)
+    
+    try:
+        async with graph_client() as client:
+            if not state["campaign_id"]:
+                report("campaign")
+                data = {"deep_copy": "false", "status_option": status_option}
+                if name_suffix:
+                    data["rename_suffix"] = _rename_suffix(name_suffix)
+                state["campaign_id"], _ = await _copy_object(client, semaphore, campaign_id, "campaign", data)
+                _invalidate_after_write()
+            
+            report("listing")
+            adset_ids = await _child_ids(campaign_id, "adsets")
+            state["adsets_total"] = len(adset_ids)
+            
+            report("copying")
+            await asyncio.gather(*(
+                _copy_adset(client, semaphore, state, adset_id, status_option, report)
+                for adset_id in adset_ids
+                if not state["adsets"].get(adset_id, {}).get("complete")
+            ))
+    except MetaAPIError as e:
+        return {"success": False, "error": e.message, "error_code": e.code, "checkpoint": state}
+    except httpx.TimeoutException:
+        return {"success": False, "error": "Timeout ao copiar campanha na Meta API", "checkpoint": state}
+    except Exception as e:
+        return {"success": False, "error": str(e), "checkpoint": state}
+    
+    adsets_copied = sum(1 for a in state["adsets"].values() if a["complete"])
+    print(
+        f"📋 Cópia de {campaign_id} -> {state['campaign_id']}: "
+        f"{adsets_copied}/{state['adsets_total']} ad sets, {len(state['ads'])} anúncios"
+    )
+    
+    if state["failed"]:
+        report("partial")
         return {
-            "success": True,
-            "period": date_preset,
-            "insights": {
-                "impressions": int(insights.get("impressions", 0)),
-                "clicks": int(insights.get("clicks", 0)),
-                "spend": float(insights.get("spend", 0)),
-                "cpc": float(insights.get("cpc", 0)),
-                "cpm": float(insights.get("cpm", 0)),
-                "ctr": float(insights.get("ctr", 0)),
-                "reach": int(insights.get("reach", 0)),
-                "conversions": int(insights.get("conversions", 0)) if insights.get("conversions") else 0,
-            }
+            "success": False,
+            "error": f"{len(state['failed'])} objetos não foram copiados; retome a cópia para tentar de novo",
+            "campaign_id": state["campaign_id"],
+            "failed": state["failed"],
+            "checkpoint": state,
         }
+    
+    report("completed")
+    
+    return {
+        "success": True,
+        "campaign_id": state["campaign_id"],
+        "message": "Campanha copiada com sucesso!",
+        "adsets_copied": adsets_copied,
+        "ads_copied": len(state["ads"]),
+        "status": status_option,
+        "checkpoint": state,
+    }
+
+
+async def get_campaign_insights(
+    campaign_id: str,
+    date_preset: str = "last_7d",
+    fields=None
+) -> dict:
+    """
+    Busca insights/métricas de uma campanha.
+    
+    Args:
+        campaign_id: ID da campanha
+        date_preset: today, yesterday, last_7d, last_14d, last_30d, this_month
+        fields: Perfil (minimal, dashboard, full) ou lista de métricas
+        
+    Returns:
+        Dict com "insights" (InsightRow) da campanha
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    try:
+        url = graph_url(f"{campaign_id}/insights")
+        headers = _get_auth_headers()
+        params = {
+            "fields": resolve_fields("campaign_insights", fields),
+            "date_preset": date_preset,
+        }
+
+        async with graph_client() as client:
+            data = await _get_json(
+                client, url, params, headers, endpoint_timeout("insights"), "insights", (campaign_id,)
+            )
+        
+        if "error" in data:
+            return {"success": False, "error": data["error"].get("message")}
+        
+        return _format_campaign_insights(data, date_preset, params["fields"])
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def _format_campaign_insights(
+    data: dict,
+    date_preset: str,
+    fields: str = CAMPAIGN_INSIGHTS_FIELDS
+) -> dict:
+    """
+    Converte a resposta de /{campaign_id}/insights no formato retornado
+    por get_campaign_insights, com só as métricas pedidas preenchidas.
+    """
+    insights = data.get("data", [{}])[0] if data.get("data") else {}
+    
+    return {
+        "success": True,
+        "period": date_preset,
+        "insights": InsightRow.from_graph(insights, fields),
+    }
+
+
+async def get_campaign_insights_batch(
+    campaign_ids: list,
+    date_preset: str = "last_7d",
+    fields=None
+) -> dict:
+    """
+    Busca insights de várias campanhas usando requisições /batch da Graph API.
+    
+    Cada chamada HTTP carrega até 50 campanhas, então 300 campanhas custam
+    6 round trips em vez de 300.
+    
+    Args:
+        campaign_ids: IDs das campanhas
+        date_preset: today, yesterday, last_7d, last_14d, last_30d, this_month
+        fields: Perfil (minimal, dashboard, full) ou lista de métricas
+        
+    Returns:
+        Dict com "results" indexado pelo ID da campanha; cada valor tem o
+        mesmo formato do retorno de get_campaign_insights
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada", "results": {}}
+    
+    fields = resolve_fields("campaign_insights", fields)
+    params = {"fields": fields, "date_preset": date_preset}
+    query = urlencode(params)
+    
+    # Mesma chave de cache de get_campaign_insights: só vai ao /batch o
+    # que não estiver no cache
+    results = {}
+    pending = []
+    for campaign_id in campaign_ids:
+        key = cache_key(graph_url(f"{campaign_id}/insights"), params, _account_id())
+        cached = response_cache.get(key)
+        if cached is not None:
+            results[campaign_id] = _format_campaign_insights(cached, date_preset, fields)
+        else:
+            pending.append((campaign_id, key))
+    
+    operations = [
+        {"method": "GET", "relative_url": f"{campaign_id}/insights?{query}"}
+        for campaign_id, _ in pending
+    ]
+    
+    responses = await graph_batch(operations) if operations else []
+    
+    for (campaign_id, key), response in zip(pending, responses):
+        if response["success"]:
+            response_cache.set(key, response["data"], "insights", (campaign_id,))
+            results[campaign_id] = _format_campaign_insights(response["data"], date_preset, fields)
+        else:
+            results[campaign_id] = {"success": False, "error": response["error"]}
+    
+    # Manter a ordem dos IDs pedidos
+    results = {campaign_id: results[campaign_id] for campaign_id in campaign_ids}
+    
+    return {
+        "success": True,
+        "period": date_preset,
+        "results": results,
+        "batch_requests": math.ceil(len(operations) / GRAPH_BATCH_SIZE),
+    }
+
+
+async def graph_batch(operations: list, max_concurrency: Optional[int] = None) -> list:
+    """
+    Executa várias operações da Graph API em chamadas /batch (até 50 por chamada).
+    
+    Os lotes são enviados em paralelo pelo cliente compartilhado, no máximo
+    max_concurrency ao mesmo tempo. Falhas são mapeadas de volta para cada
+    operação: um lote que falha inteiro marca todas as suas operações como
+    erro, sem afetar os demais lotes.
+    
+    Args:
+        operations: Lista de dicts com "method" (GET, POST, DELETE),
+            "relative_url" (ex: "123/insights?date_preset=last_7d") e,
+            opcionalmente, "body" (dict com os parâmetros de escrita)
+        max_concurrency: Lotes simultâneos (padrão: meta_batch_max_concurrency)
+        
+    Returns:
+        Lista na mesma ordem de operations, com {"success": True, "data": ...}
+        ou {"success": False, "error": ..., "error_code": ...} por operação
+    """
+    if not operations:
+        return []
+    
+    if not settings.meta_access_token:
+        return [{"success": False, "error": "Meta API não configurada"} for _ in operations]
+    
+    batch_requests = []
+    for operation in operations:
+        request = {
+            "method": operation.get("method", "GET"),
+            "relative_url": operation["relative_url"],
+        }
+        if operation.get("body"):
+            request["body"] = urlencode(operation["body"])
+        batch_requests.append(request)
+    
+    chunks = [
+        batch_requests[i:i + GRAPH_BATCH_SIZE]
+        for i in range(0, len(batch_requests), GRAPH_BATCH_SIZE)
+    ]
+    
+    semaphore = asyncio.Semaphore(max_concurrency or settings.meta_batch_max_concurrency)
+    
+    async def post_chunk(client: httpx.AsyncClient, chunk: list) -> list:
+        async with semaphore:
+            return await _post_batch_chunk(client, chunk)
+    
+    async with graph_client() as client:
+        chunk_results = await asyncio.gather(
+            *(post_chunk(client, chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+    
+    results = []
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        if isinstance(chunk_result, Exception):
+            chunk_result = [{"success": False, "error": str(chunk_result)} for _ in chunk]
+        results.extend(chunk_result)
+    
+    return results
+
+
+async def _post_batch_chunk(client: httpx.AsyncClient, chunk: list) -> list:
+    """Envia um lote (até 50 operações) e decodifica cada sub-resposta."""
+    response = await send(
+        client,
+        "post",
+        graph_url(""),
+        data={"batch": json.dumps(chunk), "include_headers": "false"},
+        headers=_get_auth_headers(),
+        timeout=endpoint_timeout("insights"),
+    )
+    data = decode_json(response)
+    
+    # Erro no lote inteiro (token inválido, rate limit, etc.)
+    if isinstance(data, dict):
+        error = data.get("error", {})
+        failure = {
+            "success": False,
+            "error": error.get("message", "Resposta inválida do batch"),
+            "error_code": error.get("code"),
+        }
+        return [dict(failure) for _ in chunk]
+    
+    return [_decode_batch_item(item) for item in data]
+
+
+def _decode_batch_item(item: Optional[dict]) -> dict:
+    """Decodifica uma sub-resposta do /batch ({code, body})."""
+    # A Meta devolve null para sub-requisições que não terminaram a tempo
+    if item is None:
+        return {"success": False, "error": "Sub-requisição não concluída pela Meta (timeout no batch)"}
+    
+    try:
+        body = json.loads(item.get("body") or "{}")
+    except ValueError:
+        return {"success": False, "error": "Resposta inválida da Meta API", "error_code": item.get("code")}
+    
+    if item.get("code") != 200 or (isinstance(body, dict) and "error" in body):
+        error = body.get("error", {}) if isinstance(body, dict) else {}
+        return {
+            "success": False,
+            "error": error.get("message", f"HTTP {item.get('code')}"),
+            "error_code": error.get("code"),
+        }
+    
+    return {"success": True, "data": body}
+
+
+async def get_campaigns_for_objects(objects: dict, fields="full") -> dict:
+    """
+    Relê as campanhas de objetos alterados (campanhas, ad sets e anúncios)
+    em chamadas /batch, uma operação por objeto.
+
+    Ad sets e anúncios trazem a campanha pela expansão campaign{...}. As
+    leituras em cache dos objetos e as listagens de campanhas são
+    descartadas antes, já que eles mudaram fora desta API.
+
+    Args:
+        objects: ID do objeto -> nível ("campaign", "adset" ou "ad")
+        fields: Perfil (minimal, dashboard, full) ou lista de campos da campanha
+
+    Returns:
+        Dict com "campaigns" (Campaign, sem repetição) e "errors"
+        indexado pelo ID do objeto que não pôde ser lido
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+
+    _invalidate_after_write(*objects)
+
+    fields = resolve_fields("campaign", fields)
+    operations = [
+        {
+            "method": "GET",
+            "relative_url": (
+                f"{object_id}?{urlencode({'fields': fields})}" if level == "campaign"
+                else f"{object_id}?{urlencode({'fields': f'campaign{{{fields}}}'})}"
+            ),
+        }
+        for object_id, level in objects.items()
+    ]
+
+    campaigns = {}
+    errors = {}
+    for (object_id, level), response in zip(objects.items(), await graph_batch(operations)):
+        if not response["success"]:
+            errors[object_id] = response["error"]
+            continue
+        data = response["data"] if level == "campaign" else response["data"].get("campaign")
+        if not data:
+            errors[object_id] = "Objeto sem campanha na resposta da Meta"
+            continue
+        campaign = Campaign.from_graph(data)
+        campaigns[campaign.id] = campaign
+
+    return {
+        "success": not errors or bool(campaigns),
+        "campaigns": list(campaigns.values()),
+        "errors": errors,
+        "batch_requests": math.ceil(len(operations) / GRAPH_BATCH_SIZE),
+    }
+
+
 async def get_account_insights(
     date_preset: str = "last_7d",
-    level: str = "account"
+    level: str = "account",
+    fields=None,
+    account_id: Optional[str] = None
 ) -> dict:
     """
     Busca insights (métricas) da conta Meta Ads.
 
+    Retorna apenas a primeira linha; para uma linha por campanha, ad set ou
+    anúncio use get_account_insights_by_object.
+
     Args:
         date_preset: Período (today, yesterday, last_7d, last_14d, last_30d, etc.)
         level: Nível dos insights (account, campaign, adset, ad)
+        fields: Perfil (minimal, dashboard, full) ou lista de métricas
+        account_id: Conta de anúncios (padrão: ver _account_id)
 
     Returns:
-        Dict com métricas da conta
+        Dict com "insights" (InsightRow) da conta
     """
     if not settings.meta_access_token:
         return {"success": False, "error": "Meta API não configurada"}
 
     try:
-        # Garantir que o Account ID tenha o prefixo 'act_'
-        account_id = settings.meta_ad_account_id
-        if not account_id.startswith('act_'):
-            account_id = f'act_{account_id}'
-
-        url = f"https://graph.facebook.com/v24.0/{account_id}/insights"
+        account_id = _account_id(account_id)
+        url = graph_url(f"{account_id}/insights")
         headers = _get_auth_headers()
         params = {
             "date_preset": date_preset,
             "level": level,
-            "fields": "spend,impressions,clicks,ctr,cpm,cpc,reach,actions,action_values",
+            "fields": resolve_fields("account_insights", fields),
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=30)
-            data = response.json()
+        async with graph_client() as client:
+            data = await _get_json(
+                client, url, params, headers, endpoint_timeout("insights"), "insights", (account_id,), account_id
+            )
 
         if "error" in data:
             return {"success": False, "error": data["error"].get("message")}
@@ -509,42 +1513,471 @@ async def get_account_insights(
         # Extrair primeiro item (account level)
         insights = data.get("data", [{}])[0] if data.get("data") else {}
 
-        # Processar actions (conversões)
-        conversions = 0
-        revenue = 0.0
+        return {
+            "success": True,
+            "period": date_preset,
+            "date_start": insights.get("date_start"),
+            "date_stop": insights.get("date_stop"),
+            "insights": InsightRow.from_graph(insights, params["fields"], extractor=extractor_for(account_id)),
+        }
 
-        if "actions" in insights:
-            for action in insights["actions"]:
-                if action.get("action_type") in ["purchase", "omni_purchase", "add_to_cart"]:
-                    conversions += int(action.get("value", 0))
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-        if "action_values" in insights:
-            for value in insights["action_values"]:
-                if value.get("action_type") in ["purchase", "omni_purchase"]:
-                    revenue += float(value.get("value", 0))
 
-        # Calcular ROAS
-        spend = float(insights.get("spend", 0))
-        roas = (revenue / spend) if spend > 0 else 0
+async def get_account_insights_by_object(
+    level: str = "campaign",
+    date_preset: str = "last_7d",
+    status: Optional[str] = None,
+    fields=None,
+    account_id: Optional[str] = None
+) -> dict:
+    """
+    Busca insights da conta quebrados por objeto (uma linha por campanha,
+    ad set ou anúncio), percorrendo todas as páginas de /act_x/insights.
+    
+    Substitui loops de get_campaign_insights por campanha: a conta inteira
+    vem em poucas chamadas paginadas.
+    
+    Args:
+        level: campaign, adset ou ad
+        date_preset: Período (today, yesterday, last_7d, last_14d, last_30d, etc.)
+        status: Filtrar por effective_status do objeto (ACTIVE, PAUSED, ...)
+        fields: Perfil (minimal, dashboard, full) ou lista de métricas
+        account_id: Conta de anúncios (padrão: ver _account_id)
+        
+    Returns:
+        Dict com "insights" (InsightRow) indexado pelo ID do objeto.
+        Objetos sem entrega no período não aparecem (a Meta não retorna
+        linhas vazias).
+    """
+    if level not in INSIGHTS_OBJECT_LEVELS:
+        return {"success": False, "error": f"level deve ser um de: {', '.join(INSIGHTS_OBJECT_LEVELS)}"}
+    
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    try:
+        account_id = _account_id(account_id)
+        url = graph_url(f"{account_id}/insights")
+        headers = _get_auth_headers()
+        metric_fields = resolve_fields("account_insights", fields)
+        params = {
+            "date_preset": date_preset,
+            "level": level,
+            "fields": f"{level}_id,{level}_name,{metric_fields}",
+            "limit": 500,
+        }
+        
+        if status:
+            params["filtering"] = f'[{{"field":"{level}.effective_status","operator":"IN","value":["{status}"]}}]'
+        
+        rows = {}
+        pages_fetched = 0
+        extractor = extractor_for(account_id)
+        
+        async with graph_client() as client:
+            data = await _get_json(
+                client, url, params, headers, endpoint_timeout("insights"), "insights", (account_id,), account_id
+            )
+            
+            while True:
+                if "error" in data:
+                    return {"success": False, "error": data["error"].get("message")}
+                
+                pages_fetched += 1
+                count_progress("pages_fetched")
+                for record in InsightRow.from_rows(data.get("data", []), metric_fields, level, extractor):
+                    rows[record.object_id] = record
+                
+                next_url = data.get("paging", {}).get("next")
+                if not next_url:
+                    break
+                
+                data = await _get_json(
+                    client, next_url, None, headers, endpoint_timeout("insights"), "insights", (account_id,), account_id
+                )
+        
+        return {
+            "success": True,
+            "level": level,
+            "period": date_preset,
+            "total": len(rows),
+            "insights": rows,
+            "pages_fetched": pages_fetched,
+        }
+    
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 
+async def get_daily_insights(
+    date_preset: str = "last_30d",
+    campaign_ids: Optional[list] = None,
+    status: Optional[str] = None,
+    account_id: Optional[str] = None
+) -> dict:
+    """
+    Busca a série diária (time_increment=1) de várias campanhas de uma vez.
+    
+    Usa o relatório level=campaign da conta, paginado, e guarda o resultado
+    em uma DailySeries (matriz campanha × dia × métrica) que pode ser
+    fatiada sem novas chamadas.
+    
+    Args:
+        date_preset: Período (last_7d, last_14d, last_30d, last_90d, ...)
+        campaign_ids: Limitar a estas campanhas (e nesta ordem)
+        status: Filtrar por effective_status da campanha
+        account_id: Conta de anúncios (padrão: ver _account_id)
+        
+    Returns:
+        Dict com "series" (DailySeries), "period" e "pages_fetched"
+    """
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    try:
+        account_id = _account_id(account_id)
+        url = graph_url(f"{account_id}/insights")
+        headers = _get_auth_headers()
+        params = {
+            "date_preset": date_preset,
+            "level": "campaign",
+            "time_increment": 1,
+            "fields": "campaign_id,spend,impressions,clicks,reach,actions,action_values",
+            "limit": 500,
+        }
+        
+        filters = []
+        if campaign_ids:
+            filters.append({"field": "campaign.id", "operator": "IN", "value": list(campaign_ids)})
+        if status:
+            filters.append({"field": "campaign.effective_status", "operator": "IN", "value": [status]})
+        if filters:
+            params["filtering"] = json.dumps(filters)
+        
+        # Linhas convertidas direto para tuplas de floats (sem dicts por dia)
+        rows = []
+        pages_fetched = 0
+        extractor = extractor_for(account_id)
+        
+        async with graph_client() as client:
+            data = await _get_json(
+                client, url, params, headers, endpoint_timeout("insights"), "insights", (account_id,), account_id
+            )
+            
+            while True:
+                if "error" in data:
+                    return {"success": False, "error": data["error"].get("message")}
+                
+                pages_fetched += 1
+                count_progress("pages_fetched")
+                page = data.get("data", [])
+                for row, record in zip(page, InsightRow.from_rows(page, extractor=extractor)):
+                    rows.append((
+                        row["campaign_id"],
+                        row["date_start"],
+                        record.values(DAILY_METRICS),
+                    ))
+                
+                next_url = data.get("paging", {}).get("next")
+                if not next_url:
+                    break
+                
+                data = await _get_json(
+                    client, next_url, None, headers, endpoint_timeout("insights"), "insights", (account_id,), account_id
+                )
+        
         return {
             "success": True,
             "period": date_preset,
-            "date_start": insights.get("date_start"),
-            "date_stop": insights.get("date_stop"),
-            "insights": {
-                "spend": spend,
-                "impressions": int(insights.get("impressions", 0)),
-                "clicks": int(insights.get("clicks", 0)),
-                "ctr": float(insights.get("ctr", 0)),
-                "cpm": float(insights.get("cpm", 0)),
-                "cpc": float(insights.get("cpc", 0)),
-                "reach": int(insights.get("reach", 0)),
-                "conversions": conversions,
-                "revenue": revenue,
-                "roas": roas,
-            }
+            "series": DailySeries.from_rows(rows, campaign_ids),
+            "pages_fetched": pages_fetched,
+        }
+    
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+async def get_breakdown_insights(
+    breakdowns,
+    date_preset: str = "last_7d",
+    campaign_id: Optional[str] = None,
+    status: Optional[str] = None,
+    account_id: Optional[str] = None
+) -> dict:
+    """
+    Busca insights com breakdowns (idade, gênero, posicionamento, região...).
+    
+    Todas as páginas são lidas em stream e cada linha vai direto para um
+    BreakdownStore compacto, sem manter os dicts da resposta.
+    
+    Args:
+        breakdowns: "age,gender", ["region"] ou atalhos (placement, demographic)
+        date_preset: Período (today, yesterday, last_7d, last_30d, ...)
+        campaign_id: Uma campanha; None traz todas as campanhas da conta
+        status: Filtrar por effective_status da campanha
+        account_id: Conta de anúncios (padrão: ver _account_id)
+        
+    Returns:
+        Dict com "store" (BreakdownStore), "breakdowns", "period" e "rows"
+    """
+    try:
+        dimensions = resolve_breakdowns(breakdowns)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    try:
+        account_id = _account_id(account_id)
+        url = graph_url(f"{campaign_id or account_id}/insights")
+        
+        params = {
+            "date_preset": date_preset,
+            "level": "campaign",
+            "breakdowns": ",".join(dimensions),
+            "fields": "campaign_id,spend,impressions,clicks,actions,action_values",
+            "limit": 500,
+        }
+        
+        if status:
+            params["filtering"] = f'[{{"field":"campaign.effective_status","operator":"IN","value":["{status}"]}}]'
+        
+        store = BreakdownStore(dimensions)
+        extractor = extractor_for(account_id)
+        
+        async with aclosing(
+            _stream_records(url, params, _get_auth_headers(), endpoint_timeout("insights"), account=account_id)
+        ) as rows:
+            async for row in rows:
+                store.add(row.get("campaign_id", campaign_id), row, InsightRow.from_graph(row, extractor=extractor))
+        
+        return {
+            "success": True,
+            "period": date_preset,
+            "breakdowns": list(dimensions),
+            "rows": len(store),
+            "store": store,
         }
+    
+    except MetaAPIError as e:
+        return {"success": False, "error": e.message, "error_code": e.code}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+# Status finais de um relatório assíncrono (/act_x/insights via POST)
+ASYNC_REPORT_FAILED_STATUSES = ("Job Failed", "Job Skipped")
 
+
+async def create_insights_report(
+    level: str = "ad",
+    date_preset: str = "last_30d"
+) -> dict:
+    """
+    Cria um relatório assíncrono de insights (report run) na Meta.
+    
+    Para contas grandes, level=ad ou períodos longos, o /insights síncrono
+    estoura o timeout ou é limitado; o relatório assíncrono é processado
+    pela Meta em segundo plano.
+    
+    Args:
+        level: campaign, adset ou ad
+        date_preset: Período (last_7d, last_30d, this_month, etc.)
+        
+    Returns:
+        Dict com o report_run_id criado
+    """
+    if level not in INSIGHTS_OBJECT_LEVELS:
+        return {"success": False, "error": f"level deve ser um de: {', '.join(INSIGHTS_OBJECT_LEVELS)}"}
+    
+    if not settings.meta_access_token:
+        return {"success": False, "error": "Meta API não configurada"}
+    
+    try:
+        account_id = _account_id()
+        url = graph_url(f"{account_id}/insights")
+        headers = _get_auth_headers()
+        data = {
+            "level": level,
+            "date_preset": date_preset,
+            "fields": f"{level}_id,{level}_name,{ACCOUNT_INSIGHTS_FIELDS}",
+        }
+        
+        async with graph_client() as client:
+            response = await send(client, "post", url, data=data, headers=headers, timeout=endpoint_timeout())
+            result = decode_json(response)
+        
+        if "error" in result:
+            return {"success": False, "error": result["error"].get("message")}
+        
+        return {"success": True, "report_run_id": result.get("report_run_id")}
+    
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+async def wait_for_insights_report(
+    report_run_id: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+    timeout: Optional[float] = None
+) -> dict:
+    """
+    Aguarda a conclusão de um relatório assíncrono, consultando
+    async_percent_completion com intervalo crescente (1s, 2s, 4s... até
+    meta_async_report_max_poll_interval).
+    
+    Args:
+        report_run_id: ID retornado por create_insights_report
+        on_progress: Chamado com o percentual concluído a cada consulta
+        timeout: Tempo máximo de espera em segundos (padrão: meta_async_report_timeout)
+        
+    Returns:
+        Dict com success=True quando o relatório estiver pronto
+    """
+    timeout = timeout or settings.meta_async_report_timeout
+    url = graph_url(report_run_id)
+    headers = _get_auth_headers()
+    params = {"fields": "async_status,async_percent_completion"}
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 1.0
+    
+    try:
+        async with graph_client() as client:
+            while True:
+                response = await send(client, "get", url, params=params, headers=headers, timeout=endpoint_timeout())
+                data = decode_json(response)
+                
+                if "error" in data:
+                    return {"success": False, "error": data["error"].get("message")}
+                
+                status = data.get("async_status")
+                percent = int(data.get("async_percent_completion", 0))
+                
+                if on_progress:
+                    on_progress(percent)
+                
+                if status == "Job Completed":
+                    return {"success": True, "report_run_id": report_run_id, "status": status}
+                
+                if status in ASYNC_REPORT_FAILED_STATUSES:
+                    return {"success": False, "error": f"Relatório da Meta terminou com status '{status}'"}
+                
+                if loop.time() + delay > deadline:
+                    return {
+                        "success": False,
+                        "error": f"Relatório {report_run_id} não concluído em {timeout:.0f}s ({percent}%)",
+                    }
+                
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.meta_async_report_max_poll_interval)
+    
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+async def iter_insights_report_rows(
+    report_run_id: str,
+    page_size: int = 500,
+    stream: bool = False
+) -> AsyncIterator[dict]:
+    """
+    Percorre as linhas de um relatório assíncrono concluído, página a página.
+    
+    Args:
+        report_run_id: ID de um relatório com status "Job Completed"
+        page_size: Linhas por página pedidas à Meta
+        stream: Decodificar cada página de forma incremental
+        
+    Raises:
+        MetaAPIError: Erro retornado pela Graph API
+    """
+    url = graph_url(f"{report_run_id}/insights")
+    headers = _get_auth_headers()
+    params = {"limit": page_size}
+    
+    if stream:
+        async with aclosing(
+            _stream_records(url, params, headers, endpoint_timeout("insights"))
+        ) as rows:
+            async for row in rows:
+                yield row
+        return
+    
+    async with graph_client() as client:
+        response = await send(client, "get", url, params=params, headers=headers, timeout=endpoint_timeout("insights"))
+        
+        while True:
+            data = decode_json(response)
+            
+            if "error" in data:
+                raise MetaAPIError.from_error(data["error"])
+            
+            for row in data.get("data", []):
+                yield row
+            
+            next_url = data.get("paging", {}).get("next")
+            if not next_url:
+                return
+            
+            response = await send(client, "get", next_url, headers=headers, timeout=endpoint_timeout("insights"))
+
+
+async def run_insights_report(
+    level: str = "ad",
+    date_preset: str = "last_30d",
+    on_progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Executa um relatório assíncrono completo: cria, aguarda e lê as linhas.
+    
+    Args:
+        level: campaign, adset ou ad
+        date_preset: Período (last_7d, last_30d, this_month, etc.)
+        on_progress: Chamado com {"stage", "percent", "rows"} durante a execução
+        
+    Returns:
+        Dict no mesmo formato de get_account_insights_by_object
+    """
+    def report(stage: str, percent: int = 0, rows: int = 0):
+        if on_progress:
+            on_progress({"stage": stage, "percent": percent, "rows": rows})
+    
+    created = await create_insights_report(level, date_preset)
+    if not created["success"]:
+        return created
+    
+    report_run_id = created["report_run_id"]
+    report("running")
+    
+    finished = await wait_for_insights_report(
+        report_run_id,
+        on_progress=lambda percent: report("running", percent),
+    )
+    if not finished["success"]:
+        return finished
+    
+    rows = {}
+    extractor = extractor_for()
+    try:
+        async for row in iter_insights_report_rows(report_run_id):
+            rows[row[f"{level}_id"]] = InsightRow.from_graph(row, level=level, extractor=extractor)
+            if len(rows) % 500 == 0:
+                report("downloading", 100, len(rows))
+    except Exception as e:
+        return {"success": False, "error": str(e), "report_run_id": report_run_id}
+    
+    report("completed", 100, len(rows))
+    
+    return {
+        "success": True,
+        "level": level,
+        "period": date_preset,
+        "report_run_id": report_run_id,
+        "total": len(rows),
+        "insights": rows,
+    }
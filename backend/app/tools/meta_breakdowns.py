@@ -0,0 +1,168 @@
+"""
+Insights com breakdowns (idade, gênero, posicionamento, região)
+
+As linhas com breakdowns são muitas (campanha × dia × idade × gênero × ...),
+então ficam em um BreakdownStore colunar: cada valor de dimensão
+("25-34", "instagram", "São Paulo") é guardado uma única vez e as linhas
+só carregam códigos inteiros e as métricas em arrays. Uma linha ocupa
+~50 bytes em vez de um dict de ~1 KB.
+"""
+from array import array
+from typing import Iterable, Optional
+from app.tools.meta_records import InsightRow
+
+
+# Breakdowns aceitos pela Graph API que usamos
+SUPPORTED_BREAKDOWNS = (
+    "age",
+    "gender",
+    "country",
+    "region",
+    "publisher_platform",
+    "platform_position",
+    "device_platform",
+)
+
+# Atalhos aceitos pela API e pelos agentes
+BREAKDOWN_ALIASES = {
+    "placement": ("publisher_platform", "platform_position"),
+    "demographic": ("age", "gender"),
+}
+
+BREAKDOWN_METRICS = ("spend", "impressions", "clicks", "conversions", "revenue")
+
+
+def resolve_breakdowns(breakdowns) -> tuple:
+    """
+    Converte "placement,age" (ou lista) nos breakdowns da Graph API.
+
+    Raises:
+        ValueError: Breakdown desconhecido
+    """
+    if isinstance(breakdowns, str):
+        breakdowns = breakdowns.split(",")
+
+    resolved = []
+    for name in (b.strip() for b in breakdowns if b.strip()):
+        for dimension in BREAKDOWN_ALIASES.get(name, (name,)):
+            if dimension not in SUPPORTED_BREAKDOWNS:
+                valid = ", ".join(SUPPORTED_BREAKDOWNS + tuple(BREAKDOWN_ALIASES))
+                raise ValueError(f"breakdown '{dimension}' inválido. Use: {valid}")
+            if dimension not in resolved:
+                resolved.append(dimension)
+
+    if not resolved:
+        raise ValueError("Informe ao menos um breakdown")
+
+    return tuple(resolved)
+
+
+class BreakdownStore:
+    """
+    Linhas de insights com breakdowns em colunas compactas.
+
+    Dimensões (incluindo a campanha) viram códigos em array('I'); métricas
+    ficam em array('d'). query() agrega por qualquer subconjunto das
+    dimensões.
+    """
+
+    def __init__(self, dimensions: Iterable[str]):
+        self.dimensions = tuple(dimensions)
+        self._columns = ("campaign_id",) + self.dimensions
+        # Por coluna: lista de valores (código -> valor) e índice reverso
+        self._values = {col: [] for col in self._columns}
+        self._codes = {col: {} for col in self._columns}
+        self._dim_data = {col: array("I") for col in self._columns}
+        self._metric_data = {m: array("d") for m in BREAKDOWN_METRICS}
+
+    def __len__(self) -> int:
+        return len(self._dim_data["campaign_id"])
+
+    def _intern(self, column: str, value) -> int:
+        value = "" if value is None else str(value)
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._values[column])
+            self._values[column].append(value)
+        return code
+
+    def add(self, campaign_id: str, dimensions: dict, metrics: InsightRow) -> None:
+        """
+        Adiciona uma linha.
+
+        Args:
+            campaign_id: ID da campanha da linha
+            dimensions: Valores das dimensões (ex: {"age": "25-34"})
+            metrics: Linha já convertida; métricas ausentes valem 0
+        """
+        self._dim_data["campaign_id"].append(self._intern("campaign_id", campaign_id))
+        for dimension in self.dimensions:
+            self._dim_data[dimension].append(self._intern(dimension, dimensions.get(dimension)))
+        for metric, value in zip(BREAKDOWN_METRICS, metrics.values(BREAKDOWN_METRICS)):
+            self._metric_data[metric].append(value)
+
+    def values(self, dimension: str) -> list:
+        """Valores distintos de uma dimensão."""
+        return list(self._values[dimension])
+
+    def query(
+        self,
+        group_by: Optional[Iterable[str]] = None,
+        campaign_id: Optional[str] = None,
+        top: Optional[int] = None
+    ) -> list:
+        """
+        Agrega as linhas por dimensões, ordenando por gasto.
+
+        Args:
+            group_by: Dimensões do agrupamento (padrão: todas)
+            campaign_id: Filtrar uma campanha
+            top: Máximo de grupos retornados
+
+        Returns:
+            Lista de dicts com as dimensões, métricas, CTR, CPC e ROAS
+        """
+        group_by = tuple(group_by) if group_by else self.dimensions
+        for dimension in group_by:
+            if dimension not in self._dim_data:
+                raise ValueError(f"Dimensão '{dimension}' não está no relatório")
+
+        campaign_code = None
+        if campaign_id is not None:
+            campaign_code = self._codes["campaign_id"].get(str(campaign_id))
+            if campaign_code is None:
+                return []
+
+        campaigns = self._dim_data["campaign_id"]
+        group_columns = [self._dim_data[d] for d in group_by]
+        metric_columns = [self._metric_data[m] for m in BREAKDOWN_METRICS]
+        groups = {}
+
+        for row in range(len(self)):
+            if campaign_code is not None and campaigns[row] != campaign_code:
+                continue
+
+            key = tuple(column[row] for column in group_columns)
+            sums = groups.get(key)
+            if sums is None:
+                sums = groups[key] = [0.0] * len(BREAKDOWN_METRICS)
+            for i, column in enumerate(metric_columns):
+                sums[i] += column[row]
+
+        result = []
+        for key, sums in groups.items():
+            item = {d: self._values[d][code] for d, code in zip(group_by, key)}
+            item.update(zip(BREAKDOWN_METRICS, sums))
+            item["ctr"] = item["clicks"] / item["impressions"] * 100 if item["impressions"] else 0.0
+            item["cpc"] = item["spend"] / item["clicks"] if item["clicks"] else 0.0
+            item["roas"] = item["revenue"] / item["spend"] if item["spend"] else 0.0
+            result.append(item)
+
+        result.sort(key=lambda item: item["spend"], reverse=True)
+        return result[:top] if top else result
+
+    def nbytes(self) -> int:
+        """Bytes ocupados pelas colunas (sem as tabelas de valores)."""
+        columns = list(self._dim_data.values()) + list(self._metric_data.values())
+        return sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,208 @@
+"""
+Cache de respostas da Meta Graph API
+
+Guarda o JSON decodificado das leituras (GET) bem-sucedidas por um tempo
+curto, para que dashboard, agentes e sincronização não repitam a mesma
+chamada segundos depois. LRU limitado por tamanho, TTL por recurso e
+invalidação explícita quando nós mesmos alteramos algo na Meta.
+
+Leituras idênticas que chegam ao mesmo tempo (antes de haver algo no
+cache) são agrupadas pelo SingleFlight: uma única chamada vai à Meta e
+todos recebem o mesmo resultado.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional
+import asyncio
+import json
+import time
+from app.config import settings
+
+
+# TTL de cada recurso (nome do campo em settings)
+CACHE_TTL_SETTINGS = {
+    "campaign": "meta_cache_ttl_campaign",
+    "insights": "meta_cache_ttl_insights",
+}
+
+
+def cache_key(url: str, params: Optional[dict] = None, account: str = "") -> str:
+    """
+    Monta a chave de cache de uma leitura.
+
+    Args:
+        url: URL completa do endpoint (ou paging.next)
+        params: Query string da chamada
+        account: Conta de anúncios usada (isola contas diferentes)
+    """
+    return json.dumps([account, url, sorted((params or {}).items())], default=str)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    resource: str
+    tags: frozenset
+    expires_at: float
+
+
+class MetaResponseCache:
+    """
+    Cache LRU com TTL, compartilhado pelo processo.
+
+    - get(key): valor ainda válido ou None
+    - set(key, value, resource, tags): guarda com o TTL do recurso
+    - invalidate(resources, tags): descarta entradas após uma escrita
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera os contadores."""
+        self._entries.clear()
+        self.reset_stats()
+
+    def ttl(self, resource: str) -> float:
+        """TTL em segundos configurado para o recurso (0 = não guardar)."""
+        attr = CACHE_TTL_SETTINGS.get(resource)
+        return float(getattr(settings, attr, 0)) if attr else 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        if not settings.meta_cache_enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, resource: str, tags: Iterable[str] = ()) -> None:
+        ttl = self.ttl(resource)
+        if not settings.meta_cache_enabled or ttl <= 0:
+            return
+
+        self._entries[key] = CacheEntry(
+            value=value,
+            resource=resource,
+            tags=frozenset(t for t in tags if t),
+            expires_at=time.monotonic() + ttl,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > settings.meta_cache_max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, resources: Iterable[str] = (), tags: Iterable[str] = ()) -> int:
+        """
+        Remove as entradas de qualquer um dos recursos ou marcadas com
+        qualquer uma das tags.
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        resources = set(resources)
+        tags = set(t for t in tags if t)
+
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.resource in resources or entry.tags & tags
+        ]
+        for key in stale:
+            del self._entries[key]
+
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def stats(self) -> dict:
+        """Contadores do cache (para /health e ajuste dos TTLs)."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.meta_cache_enabled,
+            "size": len(self._entries),
+            "max_entries": settings.meta_cache_max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas em andamento.
+
+    A primeira chamada para uma chave executa a requisição; as que chegam
+    enquanto ela não termina esperam pelo mesmo resultado (ou erro).
+    """
+
+    def __init__(self):
+        self._inflight: dict = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.leaders = 0
+        self.coalesced = 0
+
+    def clear(self) -> None:
+        """Esquece as chamadas em andamento e zera os contadores."""
+        self._inflight.clear()
+        self.reset_stats()
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `call` uma única vez por chave entre chamadas concorrentes.
+
+        Args:
+            key: Chave da requisição (a mesma usada no cache)
+            call: Função sem argumentos que retorna a corrotina da requisição
+        """
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        # shield: cancelar um dos interessados não cancela a chamada dos outros
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Contadores de agrupamento (coalesced = chamadas economizadas)."""
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+# Cache único do processo, usado pelas leituras de meta_api
+response_cache = MetaResponseCache()
+
+# Chamadas em andamento, compartilhadas pelas leituras de meta_api
+single_flight = SingleFlight()
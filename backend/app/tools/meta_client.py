@@ -0,0 +1,302 @@
+"""
+Cliente HTTP compartilhado para a Meta Graph API
+
+Mantém um único httpx.AsyncClient por processo (pool de conexões, keep-alive
+e HTTP/2), criado e fechado pelo lifespan do FastAPI em app.main.
+
+Cada requisição pertence a uma conta de anúncios: limitador de taxa,
+circuit breaker e limite de requisições simultâneas são por conta (ver
+send e account_scope).
+"""
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from importlib.util import find_spec
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
+import httpx
+from app.config import settings
+from app.jobs import count_progress
+from app.tools.meta_rate_limit import rate_limiters
+from app.tools.meta_resilience import (
+    breakers,
+    retry_budget,
+    retry_delay,
+    is_transient_response,
+)
+
+
+# Cliente único do processo (None até init_meta_client ser chamado)
+_client: Optional[httpx.AsyncClient] = None
+
+# Conta de anúncios da tarefa atual (ver account_scope)
+_current_account: ContextVar[Optional[str]] = ContextVar("meta_account", default=None)
+
+
+def normalize_account_id(account_id: str) -> str:
+    """Garante o prefixo act_ no ID da conta de anúncios."""
+    account_id = str(account_id).strip()
+    return account_id if account_id.startswith("act_") else f"act_{account_id}"
+
+
+@contextmanager
+def account_scope(account_id: str) -> Iterator[str]:
+    """
+    Define a conta de anúncios das chamadas feitas dentro do bloco.
+
+    Funções de meta_api sem account_id explícito usam essa conta no lugar
+    de settings.meta_ad_account_id, e send() a usa para escolher limitador,
+    breaker e limite de concorrência. Cada tarefa asyncio tem a sua cópia,
+    então tarefas em paralelo podem usar contas diferentes.
+    """
+    account_id = normalize_account_id(account_id)
+    token = _current_account.set(account_id)
+    try:
+        yield account_id
+    finally:
+        _current_account.reset(token)
+
+
+def scoped_account() -> Optional[str]:
+    """Conta definida por account_scope na tarefa atual, se houver."""
+    return _current_account.get()
+
+
+class AccountConcurrency:
+    """
+    Limita as requisições simultâneas de cada conta de anúncios
+    (meta_account_max_concurrency), para que uma conta com muito trabalho
+    não ocupe o pool de conexões inteiro.
+    """
+
+    def __init__(self):
+        self._semaphores: dict = {}
+        self._in_flight: dict = {}
+
+    def reset(self) -> None:
+        self._semaphores.clear()
+        self._in_flight.clear()
+
+    @asynccontextmanager
+    async def slot(self, account: str) -> AsyncIterator[None]:
+        semaphore = self._semaphores.get(account)
+        if semaphore is None:
+            semaphore = self._semaphores[account] = asyncio.Semaphore(settings.meta_account_max_concurrency)
+
+        async with semaphore:
+            self._in_flight[account] = self._in_flight.get(account, 0) + 1
+            try:
+                yield
+            finally:
+                self._in_flight[account] -= 1
+
+    def stats(self) -> dict:
+        """Requisições em andamento por conta (para /health)."""
+        return dict(self._in_flight)
+
+
+# Instância única do processo, usada por send
+account_concurrency = AccountConcurrency()
+
+
+def graph_url(path: str) -> str:
+    """
+    Monta a URL completa de um endpoint da Graph API.
+
+    Args:
+        path: Caminho relativo (ex: "act_123/campaigns", "123/insights")
+    """
+    return f"{settings.meta_graph_api_url.rstrip('/')}/{path.lstrip('/')}"
+
+
+def endpoint_timeout(endpoint: str = "default") -> httpx.Timeout:
+    """
+    Retorna o timeout adequado para o tipo de endpoint.
+
+    Insights e cópias (/copies) são bem mais lentos que leituras simples,
+    então recebem um timeout de leitura maior.
+
+    Args:
+        endpoint: default, insights ou copies
+    """
+    timeouts = {
+        "default": settings.meta_timeout_default,
+        "insights": settings.meta_timeout_insights,
+        "copies": settings.meta_timeout_copies,
+    }
+    read_timeout = timeouts.get(endpoint, settings.meta_timeout_default)
+    return httpx.Timeout(read_timeout, connect=settings.meta_http_connect_timeout)
+
+
+def _client_options() -> dict:
+    """Opções do httpx.AsyncClient (pool, keep-alive, HTTP/2)."""
+    # HTTP/2 depende do pacote h2 (httpx[http2]); sem ele, usa HTTP/1.1
+    http2 = settings.meta_http2 and find_spec("h2") is not None
+
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=settings.meta_http_max_connections,
+            max_keepalive_connections=settings.meta_http_max_keepalive_connections,
+            keepalive_expiry=settings.meta_http_keepalive_expiry,
+        ),
+        "timeout": endpoint_timeout(),
+    }
+
+
+async def init_meta_client() -> httpx.AsyncClient:
+    """
+    Cria o cliente compartilhado. Chamado no startup da aplicação.
+
+    Returns:
+        O cliente criado (ou o já existente, se chamado mais de uma vez)
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(**_client_options())
+
+    return _client
+
+
+async def close_meta_client() -> None:
+    """Fecha o cliente compartilhado. Chamado no shutdown da aplicação."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def graph_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Fornece um cliente HTTP para chamadas à Graph API.
+
+    Dentro da aplicação, devolve o cliente compartilhado do processo.
+    Fora dela (scripts, testes) cria um cliente temporário com as mesmas
+    opções, fechado ao final do bloco.
+    """
+    if _client is not None and not _client.is_closed:
+        yield _client
+        return
+
+    async with httpx.AsyncClient(**_client_options()) as client:
+        yield client
+
+
+async def send(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    account: Optional[str] = None,
+    stream: bool = False,
+    **kwargs
+) -> httpx.Response:
+    """
+    Envia uma requisição à Graph API passando pelo limitador de taxa, pelo
+    circuit breaker da conta e pela política de retentativas.
+
+    - Throttling com tempo de recuperação informado: espera esse tempo e
+      repete (até meta_rate_limit_max_retries vezes), para qualquer método
+    - Falhas transitórias (5xx, timeouts, erros de rede): só GETs são
+      repetidos, com backoff exponencial e jitter, até
+      meta_retry_max_attempts tentativas e enquanto houver orçamento
+    - Com o breaker da conta aberto, falha na hora com MetaCircuitOpenError
+    - No máximo meta_account_max_concurrency requisições da mesma conta ao
+      mesmo tempo
+
+    Args:
+        client: Cliente obtido de graph_client()
+        method: "get" ou "post"
+        url: URL completa (graph_url ou paging.next)
+        account: Conta de anúncios (padrão: a de account_scope ou
+            settings.meta_ad_account_id)
+        stream: Devolve a resposta sem ler o corpo (para meta_json.StreamedPage);
+            quem chamou deve fechá-la com response.aclose()
+        **kwargs: Repassados para client.get/client.post
+    """
+    # Mesma chave (act_...) que as leituras de meta_api, com ou sem o prefixo
+    # em META_AD_ACCOUNT_ID: um só limitador e um só breaker por conta
+    account = account or scoped_account() or settings.meta_ad_account_id
+    account = normalize_account_id(account) if account else "default"
+    breaker = breakers.for_account(account)
+    rate_limiter = rate_limiters.for_account(account)
+    retryable = method == "get"
+    throttle_retries = 0
+    attempt = 1
+
+    retry_budget.deposit()
+
+    while True:
+        breaker.before_call()
+
+        try:
+            await rate_limiter.acquire()
+            async with account_concurrency.slot(account):
+                count_progress("api_calls")
+                response = await _request(client, method, url, stream, kwargs)
+        except httpx.TransportError:
+            breaker.record_failure()
+            if not _should_retry(retryable, attempt):
+                raise
+            await _backoff(attempt, "erro de rede/timeout")
+            attempt += 1
+            continue
+        except BaseException:
+            # Cancelamento ou erro inesperado: libera a chamada de teste do breaker
+            breaker.record_abort()
+            raise
+
+        if is_transient_response(response):
+            breaker.record_failure()
+            if _should_retry(retryable, attempt):
+                if stream:
+                    await response.aclose()
+                await _backoff(attempt, f"HTTP {response.status_code}")
+                attempt += 1
+                continue
+            return response
+
+        breaker.record_success()
+
+        retry_after = rate_limiter.observe(response)
+        if retry_after is None or throttle_retries == settings.meta_rate_limit_max_retries:
+            return response
+
+        throttle_retries += 1
+        if stream:
+            await response.aclose()
+        print(f"⏳ Rate limit da Meta API: aguardando {retry_after:.0f}s antes de tentar novamente")
+
+
+async def _request(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    stream: bool,
+    kwargs: dict
+) -> httpx.Response:
+    """Faz uma tentativa; em modo stream, só lê o corpo de respostas de erro."""
+    if not stream:
+        return await getattr(client, method)(url, **kwargs)
+
+    request = client.build_request(method.upper(), url, **kwargs)
+    response = await client.send(request, stream=True)
+
+    # Erros são pequenos e precisam do corpo para as checagens de
+    # throttling/falha transitória
+    if response.status_code >= 400:
+        await response.aread()
+
+    return response
+
+
+def _should_retry(retryable: bool, attempt: int) -> bool:
+    """Decide se uma falha transitória pode ser repetida."""
+    return retryable and attempt < settings.meta_retry_max_attempts and retry_budget.withdraw()
+
+
+async def _backoff(attempt: int, reason: str) -> None:
+    delay = retry_delay(attempt)
+    print(f"🔁 Falha temporária na Meta API ({reason}): nova tentativa em {delay:.1f}s")
+    await asyncio.sleep(delay)
@@ -0,0 +1,140 @@
+"""
+Hierarquia de uma campanha (campanha → ad sets → anúncios)
+
+A Graph API devolve ad sets e anúncios como edges aninhados nos campos da
+campanha (adsets{...},ads{...}), mas só a primeira página de cada edge.
+meta_api.load_campaign_hierarchy segue os cursores desses edges e monta
+uma CampaignTree: os registros (ver meta_records) indexados por ID e por
+pai, para agentes e API navegarem pela campanha sem nova chamada à Meta.
+"""
+from typing import Iterable, Optional
+from app.tools.meta_records import Campaign, AdSet, Ad
+
+
+def split_nested_fields(fields: str) -> tuple:
+    """
+    Separa os campos simples dos edges aninhados.
+
+    "id,name,adsets{id,name},ads.limit(10){id}" vira
+    ("id,name", {"adsets": "id,name", "ads": "id"}).
+
+    Returns:
+        (campos simples, dict edge -> campos do edge)
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(fields):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(fields[start:i])
+            start = i + 1
+    parts.append(fields[start:])
+
+    plain = []
+    nested = {}
+    for part in (p.strip() for p in parts):
+        if not part:
+            continue
+        if "{" in part and part.endswith("}"):
+            name, subfields = part.split("{", 1)
+            # Modificadores como .limit(10) são descartados (o carregador define o tamanho)
+            nested[name.split(".")[0]] = subfields[:-1]
+        else:
+            plain.append(part)
+
+    return ",".join(plain), nested
+
+
+def join_nested_fields(plain: str, nested: dict, page_size: Optional[int] = None) -> str:
+    """Inverso de split_nested_fields, com .limit(page_size) em cada edge."""
+    limit = f".limit({page_size})" if page_size else ""
+    edges = [f"{edge}{limit}{{{subfields}}}" for edge, subfields in nested.items()]
+    return ",".join(([plain] if plain else []) + edges)
+
+
+class CampaignTree:
+    """
+    Campanha, ad sets e anúncios indexados por ID e por pai.
+
+    Ad sets são filhos da campanha; anúncios são filhos do ad set
+    (adset_id) ou, sem ele, da campanha. Um objeto repetido (páginas que
+    se sobrepõem) substitui o anterior sem duplicar.
+    """
+
+    def __init__(self, campaign: Campaign, edges: Iterable[str] = ()):
+        self.campaign = campaign
+        self.id = campaign.id
+        self.edges = tuple(edges)
+        self._nodes = {self.id: campaign}
+        self._parents = {}
+        self._children = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._nodes
+
+    def add(self, record, parent_id: Optional[str] = None) -> None:
+        """
+        Adiciona um AdSet ou Ad.
+
+        Args:
+            parent_id: Pai do objeto (padrão: adset_id do anúncio ou a campanha)
+        """
+        if record.id in self._nodes:
+            self._nodes[record.id] = record
+            return
+
+        if parent_id is None and isinstance(record, Ad):
+            parent_id = record.adset_id
+        parent_id = parent_id or self.id
+
+        self._nodes[record.id] = record
+        self._parents[record.id] = parent_id
+        self._children.setdefault(parent_id, []).append(record.id)
+
+    def get(self, node_id: str):
+        """Registro pelo ID (campanha, ad set ou anúncio)."""
+        return self._nodes.get(node_id)
+
+    def parent(self, node_id: str):
+        """Pai de um ad set ou anúncio."""
+        parent_id = self._parents.get(node_id)
+        return self._nodes.get(parent_id) if parent_id else None
+
+    def children(self, node_id: str, kind: Optional[type] = None) -> list:
+        """Filhos diretos de um objeto, opcionalmente de um tipo (AdSet, Ad)."""
+        return [
+            self._nodes[child]
+            for child in self._children.get(node_id, ())
+            if kind is None or isinstance(self._nodes[child], kind)
+        ]
+
+    def adsets(self) -> list:
+        """Ad sets da campanha, na ordem da Meta."""
+        return self.children(self.id, AdSet)
+
+    def ads(self, adset_id: Optional[str] = None) -> list:
+        """Anúncios de um ad set ou, sem adset_id, todos os da campanha."""
+        if adset_id is not None:
+            return self.children(adset_id, Ad)
+        return [node for node in self._nodes.values() if isinstance(node, Ad)]
+
+    def to_dict(self) -> dict:
+        """
+        Campanha no formato da Graph API, com os edges completos.
+
+        Cada edge carregado vira {"data": [...]} com todos os registros
+        (sem "paging", já que não há próxima página).
+        """
+        result = self.campaign.to_dict()
+        if "adsets" in self.edges:
+            result["adsets"] = {"data": self.adsets()}
+        if "ads" in self.edges:
+            result["ads"] = {"data": self.ads()}
+        return result
@@ -0,0 +1,113 @@
+"""
+Decodificação de JSON das respostas da Meta Graph API
+
+- decode_json(): resposta inteira, com orjson quando instalado (bem mais
+  rápido que o json da biblioteca padrão em páginas grandes)
+- StreamedPage: leitura incremental de uma página paginada com ijson,
+  entregando cada item de "data" à medida que os bytes chegam, sem montar
+  a página inteira em memória
+
+Os dois pacotes são opcionais: sem eles, caímos no json padrão.
+"""
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Optional
+import json
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# ijson só é importado se estiver instalado (ver StreamedPage)
+HAS_IJSON = find_spec("ijson") is not None
+
+
+def loads(data) -> Any:
+    """json.loads usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_json(response: httpx.Response) -> Any:
+    """
+    Decodifica o corpo de uma resposta (substitui response.json()).
+
+    Args:
+        response: Resposta já lida (não streaming)
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class StreamedPage:
+    """
+    Uma página da Graph API lida de forma incremental.
+
+    Uso:
+        page = StreamedPage(response)
+        async for record in page.records():
+            ...
+        page.next_url  # paging.next (disponível ao fim da iteração)
+        page.error     # objeto "error", se a Meta devolveu um
+
+    Args:
+        response: Resposta aberta com stream=True (ver meta_client.send)
+        item_path: Caminho dos itens no formato do ijson
+    """
+
+    def __init__(self, response: httpx.Response, item_path: str = "data.item"):
+        self.response = response
+        self.item_path = item_path
+        self.next_url: Optional[str] = None
+        self.error: Optional[dict] = None
+        self.records_read = 0
+
+    async def records(self) -> AsyncIterator[dict]:
+        # Respostas de erro são pequenas (e meta_client.send já as lê)
+        if not HAS_IJSON or self.response.status_code >= 400:
+            async for record in self._records_buffered():
+                yield record
+            return
+
+        import ijson
+
+        # Dois parsers em C sobre os mesmos bytes: itens de "data" e
+        # paging.next. Bem mais rápido que montar os itens evento a evento
+        # em Python.
+        records = ijson.sendable_list()
+        next_urls = ijson.sendable_list()
+        items = ijson.items_coro(records, self.item_path, use_float=True)
+        paging = ijson.items_coro(next_urls, "paging.next")
+
+        async for chunk in self.response.aiter_bytes():
+            items.send(chunk)
+            paging.send(chunk)
+
+            for record in records:
+                self.records_read += 1
+                yield record
+            del records[:]
+
+        items.close()
+        paging.close()
+
+        for record in records:
+            self.records_read += 1
+            yield record
+
+        self.next_url = next_urls[0] if next_urls else None
+
+    async def _records_buffered(self) -> AsyncIterator[dict]:
+        """Sem ijson: lê a página inteira e entrega os itens da mesma forma."""
+        await self.response.aread()
+        data = decode_json(self.response)
+
+        self.error = data.get("error")
+        self.next_url = data.get("paging", {}).get("next")
+
+        for record in data.get("data", []):
+            self.records_read += 1
+            yield record
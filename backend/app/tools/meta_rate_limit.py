@@ -0,0 +1,215 @@
+"""
+Limitador de taxa adaptativo para a Meta Graph API
+
+Lê os headers de uso que a Meta devolve em toda resposta
+(X-App-Usage, X-Ad-Account-Usage, X-Business-Use-Case-Usage) e espaça as
+chamadas conforme o uso se aproxima de 100%. Abaixo do limiar configurado
+não há nenhuma espera.
+
+A Meta limita por conta de anúncios, então há um limitador por conta: uma
+conta perto do limite é freada sem atrasar as outras.
+"""
+from typing import Optional
+import asyncio
+import json
+import time
+import httpx
+from app.config import settings
+
+
+USAGE_HEADERS = ("X-App-Usage", "X-Ad-Account-Usage", "X-Business-Use-Case-Usage")
+
+# Códigos de erro de throttling da Graph API
+# 4/17/32/613: limites de app/usuário/página; 80000-80014: Business Use Case
+THROTTLE_ERROR_CODES = {4, 17, 32, 613} | set(range(80000, 80015))
+
+
+class MetaRateLimitError(Exception):
+    """A conta está bloqueada pela Meta por mais que meta_rate_limit_max_wait."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(
+            f"Limite de requisições da Meta API atingido; "
+            f"novas chamadas liberadas em {retry_in:.0f}s"
+        )
+        self.retry_in = retry_in
+
+
+class MetaRateLimiter:
+    """
+    Limitador de uma conta de anúncios.
+
+    - acquire(): chamado antes de cada requisição; espera o necessário, ou
+      falha na hora se a conta estiver bloqueada por mais que
+      meta_rate_limit_max_wait
+    - observe(response): chamado após cada resposta; atualiza o uso e diz
+      quanto esperar antes de repetir uma chamada bloqueada por throttling
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Volta ao estado inicial (uso zero, sem bloqueio)."""
+        self.usage_pct = 0.0
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        self.throttled_responses = 0
+        self.rejected = 0
+
+    def pacing_delay(self) -> float:
+        """
+        Intervalo mínimo entre chamadas para o uso atual.
+
+        Zero até o limiar (meta_rate_limit_slowdown_pct) e crescendo de forma
+        quadrática até meta_rate_limit_max_delay quando o uso chega a 100%.
+        """
+        start = settings.meta_rate_limit_slowdown_pct
+        if self.usage_pct <= start:
+            return 0.0
+
+        pressure = min(1.0, (self.usage_pct - start) / (100.0 - start))
+        return settings.meta_rate_limit_max_delay * pressure ** 2
+
+    async def acquire(self) -> None:
+        """
+        Reserva o próximo horário livre e espera até ele, se preciso.
+
+        Raises:
+            MetaRateLimitError: Bloqueio informado pela Meta mais longo que
+                meta_rate_limit_max_wait (a chamada não espera por ele)
+        """
+        now = time.monotonic()
+        blocked_for = self._blocked_until - now
+        if blocked_for > settings.meta_rate_limit_max_wait:
+            self.rejected += 1
+            raise MetaRateLimitError(blocked_for)
+
+        slot = max(now, self._blocked_until, self._next_slot)
+        self._next_slot = slot + self.pacing_delay()
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def observe(self, response: httpx.Response) -> Optional[float]:
+        """
+        Atualiza o uso a partir dos headers da resposta.
+
+        Returns:
+            Segundos a esperar antes de repetir a chamada, se a resposta for
+            um erro de throttling com tempo de recuperação conhecido e dentro
+            de meta_rate_limit_max_wait; None caso contrário
+        """
+        usage, regain_seconds = _parse_usage_headers(response.headers)
+        if usage is not None:
+            self.usage_pct = usage
+
+        if regain_seconds:
+            self._block_for(regain_seconds)
+
+        if not _is_throttle_error(response):
+            return None
+
+        self.throttled_responses += 1
+
+        if not regain_seconds or regain_seconds > settings.meta_rate_limit_max_wait:
+            return None
+
+        return regain_seconds
+
+    def _block_for(self, seconds: float) -> None:
+        """Bloqueia novas chamadas pelos próximos `seconds` segundos."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        """Estado atual do limitador (para /health e logs)."""
+        return {
+            "usage_pct": round(self.usage_pct, 2),
+            "pacing_delay": round(self.pacing_delay(), 3),
+            "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            "throttled_responses": self.throttled_responses,
+            "rejected_calls": self.rejected,
+        }
+
+
+def _parse_usage_headers(headers) -> tuple:
+    """
+    Extrai dos headers de uso o maior percentual e o tempo para recuperar
+    acesso (em segundos), quando a Meta informar.
+
+    Returns:
+        (uso em %, ou None se não houver headers; segundos até liberar, ou 0)
+    """
+    usage = None
+    regain_seconds = 0.0
+
+    for name in USAGE_HEADERS:
+        raw = headers.get(name) if headers is not None else None
+        if not isinstance(raw, str) or not raw:
+            continue
+
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            continue
+
+        # X-Business-Use-Case-Usage: {"<business_id>": [{...}, ...]}
+        if name == "X-Business-Use-Case-Usage":
+            entries = [e for values in payload.values() for e in values]
+        else:
+            entries = [payload]
+
+        for entry in entries:
+            for key in ("call_count", "total_cputime", "total_time", "acc_id_util_pct"):
+                value = entry.get(key)
+                if isinstance(value, (int, float)):
+                    usage = max(usage or 0.0, float(value))
+
+            # estimated_time_to_regain_access vem em minutos
+            minutes = entry.get("estimated_time_to_regain_access") or 0
+            regain_seconds = max(regain_seconds, float(minutes) * 60)
+
+            # reset_time_duration (X-Ad-Account-Usage) vem em segundos
+            reset = entry.get("reset_time_duration") or 0
+            if usage is not None and usage >= 100:
+                regain_seconds = max(regain_seconds, float(reset))
+
+    return usage, regain_seconds
+
+
+def _is_throttle_error(response: httpx.Response) -> bool:
+    """Verifica se a resposta é um erro de rate limit da Meta."""
+    if response.status_code < 400:
+        return False
+
+    try:
+        error = response.json().get("error", {})
+    except (ValueError, AttributeError):
+        return False
+
+    return error.get("code") in THROTTLE_ERROR_CODES
+
+
+class RateLimiterRegistry:
+    """Um MetaRateLimiter por conta de anúncios."""
+
+    def __init__(self):
+        self._limiters: dict = {}
+
+    def reset(self) -> None:
+        self._limiters.clear()
+
+    def for_account(self, account: Optional[str]) -> MetaRateLimiter:
+        account = account or "default"
+        limiter = self._limiters.get(account)
+        if limiter is None:
+            limiter = self._limiters[account] = MetaRateLimiter()
+        return limiter
+
+    def stats(self) -> dict:
+        """Estado de cada limitador (para /health)."""
+        return {account: limiter.stats() for account, limiter in self._limiters.items()}
+
+
+# Instância única do processo, usada por meta_client.send
+rate_limiters = RateLimiterRegistry()
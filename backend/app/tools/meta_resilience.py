@@ -0,0 +1,202 @@
+"""
+Retentativas e circuit breaker para a Meta Graph API
+
+- Retentativas só para leituras (GET), com backoff exponencial e jitter,
+  limitadas por um orçamento de retentativas do processo
+- Um circuit breaker por conta de anúncios: depois de várias falhas
+  transitórias seguidas (5xx, timeouts, erros de rede) as chamadas falham
+  na hora por um tempo, em vez de acumular timeouts de 30 s
+"""
+from typing import Optional
+import random
+import time
+import httpx
+from app.config import settings
+
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Códigos da Graph API para falhas temporárias do lado da Meta
+# 1: erro desconhecido; 2: serviço temporariamente indisponível
+TRANSIENT_ERROR_CODES = {1, 2}
+
+
+class MetaCircuitOpenError(Exception):
+    """A conta está com o circuit breaker aberto: a chamada nem foi feita."""
+
+    def __init__(self, account: str, retry_in: float):
+        super().__init__(
+            f"Meta API instável para a conta {account}; "
+            f"novas chamadas liberadas em {retry_in:.0f}s"
+        )
+        self.account = account
+        self.retry_in = retry_in
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Espera antes da retentativa número `attempt` (1, 2, ...).
+
+    Backoff exponencial com "full jitter": um valor aleatório entre zero e
+    base * 2^(attempt-1), limitado a meta_retry_max_delay. O jitter evita
+    que chamadas que falharam juntas tentem de novo juntas.
+    """
+    ceiling = min(settings.meta_retry_max_delay, settings.meta_retry_base_delay * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def is_transient_response(response: httpx.Response) -> bool:
+    """Verifica se a resposta é uma falha temporária da Meta (vale repetir)."""
+    if response.status_code >= 500:
+        return True
+
+    if response.status_code < 400:
+        return False
+
+    try:
+        error = response.json().get("error", {})
+    except (ValueError, AttributeError):
+        return False
+
+    return bool(error.get("is_transient")) or error.get("code") in TRANSIENT_ERROR_CODES
+
+
+class RetryBudget:
+    """
+    Orçamento de retentativas do processo.
+
+    Cada chamada deposita meta_retry_budget_ratio fichas e cada retentativa
+    gasta uma, então as retentativas ficam limitadas a uma fração das
+    chamadas. Quando a Meta está fora do ar isso impede que as retentativas
+    multipliquem a carga.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.tokens = settings.meta_retry_budget_max
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(settings.meta_retry_budget_max, self.tokens + settings.meta_retry_budget_ratio)
+
+    def withdraw(self) -> bool:
+        """Gasta uma ficha para uma retentativa; False se o orçamento acabou."""
+        if self.tokens < 1:
+            self.exhausted += 1
+            return False
+
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "tokens": round(self.tokens, 2),
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de uma conta de anúncios.
+
+    closed -> open após meta_breaker_failure_threshold falhas seguidas;
+    open -> half_open depois de meta_breaker_reset_timeout segundos, quando
+    uma única chamada de teste é liberada; se ela funcionar, volta a closed.
+    """
+
+    def __init__(self, account: str):
+        self.account = account
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Libera ou recusa uma chamada.
+
+        Raises:
+            MetaCircuitOpenError: Breaker aberto (ou teste já em andamento)
+        """
+        if self.state == BREAKER_CLOSED:
+            return
+
+        retry_in = self.opened_at + settings.meta_breaker_reset_timeout - time.monotonic()
+
+        if self.state == BREAKER_OPEN and retry_in <= 0:
+            self.state = BREAKER_HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+
+        self.rejected += 1
+        raise MetaCircuitOpenError(self.account, max(0.0, retry_in))
+
+    def record_success(self) -> None:
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+
+        if self.state == BREAKER_HALF_OPEN or self.failures >= settings.meta_breaker_failure_threshold:
+            if self.state != BREAKER_OPEN:
+                print(f"🔌 Circuit breaker aberto para a conta {self.account} ({self.failures} falhas seguidas)")
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+    def record_abort(self) -> None:
+        """
+        Chamada interrompida sem resposta (cancelada ou erro inesperado).
+
+        Se era a chamada de teste do half_open, conta como falha e reabre o
+        breaker; senão a conta ficaria presa em half_open, recusando tudo.
+        Fora do teste não altera a contagem de falhas.
+        """
+        if self.state == BREAKER_HALF_OPEN and self._trial_in_flight:
+            self.record_failure()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected_calls": self.rejected,
+        }
+
+
+class BreakerRegistry:
+    """Um CircuitBreaker por conta de anúncios."""
+
+    def __init__(self):
+        self._breakers: dict = {}
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+    def for_account(self, account: Optional[str]) -> CircuitBreaker:
+        account = account or "default"
+        breaker = self._breakers.get(account)
+        if breaker is None:
+            breaker = self._breakers[account] = CircuitBreaker(account)
+        return breaker
+
+    def stats(self) -> dict:
+        """Estado de cada breaker (para /health)."""
+        return {account: breaker.stats() for account, breaker in self._breakers.items()}
+
+
+# Instâncias únicas do processo, usadas por meta_client.send
+retry_budget = RetryBudget()
+breakers = BreakerRegistry()
@@ -0,0 +1,169 @@
+"""
+Séries diárias de insights em formato colunar
+
+Os insights com time_increment=1 viram uma matriz campanha × dia × métrica
+guardada em um único array('d'), em vez de uma lista de dicts por linha.
+Para 500 campanhas × 90 dias × 6 métricas isso dá ~2 MiB contíguos, e os
+agentes fatiam (uma campanha, uma janela de dias, o total da conta) sem
+chamar a Meta de novo.
+"""
+from array import array
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+
+# Métricas guardadas por dia (somáveis). CTR, CPC, CPM e ROAS são
+# calculadas a partir delas em totals(). reach não é somável entre dias:
+# em totals() ele é a soma dos alcances diários (um teto, não o único).
+DAILY_METRICS = ("spend", "impressions", "clicks", "reach", "conversions", "revenue")
+
+
+def _day_range(first: str, last: str) -> list:
+    """Todos os dias (ISO) de first a last, inclusive."""
+    start, end = date.fromisoformat(first), date.fromisoformat(last)
+    return [(start + timedelta(days=n)).isoformat() for n in range((end - start).days + 1)]
+
+
+class DailySeries:
+    """
+    Matriz campanha × dia × métrica (float64) com acesso por ID e data.
+
+    Dias sem entrega (ausentes na resposta da Meta) ficam zerados.
+    """
+
+    def __init__(self, campaign_ids: list, days: list, metrics: tuple = DAILY_METRICS):
+        self.campaign_ids = list(campaign_ids)
+        self.days = list(days)
+        self.metrics = tuple(metrics)
+        self._campaign_index = {cid: i for i, cid in enumerate(self.campaign_ids)}
+        self._day_index = {day: i for i, day in enumerate(self.days)}
+        self._metric_index = {m: i for i, m in enumerate(self.metrics)}
+        self.data = array("d", bytes(8 * len(self.campaign_ids) * len(self.days) * len(self.metrics)))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple], campaign_ids: Optional[list] = None) -> "DailySeries":
+        """
+        Monta a série a partir de linhas (campaign_id, dia ISO, valores),
+        com os valores na ordem de DAILY_METRICS.
+
+        Args:
+            rows: Linhas já convertidas (ver meta_api.get_daily_insights)
+            campaign_ids: Ordem das campanhas; as que não tiverem linhas
+                ficam zeradas. None usa as campanhas presentes nas linhas.
+        """
+        rows = list(rows)
+        ids = list(campaign_ids) if campaign_ids is not None else list(dict.fromkeys(r[0] for r in rows))
+        days = _day_range(min(r[1] for r in rows), max(r[1] for r in rows)) if rows else []
+
+        series = cls(ids, days)
+        for campaign_id, day, values in rows:
+            if campaign_id in series._campaign_index:
+                offset = series._offset(campaign_id, day)
+                series.data[offset:offset + len(values)] = array("d", values)
+
+        return series
+
+    def _offset(self, campaign_id: str, day: str, metric: Optional[str] = None) -> int:
+        c = self._campaign_index[campaign_id]
+        d = self._day_index[day]
+        m = self._metric_index[metric] if metric else 0
+        return (c * len(self.days) + d) * len(self.metrics) + m
+
+    def rows(self, skip_empty: bool = True) -> Iterator[tuple]:
+        """
+        Linhas (campaign_id, dia ISO, valores), o inverso de from_rows.
+
+        Args:
+            skip_empty: Pular dias sem entrega (todas as métricas zeradas)
+        """
+        step = len(self.metrics)
+        for cid in self.campaign_ids:
+            base = self._campaign_index[cid] * len(self.days) * step
+            for d, day in enumerate(self.days):
+                values = tuple(self.data[base + d * step:base + (d + 1) * step])
+                if skip_empty and not any(values):
+                    continue
+                yield cid, day, values
+
+    def __contains__(self, campaign_id: str) -> bool:
+        return campaign_id in self._campaign_index
+
+    def value(self, campaign_id: str, day: str, metric: str) -> float:
+        """Valor de uma métrica em um dia (0 se o dia estiver fora da série)."""
+        if campaign_id not in self._campaign_index or day not in self._day_index:
+            return 0.0
+        return self.data[self._offset(campaign_id, day, metric)]
+
+    def window(self, last: Optional[int] = None, start: Optional[str] = None, end: Optional[str] = None) -> tuple:
+        """
+        Índices [início, fim) dos dias pedidos.
+
+        Args:
+            last: Últimos N dias da série
+            start, end: Datas ISO (inclusive); ignoradas se `last` for passado
+        """
+        if last is not None:
+            return max(0, len(self.days) - last), len(self.days)
+
+        first = self._day_index.get(start, 0) if start else 0
+        stop = self._day_index[end] + 1 if end in self._day_index else len(self.days)
+        return first, stop
+
+    def series(self, campaign_id: str, metric: str, last: Optional[int] = None) -> list:
+        """Valores diários de uma métrica de uma campanha."""
+        if campaign_id not in self._campaign_index:
+            return []
+
+        first, stop = self.window(last)
+        step = len(self.metrics)
+        begin = self._offset(campaign_id, self.days[first], metric) if first < stop else 0
+        return list(self.data[begin:begin + (stop - first) * step:step])
+
+    def totals(
+        self,
+        campaign_id: Optional[str] = None,
+        last: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> dict:
+        """
+        Soma das métricas em uma janela, com CTR, CPC, CPM e ROAS derivados.
+
+        Args:
+            campaign_id: Uma campanha; None soma todas (total da conta)
+        """
+        first, stop = self.window(last, start, end)
+        sums = [0.0] * len(self.metrics)
+        campaigns = [campaign_id] if campaign_id is not None else self.campaign_ids
+
+        for cid in campaigns:
+            if cid not in self._campaign_index:
+                continue
+            for d in range(first, stop):
+                base = self._offset(cid, self.days[d])
+                for m in range(len(self.metrics)):
+                    sums[m] += self.data[base + m]
+
+        totals = dict(zip(self.metrics, sums))
+        spend, impressions, clicks = totals["spend"], totals["impressions"], totals["clicks"]
+        totals["ctr"] = clicks / impressions * 100 if impressions else 0.0
+        totals["cpc"] = spend / clicks if clicks else 0.0
+        totals["cpm"] = spend / impressions * 1000 if impressions else 0.0
+        totals["roas"] = totals["revenue"] / spend if spend else 0.0
+        totals["days"] = stop - first
+        return totals
+
+    def to_dict(self) -> dict:
+        """Formato serializável: {dias, métricas, campanha -> métrica -> valores}."""
+        return {
+            "days": self.days,
+            "metrics": list(self.metrics),
+            "campaigns": {
+                cid: {m: self.series(cid, m) for m in self.metrics}
+                for cid in self.campaign_ids
+            },
+        }
+
+    def nbytes(self) -> int:
+        """Tamanho do array de dados em bytes."""
+        return self.data.itemsize * len(self.data)
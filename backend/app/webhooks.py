@@ -0,0 +1,232 @@
+"""
+Notificações de alteração de objetos de anúncio (webhook da Meta)
+
+A Meta avisa quando campanhas, ad sets e anúncios de uma conta mudam
+(status, orçamento, edições no Gerenciador de Anúncios). Em vez de listar
+todas as campanhas para descobrir o que mudou, cada notificação entra em
+uma fila e só os objetos afetados são relidos e gravados no banco local.
+
+- verify_signature: confere o X-Hub-Signature-256 (HMAC-SHA256 do corpo
+  com meta_app_secret)
+- parse_notification: extrai (conta, objeto, nível) do payload
+- ChangeRefresher: junta as notificações por meta_webhook_debounce
+  segundos (várias alterações do mesmo objeto viram uma leitura) e relê as
+  campanhas afetadas de cada conta em chamadas /batch
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+import asyncio
+import hashlib
+import hmac
+from app.config import settings
+from app.store import store
+from app.sync_state import sync_state
+from app.tools.meta_accounts import fan_out, configured_accounts
+from app.tools.meta_api import get_campaigns_for_objects
+from app.tools.meta_client import normalize_account_id
+
+
+# Nível informado pela Meta (value.level) -> nível usado em meta_api
+WEBHOOK_LEVELS = {
+    "CAMPAIGN": "campaign",
+    "AD_SET": "adset",
+    "ADSET": "adset",
+    "AD": "ad",
+}
+
+SIGNATURE_PREFIX = "sha256="
+
+
+def webhooks_enabled() -> bool:
+    """Webhook configurado (token do handshake e segredo do app)."""
+    return bool(settings.meta_webhook_verify_token and settings.meta_app_secret)
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: Optional[str] = None) -> bool:
+    """
+    Confere o cabeçalho X-Hub-Signature-256 ("sha256=<hex>") do corpo cru.
+
+    Sem segredo configurado nenhuma notificação é aceita.
+    """
+    secret = secret if secret is not None else settings.meta_app_secret
+    if not secret or not signature or not signature.startswith(SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len(SIGNATURE_PREFIX):])
+
+
+@dataclass(frozen=True)
+class ObjectChange:
+    """Um objeto de anúncio alterado, segundo a notificação."""
+    account_id: str
+    object_id: str
+    level: str  # campaign, adset, ad
+
+
+def parse_notification(payload: dict) -> list:
+    """
+    Objetos alterados de uma notificação de conta de anúncios.
+
+    Formato da Meta:
+        {"object": "ad_account", "entry": [{"id": "<conta>", "time": ...,
+         "changes": [{"field": "...", "value": {"id": "<objeto>",
+         "level": "CAMPAIGN" | "AD_SET" | "AD", ...}}]}]}
+
+    Alterações sem objeto ou com nível desconhecido são ignoradas.
+    """
+    if payload.get("object") != "ad_account":
+        return []
+
+    changes = []
+    for entry in payload.get("entry") or []:
+        if not entry.get("id"):
+            continue
+        account_id = normalize_account_id(entry["id"])
+        for change in entry.get("changes") or []:
+            value = change.get("value") or {}
+            level = WEBHOOK_LEVELS.get(str(value.get("level", "")).upper())
+            if value.get("id") and level:
+                changes.append(ObjectChange(account_id, str(value["id"]), level))
+    return changes
+
+
+class ChangeRefresher:
+    """
+    Fila de releituras disparadas pelo webhook.
+
+    As notificações só são enfileiradas (a rota responde na hora, como a
+    Meta exige); um loop em segundo plano espera meta_webhook_debounce
+    segundos e relê tudo o que se acumulou, por conta.
+    """
+
+    def __init__(self):
+        self._pending: dict = {}  # conta -> {objeto: nível}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.ignored = 0
+        self.refreshes = 0
+        self.campaigns_refreshed = 0
+        self.errors = 0
+        self.last_refresh_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(objects) for objects in self._pending.values())
+
+    def enqueue(self, changes: Iterable[ObjectChange]) -> int:
+        """
+        Enfileira objetos alterados das contas configuradas.
+
+        Returns:
+            Quantos foram aceitos (repetidos contam, mas são lidos uma vez)
+        """
+        accounts = set(configured_accounts())
+        accepted = 0
+        for change in changes:
+            if change.account_id not in accounts:
+                self.ignored += 1
+                continue
+            self._pending.setdefault(change.account_id, {})[change.object_id] = change.level
+            accepted += 1
+
+        self.received += accepted
+        if accepted:
+            self._wakeup.set()
+        return accepted
+
+    async def drain(self) -> dict:
+        """
+        Relê agora os objetos enfileirados.
+
+        Returns:
+            Dict conta -> resultado da releitura
+        """
+        pending, self._pending = self._pending, {}
+        self._wakeup.clear()
+        if not pending:
+            return {}
+
+        async def refresh(account_id: str) -> dict:
+            return await self._refresh_account(account_id, pending[account_id])
+
+        results = await fan_out(refresh, list(pending))
+
+        self.refreshes += 1
+        self.last_refresh_at = datetime.now(timezone.utc).isoformat()
+        for account_id, result in results.items():
+            self.campaigns_refreshed += result.get("campaigns_refreshed", 0)
+            if "error" in result:
+                self.errors += 1
+                self.last_error = f"{account_id}: {result['error']}"
+                print(f"❌ Webhook: releitura de {account_id} falhou: {result['error']}")
+        return results
+
+    async def _refresh_account(self, account_id: str, objects: dict) -> dict:
+        result = await get_campaigns_for_objects(objects)
+        if not result["success"]:
+            return {"success": False, "error": result.get("error") or next(iter(result["errors"].values()))}
+
+        campaigns = result["campaigns"]
+        written = await store.upsert_campaigns(account_id, campaigns)
+        # Conhecidas pela próxima reconciliação; a marca d'água não muda,
+        # já que nem todas as campanhas alteradas foram lidas
+        sync_state.for_account(account_id).campaign_ids.update(camp.id for camp in campaigns)
+
+        return {
+            "success": not result["errors"],
+            "campaigns_refreshed": written,
+            "objects": len(objects),
+            "errors": result["errors"],
+        }
+
+    def start(self) -> None:
+        """Inicia o loop de releituras (chamado no startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+            print("🔔 Webhook da Meta: alterações relidas sob demanda")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Junta as notificações que chegam em sequência (ex: edição em massa)
+            await asyncio.sleep(settings.meta_webhook_debounce)
+            try:
+                await self.drain()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                print(f"❌ Webhook: erro ao reler objetos alterados: {e}")
+
+    def reset(self) -> None:
+        self._pending.clear()
+        self._wakeup.clear()
+        self.received = self.ignored = self.refreshes = 0
+        self.campaigns_refreshed = self.errors = 0
+        self.last_refresh_at = self.last_error = None
+
+    def stats(self) -> dict:
+        """Estado da fila (para /health)."""
+        return {
+            "enabled": webhooks_enabled(),
+            "pending": self.pending,
+            "received": self.received,
+            "ignored": self.ignored,
+            "refreshes": self.refreshes,
+            "campaigns_refreshed": self.campaigns_refreshed,
+            "errors": self.errors,
+            "last_refresh_at": self.last_refresh_at,
+            "last_error": self.last_error,
+        }
+
+
+# Fila única do processo
+change_refresher = ChangeRefresher()
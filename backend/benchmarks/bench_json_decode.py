@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decodificação de uma página grande de campanhas (10k itens)
+
+Compara três formas de ler uma página da Graph API, consumindo uma
+campanha por vez (como faz a sincronização):
+
+- json: corpo inteiro em memória + json.loads (o antigo response.json())
+- orjson: corpo inteiro em memória + orjson.loads (decode_json)
+- stream: meta_json.StreamedPage com ijson, itens entregues conforme os
+  bytes chegam
+
+Mede o tempo até a primeira campanha, o tempo total e o pico de memória
+(tracemalloc) de cada modo. O corpo chega em blocos de --chunk-kb; use
+--chunk-delay-ms para simular a rede (o modo stream começa a trabalhar
+antes do último bloco chegar).
+
+Uso:
+    python benchmarks/bench_json_decode.py
+    python benchmarks/bench_json_decode.py --campaigns 10000 --chunk-delay-ms 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+# Adicionar o diretório do backend ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tools.meta_json import StreamedPage, HAS_IJSON, orjson
+
+
+def build_page(campaigns: int) -> bytes:
+    """Página sintética no formato de /act_x/campaigns com todos os campos."""
+    data = [
+        {
+            "id": f"12021{i:08d}",
+            "name": f"Vendas_Produto_{i}_Janeiro2026",
+            "objective": "OUTCOME_SALES",
+            "status": "ACTIVE" if i % 3 else "PAUSED",
+            "effective_status": "ACTIVE" if i % 3 else "PAUSED",
+            "daily_budget": str(5000 + i),
+            "lifetime_budget": "0",
+            "special_ad_categories": [],
+            "created_time": "2026-01-01T00:00:00+0000",
+            "updated_time": "2026-01-15T12:00:00+0000",
+        }
+        for i in range(campaigns)
+    ]
+    return json.dumps({
+        "data": data,
+        "paging": {"cursors": {"before": "a", "after": "b"}, "next": "https://graph.facebook.com/next"},
+    }).encode()
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes, chunk_size: int, delay: float):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.delay = delay
+
+    async def __aiter__(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield self.body[start:start + self.chunk_size]
+
+
+async def read_buffered(response: httpx.Response, loads):
+    await response.aread()
+    for campaign in loads(response.content)["data"]:
+        yield campaign
+
+
+async def read_streamed(response: httpx.Response, _loads):
+    async for campaign in StreamedPage(response).records():
+        yield campaign
+
+
+async def consume(reader, loads, body: bytes, chunk_size: int, delay: float) -> tuple:
+    """Lê a página inteira; retorna (s até a 1ª campanha, s total, campanhas)."""
+    response = httpx.Response(200, stream=ChunkedStream(body, chunk_size, delay))
+    start = time.perf_counter()
+    first = None
+    count = 0
+
+    async for campaign in reader(response, loads):
+        if first is None:
+            first = time.perf_counter() - start
+        count += int(campaign["daily_budget"]) > 0
+
+    return first, time.perf_counter() - start, count
+
+
+async def measure(label: str, reader, loads, body: bytes, chunk_size: int, delay: float) -> None:
+    # Tempo e memória em passadas separadas: o tracemalloc distorce o tempo
+    first, total, count = await consume(reader, loads, body, chunk_size, delay)
+
+    tracemalloc.start()
+    await consume(reader, loads, body, chunk_size, delay)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<8} 1ª campanha {first * 1000:8.1f} ms | total {total * 1000:8.1f} ms | "
+        f"pico {peak / 1024 / 1024:6.1f} MiB | {count} campanhas"
+    )
+
+
+async def main(campaigns: int, chunk_kb: int, chunk_delay_ms: float) -> None:
+    body = build_page(campaigns)
+    chunk_size = chunk_kb * 1024
+    delay = chunk_delay_ms / 1000
+
+    print(
+        f"Página com {campaigns} campanhas ({len(body) / 1024 / 1024:.1f} MiB), "
+        f"blocos de {chunk_kb} KiB, {chunk_delay_ms} ms por bloco\n"
+    )
+
+    await measure("json", read_buffered, json.loads, body, chunk_size, delay)
+    if orjson is not None:
+        await measure("orjson", read_buffered, orjson.loads, body, chunk_size, delay)
+    else:
+        print("orjson   não instalado")
+    if HAS_IJSON:
+        await measure("stream", read_streamed, None, body, chunk_size, delay)
+    else:
+        print("stream   ijson não instalado")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campaigns", type=int, default=10000)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.chunk_kb, args.chunk_delay_ms))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cliente HTTP novo a cada chamada vs. cliente compartilhado
+
+Sobe um servidor local que imita o endpoint /{campaign_id}/insights da Graph
+API e mede a latência por chamada de get_campaign_insights nos dois modos:
+
+- por chamada: sem init_meta_client(), cada chamada abre (e fecha) seu cliente
+- compartilhado: init_meta_client() como no lifespan, conexões reaproveitadas
+
+O cache de respostas (meta_cache) fica desligado e é limpo antes de cada
+passada: as duas medem idas reais ao servidor, não acertos de cache.
+
+O servidor é HTTP puro em localhost, então o custo de handshake TLS real não
+aparece. Use --handshake-ms para simular o custo de abrir cada conexão nova
+(TCP + TLS até graph.facebook.com costuma ficar entre 50 e 150 ms).
+
+Uso:
+    python benchmarks/bench_meta_client.py
+    python benchmarks/bench_meta_client.py --calls 500 --handshake-ms 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Adicionar o diretório do backend ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.tools.meta_api import get_campaign_insights
+from app.tools.meta_cache import response_cache, single_flight
+from app.tools.meta_client import init_meta_client, close_meta_client
+
+
+INSIGHTS_BODY = json.dumps({
+    "data": [{
+        "impressions": "10000",
+        "clicks": "500",
+        "spend": "250.50",
+        "cpc": "0.50",
+        "cpm": "25.05",
+        "ctr": "5.0",
+        "reach": "8000",
+    }]
+}).encode()
+
+
+def start_stand_in_server(handshake_ms: float) -> ThreadingHTTPServer:
+    """Sobe o servidor local em uma thread e retorna a instância."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Necessário para keep-alive
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            # Chamado uma vez por conexão: simula o custo do handshake
+            if handshake_ms:
+                time.sleep(handshake_ms / 1000)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(INSIGHTS_BODY)))
+            self.end_headers()
+            self.wfile.write(INSIGHTS_BODY)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def measure(calls: int) -> list:
+    """Executa `calls` chamadas sequenciais e retorna as latências em ms."""
+    # Mesmos IDs nas duas passadas: sem cache, toda chamada vai ao servidor
+    response_cache.clear()
+    single_flight.clear()
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        result = await get_campaign_insights(f"bench_{i}", "last_7d")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert result["success"], result
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    """Imprime média, p50 e p95 das latências."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<16} média {statistics.mean(ordered):7.2f} ms | "
+        f"p50 {statistics.median(ordered):7.2f} ms | p95 {p95:7.2f} ms"
+    )
+
+
+async def main(calls: int, handshake_ms: float) -> None:
+    server = start_stand_in_server(handshake_ms)
+    host, port = server.server_address
+
+    settings.meta_access_token = "bench_token"
+    settings.meta_graph_api_url = f"http://{host}:{port}/v24.0"
+    settings.meta_cache_enabled = False
+
+    print(f"{calls} chamadas sequenciais | handshake simulado: {handshake_ms} ms\n")
+
+    per_call = await measure(calls)
+    report("por chamada", per_call)
+
+    await init_meta_client()
+    try:
+        shared = await measure(calls)
+    finally:
+        await close_meta_client()
+    report("compartilhado", shared)
+
+    speedup = statistics.mean(per_call) / statistics.mean(shared)
+    print(f"\nGanho: {speedup:.1f}x menos latência média por chamada")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.handshake_ms))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memória de linhas de insights como dicts vs. InsightRow
+
+Converte N linhas de /act_x/insights (level=campaign, com actions e
+action_values) de duas formas e mede a memória retida (tracemalloc) e o
+tempo de conversão:
+
+- dict: o formato antigo de _format_insight_row, um dict por linha com
+  nome e as 10 métricas
+- record: meta_records.InsightRow (dataclass com __slots__)
+- page: InsightRow.from_rows em páginas de 500 linhas (como a Meta
+  pagina), com actions/action_values extraídos em uma passada por página
+
+As linhas de entrada são geradas antes da medição; só o resultado da
+conversão entra na conta.
+
+InsightRow troca memória por CPU: retém cerca de metade da memória dos
+dicts, mas a conversão é mais lenta (valida e projeta todas as métricas
+e consulta o mapeamento de ações da conta): entre 1,4x e 2,4x o tempo
+do dict especializado, conforme o caminho e a máquina.
+
+Uso:
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Adicionar o diretório do backend ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tools.meta_actions import extractor_for
+from app.tools.meta_records import InsightRow
+
+PAGE_SIZE = 500
+
+
+def build_rows(count: int) -> list:
+    """Linhas sintéticas no formato da Graph API (números como strings)."""
+    return [
+        {
+            "campaign_id": f"12021{i:08d}",
+            "campaign_name": f"Vendas_Produto_{i % 500}_Janeiro2026",
+            "spend": f"{10 + i % 90}.50",
+            "impressions": str(1000 + i),
+            "clicks": str(10 + i % 50),
+            "ctr": "1.25",
+            "cpm": "12.40",
+            "cpc": "0.85",
+            "reach": str(800 + i),
+            "actions": [{"action_type": "purchase", "value": str(i % 5)}],
+            "action_values": [{"action_type": "purchase", "value": f"{i % 5 * 40}.00"}],
+        }
+        for i in range(count)
+    ]
+
+
+def as_dict(row: dict) -> dict:
+    """Formato antigo (dict por linha), para comparação."""
+    conversions = sum(int(a["value"]) for a in row["actions"] if a["action_type"] == "purchase")
+    revenue = sum(float(v["value"]) for v in row["action_values"] if v["action_type"] == "purchase")
+    spend = float(row["spend"])
+    return {
+        "name": row["campaign_name"],
+        "spend": spend,
+        "impressions": int(row["impressions"]),
+        "clicks": int(row["clicks"]),
+        "ctr": float(row["ctr"]),
+        "cpm": float(row["cpm"]),
+        "cpc": float(row["cpc"]),
+        "reach": int(row["reach"]),
+        "conversions": conversions,
+        "revenue": revenue,
+        "roas": revenue / spend if spend else 0.0,
+    }
+
+
+def as_records(rows: list) -> list:
+    # Extractor resolvido uma vez, como fazem os chamadores em meta_api
+    extractor = extractor_for()
+    return [InsightRow.from_graph(row, level="campaign", extractor=extractor) for row in rows]
+
+
+def as_pages(rows: list) -> list:
+    converted = []
+    for start in range(0, len(rows), PAGE_SIZE):
+        converted.extend(InsightRow.from_rows(rows[start:start + PAGE_SIZE], level="campaign"))
+    return converted
+
+
+def measure(label: str, convert, rows: list) -> tuple:
+    # Tempo e memória em passadas separadas: o tracemalloc distorce o tempo
+    start = time.perf_counter()
+    converted = convert(rows)
+    elapsed = time.perf_counter() - start
+    del converted
+
+    tracemalloc.start()
+    converted = convert(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<7} {retained / 1024 / 1024:7.1f} MiB retidos "
+        f"({retained / len(converted):6.0f} bytes/linha) | conversão {elapsed * 1000:7.1f} ms"
+    )
+    return retained, elapsed
+
+
+def main(count: int) -> None:
+    rows = build_rows(count)
+    print(f"{count} linhas de insights\n")
+
+    dict_memory, dict_time = measure("dict", lambda rows: [as_dict(row) for row in rows], rows)
+    record_memory, record_time = measure("record", as_records, rows)
+    _, page_time = measure("page", as_pages, rows)
+
+    # A troca é memória por CPU: InsightRow retém menos, mas converte mais devagar
+    print(f"\nInsightRow usa {record_memory / dict_memory:.0%} da memória dos dicts")
+    print(
+        f"e converte {record_time / dict_time:.1f}x (linha a linha) / "
+        f"{page_time / dict_time:.1f}x (por página) o tempo dos dicts"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.rows)
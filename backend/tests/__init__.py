@@ -3,6 +3,21 @@ Backend tests package.
 
 Test structure:
 - test_meta_api.py: Tests for Meta API tools
+- test_meta_client.py: Tests for the shared Graph API HTTP client
+- test_meta_rate_limit.py: Tests for the adaptive rate limiter
+- test_meta_accounts.py: Tests for multi-account fan-out and per-account limits
+- test_meta_cache.py: Tests for the Graph API response cache
+- test_meta_resilience.py: Tests for retries and the circuit breaker
+- test_meta_json.py: Tests for JSON decoding and streamed pages
+- test_meta_timeseries.py: Tests for daily columnar insights series
+- test_meta_breakdowns.py: Tests for breakdown insights and their store
+- test_meta_hierarchy.py: Tests for the campaign → ad sets → ads loader
+- test_meta_records.py: Tests for the typed campaign and insight records
+- test_meta_actions.py: Tests for per-account conversion and revenue extraction
+- test_store.py: Tests for the local metrics database
+- test_optimizer.py: Tests for the optimizer agent tools
 - test_api_campaigns.py: Tests for FastAPI endpoints
+- test_api_sync.py: Tests for the sync endpoints and background jobs
+- test_webhooks.py: Tests for the Meta webhook receiver and targeted re-fetch
 - test_integration_*.py: Integration tests (marked with @pytest.mark.integration)
 """
@@ -0,0 +1,257 @@
+"""
+Tests for the campaigns API endpoints (app.api.campaigns).
+
+Run tests:
+    pytest backend/tests/test_api_campaigns.py -v
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.jobs import jobs
+from app.main import app
+from app.tools.meta_breakdowns import BreakdownStore
+from app.tools.meta_records import InsightRow
+
+
+@pytest.fixture
+async def api_client():
+    """HTTP client bound to the FastAPI app (same event loop as the test)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def _wait_for_job(api_client, job_id: str) -> dict:
+    """Poll the job endpoint until the job leaves the running state."""
+    for _ in range(100):
+        response = await api_client.get(f"/api/sync/jobs/{job_id}")
+        job = response.json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish: {job}")
+
+
+# =============================================================================
+# Breakdown insights
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_breakdown_route_returns_grouped_results(api_client):
+    """GET /{id}/insights/breakdown aggregates the breakdown store."""
+    store = BreakdownStore(("age",))
+    store.add("123", {"age": "18-24"}, InsightRow(spend=5))
+    store.add("123", {"age": "25-34"}, InsightRow(spend=15))
+    fake = AsyncMock(return_value={
+        "success": True,
+        "period": "last_7d",
+        "breakdowns": ["age"],
+        "rows": 2,
+        "store": store,
+    })
+
+    with patch('app.api.campaigns.get_breakdown_insights', fake):
+        response = await api_client.get("/api/campaigns/123/insights/breakdown?breakdown=age&top=1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rows"] == 2
+    assert [r["age"] for r in body["results"]] == ["25-34"]
+    fake.assert_awaited_once_with("age", "last_7d", campaign_id="123")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_breakdown_route_validates_period(api_client):
+    """An unknown date_preset is rejected with 400."""
+    response = await api_client.get("/api/campaigns/123/insights/breakdown?date_preset=forever")
+
+    assert response.status_code == 400
+
+
+# =============================================================================
+# Bulk status
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_status_route_returns_partial_results(api_client):
+    """PATCH /status returns 200 with per-ID results when some updates fail."""
+    fake = AsyncMock(return_value={
+        "success": False,
+        "status": "PAUSED",
+        "total": 2,
+        "updated": 1,
+        "failed": 1,
+        "results": {"1": {"success": True}, "2": {"success": False, "error": "boom"}},
+        "batch_requests": 1,
+    })
+
+    with patch('app.api.campaigns.update_campaigns_status', fake):
+        response = await api_client.patch(
+            "/api/campaigns/status",
+            json={"campaign_ids": ["1", "2"], "status": "PAUSED"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["results"]["2"]["error"] == "boom"
+    fake.assert_awaited_once_with(["1", "2"], "PAUSED")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_status_route_validates_status(api_client):
+    """An unknown status is rejected with 400."""
+    response = await api_client.patch(
+        "/api/campaigns/status",
+        json={"campaign_ids": ["1"], "status": "DELETED"},
+    )
+
+    assert response.status_code == 400
+
+
+# =============================================================================
+# Chunked deep copy
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_duplicate_too_large_starts_chunked_copy_job(api_client):
+    """A deep copy rejected as too large continues as a background job."""
+    too_large = AsyncMock(return_value={
+        "success": False,
+        "error": "A campanha tem muitos ad sets e anúncios para uma única cópia.",
+        "error_code": 100,
+        "error_subcode": 1885194,
+    })
+    chunked = AsyncMock(return_value={"success": True, "campaign_id": "new_1", "checkpoint": {}})
+
+    with patch('app.api.campaigns.duplicate_campaign', too_large), \
+         patch('app.api.campaigns.copy_campaign_in_chunks', chunked):
+        response = await api_client.post("/api/campaigns/1/duplicate", json={"deep_copy": True})
+
+        assert response.status_code == 200
+        job = response.json()
+        assert job["kind"] == "campaign_copy"
+
+        finished = await _wait_for_job(api_client, job["job_id"])
+
+    assert finished["status"] == "completed"
+    assert finished["result"]["campaign_id"] == "new_1"
+    assert "checkpoint" not in finished["result"]
+    assert chunked.await_args.args == ("1",)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_shallow_copy_too_large_returns_the_error(api_client):
+    """Without deep_copy, ad sets and ads are never copied in the background."""
+    too_large = AsyncMock(return_value={
+        "success": False,
+        "error": "A campanha tem muitos ad sets e anúncios para uma única cópia.",
+        "error_code": 100,
+        "error_subcode": 1885194,
+    })
+    chunked = AsyncMock()
+
+    with patch('app.api.campaigns.duplicate_campaign', too_large), \
+         patch('app.api.campaigns.copy_campaign_in_chunks', chunked):
+        response = await api_client.post("/api/campaigns/1/duplicate", json={"deep_copy": False})
+
+    assert response.status_code == 400
+    assert "muitos ad sets" in response.json()["detail"]
+    chunked.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_resume_copy_reuses_checkpoint(api_client):
+    """POST /copies/{job_id}/resume restarts a failed copy from its checkpoint."""
+    checkpoint = {"campaign_id": "new_1", "adsets": {"a1": {"id": "new_a1", "complete": True}}}
+    calls = []
+
+    async def fake_copy(campaign_id, **kwargs):
+        calls.append(kwargs["checkpoint"])
+        if len(calls) == 1:
+            kwargs["on_progress"]({"stage": "partial", "checkpoint": checkpoint})
+            return {"success": False, "error": "1 objetos não foram copiados"}
+        return {"success": True, "campaign_id": "new_1"}
+
+    with patch('app.api.campaigns.copy_campaign_in_chunks', side_effect=fake_copy):
+        response = await api_client.post("/api/campaigns/1/duplicate", json={"chunked": True})
+        failed = await _wait_for_job(api_client, response.json()["job_id"])
+        assert failed["status"] == "failed"
+        # Progress keeps counts only; the source -> copy map stays out of the API
+        assert failed["progress"] == {"stage": "partial"}
+
+        response = await api_client.post(f"/api/campaigns/copies/{failed['job_id']}/resume")
+        assert response.status_code == 200
+        resumed = await _wait_for_job(api_client, response.json()["job_id"])
+
+    assert resumed["status"] == "completed"
+    assert calls[0] is None
+    assert calls[1] == checkpoint
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_resume_cancelled_copy_and_after_restart(api_client, metrics_store):
+    """Cancelled copies resume too; the checkpoint survives losing the job registry."""
+    checkpoint = {"campaign_id": "new_1", "adsets": {"a1": {"id": "new_a1", "complete": True}}}
+    calls = []
+    started = asyncio.Event()
+
+    async def fake_copy(campaign_id, **kwargs):
+        calls.append(kwargs["checkpoint"])
+        if len(calls) == 1:
+            kwargs["on_progress"]({"stage": "adsets", "checkpoint": checkpoint})
+            started.set()
+            await asyncio.sleep(60)
+        if len(calls) == 2:
+            return {"success": False, "error": "1 objetos não foram copiados", "checkpoint": checkpoint}
+        return {"success": True, "campaign_id": "new_1"}
+
+    with patch('app.api.campaigns.copy_campaign_in_chunks', side_effect=fake_copy):
+        response = await api_client.post("/api/campaigns/1/duplicate", json={"chunked": True})
+        job_id = response.json()["job_id"]
+        await started.wait()
+
+        # Running copies are not resumed
+        assert (await api_client.post(f"/api/campaigns/copies/{job_id}/resume")).status_code == 400
+
+        assert (await api_client.post(f"/api/sync/jobs/{job_id}/cancel")).status_code == 202
+        cancelled = await _wait_for_job(api_client, job_id)
+        assert cancelled["status"] == "cancelled"
+        saved = await metrics_store.copy_checkpoint(job_id)
+        assert (saved["status"], saved["checkpoint"]) == ("cancelled", checkpoint)
+
+        response = await api_client.post(f"/api/campaigns/copies/{job_id}/resume")
+        assert response.status_code == 200
+        failed = await _wait_for_job(api_client, response.json()["job_id"])
+        assert failed["status"] == "failed"
+
+        # Restart: the registry no longer knows the job, the store does
+        jobs._jobs.pop(failed["job_id"])
+        response = await api_client.post(f"/api/campaigns/copies/{failed['job_id']}/resume")
+        assert response.status_code == 200
+        resumed = await _wait_for_job(api_client, response.json()["job_id"])
+
+    assert resumed["status"] == "completed"
+    assert calls == [None, checkpoint, checkpoint]
+    assert (await metrics_store.copy_checkpoint(resumed["job_id"]))["status"] == "completed"
+
+    # A completed copy is not copied again
+    response = await api_client.post(f"/api/campaigns/copies/{resumed['job_id']}/resume")
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_resume_unknown_copy_returns_404(api_client):
+    response = await api_client.post("/api/campaigns/copies/does-not-exist/resume")
+
+    assert response.status_code == 404
@@ -0,0 +1,720 @@
+"""
+Tests for the sync API endpoints (app.api.sync).
+
+Run tests:
+    pytest backend/tests/test_api_sync.py -v
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.config import settings
+from app.api.sync import start_campaign_sync, start_metrics_sync
+from app.main import app
+from app.scheduler import SyncScheduler
+from app.sync_state import sync_state, parse_graph_time
+from app.tools import meta_client
+from app.tools.meta_api import MetaListingTruncated
+from app.tools.meta_records import Campaign
+from app.tools.meta_timeseries import DailySeries
+
+
+@pytest.fixture
+async def api_client():
+    """HTTP client bound to the FastAPI app (same event loop as the test)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def _wait_for_job(api_client, job_id: str) -> dict:
+    """Poll the job endpoint until the job leaves the running state."""
+    for _ in range(500):
+        response = await api_client.get(f"/api/sync/jobs/{job_id}")
+        job = response.json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish: {job}")
+
+
+async def _sync(api_client, path: str) -> dict:
+    """Enqueue a sync job and return its finished job payload."""
+    response = await api_client.post(path)
+    assert response.status_code == 202
+    return await _wait_for_job(api_client, response.json()["job_id"])
+
+
+# =============================================================================
+# Insights report jobs
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_report_runs_as_background_job(api_client):
+    """POST /reports returns a job ID at once; the result arrives later."""
+    report_result = {
+        "success": True,
+        "level": "ad",
+        "period": "last_30d",
+        "report_run_id": "run_1",
+        "total": 1,
+        "insights": {"ad_1": {"name": "Ad 1", "spend": 10.0}},
+    }
+
+    async def fake_report(level, date_preset, on_progress):
+        on_progress({"stage": "running", "percent": 50, "rows": 0})
+        await asyncio.sleep(0.02)
+        return report_result
+
+    with patch('app.api.sync.run_insights_report', side_effect=fake_report):
+        response = await api_client.post("/api/sync/reports", json={"level": "ad"})
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["kind"] == "insights_report"
+        assert job["status"] in ("pending", "running")
+        assert "result" not in job
+
+        finished = await _wait_for_job(api_client, job["job_id"])
+
+    assert finished["status"] == "completed"
+    assert finished["result"]["insights"]["ad_1"]["spend"] == 10.0
+    assert finished["progress"]["stage"] == "running"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_report_job_failure(api_client):
+    """A success=False result marks the job as failed with its error."""
+    failing = AsyncMock(return_value={"success": False, "error": "Relatório falhou"})
+
+    with patch('app.api.sync.run_insights_report', failing):
+        response = await api_client.post("/api/sync/reports", json={"level": "campaign"})
+        finished = await _wait_for_job(api_client, response.json()["job_id"])
+
+    assert finished["status"] == "failed"
+    assert finished["error"] == "Relatório falhou"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_report_invalid_level(api_client):
+    """Only campaign, adset and ad levels are accepted."""
+    response = await api_client.post("/api/sync/reports", json={"level": "account"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(api_client):
+    response = await api_client.get("/api/sync/jobs/does-not-exist")
+
+    assert response.status_code == 404
+
+
+# =============================================================================
+# Multi-account sync
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sync_campaigns_fans_out_across_accounts(api_client):
+    """Each account is synced on its own; a failing account is reported, not fatal."""
+    async def fake_iter_campaigns(account_id=None, **kwargs):
+        if account_id == "act_2":
+            raise RuntimeError("Invalid OAuth access token")
+        for i in range(3):
+            yield Campaign(f"{account_id}_{i}", f"Campanha {i}")
+
+    with patch('app.api.sync.iter_campaigns', side_effect=fake_iter_campaigns):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1,act_2,3")
+
+    assert job["status"] == "completed"
+    assert job["progress"]["accounts_done"] == job["progress"]["accounts_total"] == 3
+    body = job["result"]
+    assert body["success"] is False
+    assert body["campaigns_synced"] == 6
+    assert body["errors"] == ["act_2: Invalid OAuth access token"]
+    assert set(body["accounts"]) == {"act_1", "act_2", "act_3"}
+    assert body["accounts"]["act_3"]["campaigns_synced"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sync_campaigns_fails_when_no_account_can_be_read(api_client):
+    """If every account fails, the sync job fails."""
+    async def failing(account_id=None, **kwargs):
+        raise RuntimeError("Meta API não configurada")
+        yield  # pragma: no cover
+
+    with patch('app.api.sync.iter_campaigns', side_effect=failing):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Meta API não configurada"
+
+
+# =============================================================================
+# Incremental campaign sync
+# =============================================================================
+
+class FakeCampaignListing:
+    """Stands in for iter_campaigns, honouring the updated_since filter."""
+
+    def __init__(self, campaigns: dict):
+        self.campaigns = campaigns  # id -> updated_time (Graph API format)
+        self.calls = []
+
+    async def __call__(self, account_id=None, updated_since=None, **kwargs):
+        self.calls.append(updated_since)
+        for campaign_id, updated_time in self.campaigns.items():
+            if updated_since and parse_graph_time(updated_time) <= updated_since:
+                continue
+            yield Campaign(campaign_id, f"Campanha {campaign_id}", updated_time=updated_time)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_second_sync_only_fetches_changed_campaigns(api_client):
+    """The first sync lists everything; the next one filters on the watermark."""
+    listing = FakeCampaignListing({
+        "1": "2026-01-10T12:00:00+0000",
+        "2": "2026-01-15T12:00:00+0000",
+    })
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        first = (await _sync(api_client, "/api/sync/campaigns?account_ids=1"))["result"]
+        listing.campaigns["3"] = "2026-01-20T08:00:00+0000"
+        second = (await _sync(api_client, "/api/sync/campaigns?account_ids=1"))["result"]
+
+    assert first["accounts"]["act_1"]["mode"] == "full"
+    assert first["campaigns_synced"] == 2
+
+    watermark = parse_graph_time("2026-01-15T12:00:00+0000")
+    assert listing.calls == [None, watermark - settings.sync_watermark_overlap]
+
+    body = second["accounts"]["act_1"]
+    assert body["mode"] == "incremental"
+    # Campaign 2 sits inside the overlap window and is upserted again
+    assert body["campaigns_synced"] == 2
+    assert sync_state.for_account("act_1").watermark == parse_graph_time("2026-01-20T08:00:00+0000")
+    assert sync_state.for_account("act_1").campaign_ids == {"1", "2", "3"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_detects_deleted_campaigns(api_client):
+    """A reconciliation pass reports campaigns that disappeared from the account."""
+    listing = FakeCampaignListing({
+        "1": "2026-01-10T12:00:00+0000",
+        "2": "2026-01-15T12:00:00+0000",
+    })
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+        del listing.campaigns["1"]
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1&full=true")
+
+    body = job["result"]["accounts"]["act_1"]
+    assert body["mode"] == "full"
+    assert body["campaigns_deleted"] == ["1"]
+    assert listing.calls == [None, None]
+    assert sync_state.for_account("act_1").campaign_ids == {"2"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_interrupted_sync_keeps_the_watermark(api_client):
+    """If the listing breaks midway, the next sync retries from the old watermark."""
+    state = sync_state.for_account("act_1")
+    state.watermark = 1000
+    state.last_full_sync = time.time()
+
+    async def broken(account_id=None, **kwargs):
+        yield Campaign("1", "Campanha 1", updated_time="2026-01-10T12:00:00+0000")
+        raise RuntimeError("Connection reset")
+
+    with patch('app.api.sync.iter_campaigns', side_effect=broken):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+
+    assert job["result"]["accounts"]["act_1"]["mode"] == "incremental"
+    assert state.watermark == 1000
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_listing_cut_by_the_page_cap_marks_nothing_deleted(api_client):
+    """A listing that stops at the page cap is incomplete: no deletions are reconciled."""
+    state = sync_state.for_account("act_1")
+    state.campaign_ids = {str(i) for i in range(3000)}
+    calls = []
+
+    async def capped(account_id=None, **kwargs):
+        calls.append(kwargs)
+        for i in range(2500):
+            yield Campaign(str(i), f"Campanha {i}", updated_time="2026-01-10T12:00:00+0000")
+        raise MetaListingTruncated(50)
+
+    with patch('app.api.sync.iter_campaigns', side_effect=capped):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1&full=true")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert calls[0]["max_pages"] is None
+    assert account["total"] == 2500
+    assert account["campaigns_deleted"] == []
+    assert len(state.campaign_ids) == 3000
+    assert state.watermark is None
+
+
+# =============================================================================
+# Persistence (app.store, in-memory SQLite via the metrics_store fixture)
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_campaign_sync_is_a_handful_of_statements(api_client, metrics_store):
+    """5k campaigns are written in batched upserts, not one statement each."""
+    async def listing(account_id=None, **kwargs):
+        for i in range(5000):
+            yield Campaign(str(i), f"Campanha {i}", status="ACTIVE", daily_budget=5000)
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+
+    assert job["result"]["campaigns_synced"] == 5000
+    assert job["progress"]["rows_written"] == 5000
+    assert metrics_store.statements == 5000 // settings.database_upsert_batch_size
+
+    stored = await metrics_store.campaigns("act_1")
+    assert len(stored) == 5000
+    assert stored[0]["daily_budget"] == 5000
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reconciliation_marks_deleted_campaigns_in_store(api_client, metrics_store):
+    listing = FakeCampaignListing({
+        "1": "2026-01-10T12:00:00+0000",
+        "2": "2026-01-15T12:00:00+0000",
+    })
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+        del listing.campaigns["1"]
+        await _sync(api_client, "/api/sync/campaigns?account_ids=1&full=true")
+
+    assert [c["campaign_id"] for c in await metrics_store.campaigns("act_1")] == ["2"]
+    deleted = await metrics_store.campaigns("act_1", include_deleted=True)
+    assert deleted[0]["campaign_id"] == "1"
+    assert deleted[0]["deleted_at"] is not None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, target", [
+    ("/api/sync/campaigns?account_ids=1", "app.api.sync.iter_campaigns"),
+    ("/api/sync/full?account_ids=1", "app.sync_pipeline.iter_campaigns"),
+])
+async def test_first_full_pass_after_restart_detects_deletions(api_client, metrics_store, path, target):
+    """A fresh AccountSyncState reconciles against the campaigns the store still holds."""
+    await metrics_store.upsert_campaigns("act_1", [Campaign(i, f"Campanha {i}") for i in ("1", "2", "3")])
+    sync_state.reset()
+    assert sync_state.for_account("act_1").campaign_ids == set()
+
+    listing = FakeCampaignListing({"2": "2026-01-15T12:00:00+0000", "3": "2026-01-16T12:00:00+0000"})
+    with patch(target, side_effect=listing), \
+         patch('app.sync_pipeline.get_daily_insights', AsyncMock(return_value={
+             "success": True, "series": DailySeries.from_rows([]),
+         })):
+        job = await _sync(api_client, path)
+
+    assert job["result"]["accounts"]["act_1"]["campaigns_deleted"] == ["1"]
+    assert [c["campaign_id"] for c in await metrics_store.campaigns("act_1")] == ["2", "3"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_write_keeps_the_watermark(api_client, metrics_store):
+    """Campaigns that could not be stored are fetched again next time."""
+    listing = FakeCampaignListing({"1": "2026-01-10T12:00:00+0000"})
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing), \
+         patch.object(metrics_store, 'upsert_campaigns', AsyncMock(side_effect=RuntimeError("disk full"))):
+        job = await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+
+    body = job["result"]
+    assert body["success"] is False
+    assert body["errors"] == ["Erro ao gravar 1 campanhas: disk full"]
+    assert sync_state.for_account("act_1").watermark is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_metrics_sync_upserts_daily_rows(api_client, metrics_store):
+    """Daily metrics are keyed by (account, campaign, date); re-syncing overwrites."""
+    def daily(spend: float) -> dict:
+        return {
+            "success": True,
+            "series": DailySeries.from_rows([
+                ("c1", "2026-01-01", (spend, 1000, 10, 900, 1, 50)),
+                ("c1", "2026-01-02", (5, 500, 5, 400, 0, 0)),
+                ("c2", "2026-01-02", (7, 700, 7, 600, 0, 0)),
+            ]),
+        }
+
+    listing = FakeCampaignListing({
+        "c1": "2026-01-10T12:00:00+0000",
+        "c2": "2026-01-10T12:00:00+0000",
+    })
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        with patch('app.api.sync.get_daily_insights', AsyncMock(return_value=daily(10))):
+            first = (await _sync(api_client, "/api/sync/metrics?account_ids=1"))["result"]
+        with patch('app.api.sync.get_daily_insights', AsyncMock(return_value=daily(12))):
+            await _sync(api_client, "/api/sync/metrics?account_ids=1")
+
+    assert first["metrics_synced"] == 3
+    assert first["campaigns_synced"] == 2
+
+    rows = await metrics_store.daily_metrics("act_1", campaign_id="c1")
+    assert [(str(r["date"]), r["spend"]) for r in rows] == [("2026-01-01", 12.0), ("2026-01-02", 5.0)]
+    assert len(await metrics_store.daily_metrics("act_1")) == 3
+
+
+# =============================================================================
+# Concurrent metrics sync
+# =============================================================================
+
+class FakeDailyInsights:
+    """Stands in for get_daily_insights, one series per campaign chunk."""
+
+    def __init__(self, failing: str = ""):
+        self.failing = failing
+        self.chunks = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, date_preset, campaign_ids=None, account_id=None, **kwargs):
+        self.chunks.append(list(campaign_ids))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.failing in campaign_ids:
+            return {"success": False, "error": "(#100) Invalid parameter"}
+        return {
+            "success": True,
+            "pages_fetched": 1,
+            "series": DailySeries.from_rows(
+                [(cid, "2026-01-01", (1, 100, 1, 90, 0, 0)) for cid in campaign_ids]
+            ),
+        }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_metrics_sync_fans_out_chunks_with_bounded_concurrency(api_client, metrics_store):
+    listing = FakeCampaignListing({str(i): "2026-01-10T12:00:00+0000" for i in range(25)})
+    daily = FakeDailyInsights()
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing), \
+         patch('app.api.sync.get_daily_insights', daily), \
+         patch.object(settings, 'sync_metrics_chunk_size', 2), \
+         patch.object(settings, 'sync_metrics_max_concurrency', 3):
+        job = await _sync(api_client, "/api/sync/metrics?account_ids=1")
+
+    result = job["result"]
+    assert len(daily.chunks) == 13
+    assert sorted(cid for chunk in daily.chunks for cid in chunk) == sorted(str(i) for i in range(25))
+    assert daily.peak == 3
+    assert result["metrics_synced"] == 25
+    assert result["accounts"]["act_1"]["requests"] == 13
+    assert result["wall_time"] > 0
+    assert result["requests_per_second"] > 0
+    assert len(await metrics_store.daily_metrics("act_1")) == 25
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_metrics_sync_groups_errors_by_campaign(api_client, metrics_store):
+    """A failing chunk is reported per campaign; the other chunks are still written."""
+    listing = FakeCampaignListing({cid: "2026-01-10T12:00:00+0000" for cid in ("a", "b", "bad", "c")})
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing), \
+         patch('app.api.sync.get_daily_insights', FakeDailyInsights(failing="bad")), \
+         patch.object(settings, 'sync_metrics_chunk_size', 2):
+        job = await _sync(api_client, "/api/sync/metrics?account_ids=1")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert job["status"] == "completed"
+    assert account["errors_by_campaign"] == {
+        "bad": "(#100) Invalid parameter",
+        "c": "(#100) Invalid parameter",
+    }
+    assert job["result"]["errors"] == ["2 campanha(s) sem métricas: (#100) Invalid parameter"]
+    assert account["campaigns_synced"] == 2
+    assert [r["campaign_id"] for r in await metrics_store.daily_metrics("act_1")] == ["a", "b"]
+
+
+# =============================================================================
+# Background sync jobs: progress, de-duplication, cancellation, scheduler
+# =============================================================================
+
+def _blocked_listing():
+    """A listing that yields one campaign and then hangs until released."""
+    release = asyncio.Event()
+
+    async def listing(account_id=None, **kwargs):
+        yield Campaign("1", "Campanha 1", updated_time="2026-01-10T12:00:00+0000")
+        await release.wait()
+
+    return listing, release
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sync_job_reports_pages_rows_and_api_calls(api_client, mock_settings):
+    """Progress counts Graph requests and pages made inside the job."""
+    pages = {
+        "first": {
+            "data": [{"id": "1", "name": "A"}, {"id": "2", "name": "B"}],
+            "paging": {"next": "https://graph.facebook.com/v24.0/act_1/campaigns?after=x"},
+        },
+        "second": {"data": [{"id": "3", "name": "C"}]},
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = pages["second"] if "after=x" in str(request.url) else pages["first"]
+        return httpx.Response(200, content=json.dumps(page).encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            job = await _sync(api_client, "/api/sync/campaigns?account_ids=1")
+
+    await client.aclose()
+
+    assert job["result"]["campaigns_synced"] == 3
+    assert job["progress"]["pages_fetched"] == 2
+    assert job["progress"]["api_calls"] == 2
+    assert job["progress"]["rows_written"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_same_sync_is_not_enqueued_twice(api_client):
+    listing, release = _blocked_listing()
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        first = await api_client.post("/api/sync/campaigns?account_ids=1")
+        second = await api_client.post("/api/sync/campaigns?account_ids=1")
+        other = await api_client.post("/api/sync/campaigns?account_ids=2")
+
+        assert second.json()["job_id"] == first.json()["job_id"]
+        assert other.json()["job_id"] != first.json()["job_id"]
+
+        release.set()
+        await _wait_for_job(api_client, first.json()["job_id"])
+        await _wait_for_job(api_client, other.json()["job_id"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancel_running_sync_job(api_client):
+    """A cancelled sync stops, keeps its watermark and cannot be cancelled twice."""
+    listing, _ = _blocked_listing()
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        response = await api_client.post("/api/sync/campaigns?account_ids=1")
+        job_id = response.json()["job_id"]
+        await asyncio.sleep(0.01)
+
+        cancel = await api_client.post(f"/api/sync/jobs/{job_id}/cancel")
+        job = await _wait_for_job(api_client, job_id)
+
+    assert cancel.status_code == 202
+    assert job["status"] == "cancelled"
+    assert sync_state.for_account("act_1").watermark is None
+
+    again = await api_client.post(f"/api/sync/jobs/{job_id}/cancel")
+    assert again.status_code == 409
+    assert (await api_client.post("/api/sync/jobs/unknown/cancel")).status_code == 404
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_runs_both_stages_in_one_job(api_client, metrics_store):
+    async def listing(account_id=None, **kwargs):
+        yield Campaign("c1", "Campanha 1")
+
+    daily = AsyncMock(return_value={
+        "success": True,
+        "series": DailySeries.from_rows([("c1", "2026-01-01", (10, 1000, 10, 900, 1, 50))]),
+    })
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=listing), \
+         patch('app.sync_pipeline.get_daily_insights', daily):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    assert job["kind"] == "sync_full"
+    assert job["progress"]["campaigns_listed"] == 1
+    assert job["result"]["success"] is True
+    assert job["result"]["campaigns_synced"] == 1
+    assert job["result"]["metrics_synced"] == 1
+    assert len(await metrics_store.campaigns("act_1")) == 1
+    assert len(await metrics_store.daily_metrics("act_1")) == 1
+
+    listed = await api_client.get("/api/sync/jobs?kind=sync_full")
+    assert listed.json()["jobs"][0]["job_id"] == job["job_id"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_lists_once_and_overlaps_insights(api_client, metrics_store):
+    """Insights for the first chunks are requested while the listing is still running."""
+    daily = FakeDailyInsights()
+    calls = []
+    chunks_before_listing_ended = []
+
+    async def listing(account_id=None, **kwargs):
+        calls.append(kwargs)
+        for i in range(6):
+            yield Campaign(str(i), f"Campanha {i}", updated_time="2026-01-10T12:00:00+0000")
+            await asyncio.sleep(0.02)
+        chunks_before_listing_ended.append(len(daily.chunks))
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=listing), \
+         patch('app.sync_pipeline.get_daily_insights', daily), \
+         patch.object(settings, 'sync_metrics_chunk_size', 2):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert len(calls) == 1
+    assert chunks_before_listing_ended[0] >= 2
+    assert sorted(cid for chunk in daily.chunks for cid in chunk) == [str(i) for i in range(6)]
+    assert (account["campaigns_synced"], account["metrics_synced"], account["requests"]) == (6, 6, 3)
+    assert sync_state.for_account("act_1").watermark == parse_graph_time("2026-01-10T12:00:00+0000")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_writes_only_changed_campaigns(api_client, metrics_store):
+    """After a first pass, only changed campaigns are rewritten, but all get metrics."""
+    state = sync_state.for_account("act_1")
+    state.watermark = parse_graph_time("2026-01-10T12:00:00+0000")
+    state.last_full_sync = time.time()
+    state.campaign_ids = {"old", "gone"}
+
+    listing = FakeCampaignListing({
+        "old": "2026-01-01T12:00:00+0000",
+        "new": "2026-01-20T08:00:00+0000",
+    })
+    daily = FakeDailyInsights()
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=listing), \
+         patch('app.sync_pipeline.get_daily_insights', daily):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert listing.calls == [None]
+    assert account["mode"] == "incremental"
+    assert [c["campaign_id"] for c in await metrics_store.campaigns("act_1")] == ["new"]
+    assert account["campaigns_deleted"] == ["gone"]
+    assert daily.chunks == [["old", "new"]]
+    assert account["metrics_synced"] == 2
+    assert state.campaign_ids == {"old", "new"}
+    assert state.watermark == parse_graph_time("2026-01-20T08:00:00+0000")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_interrupted_listing_keeps_state(api_client, metrics_store):
+    """A broken listing still stores what arrived, but reconciles nothing."""
+    state = sync_state.for_account("act_1")
+    state.campaign_ids = {"1", "2"}
+
+    async def broken(account_id=None, **kwargs):
+        yield Campaign("1", "Campanha 1", updated_time="2026-01-10T12:00:00+0000")
+        raise RuntimeError("Connection reset")
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=broken), \
+         patch('app.sync_pipeline.get_daily_insights', FakeDailyInsights()):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert job["status"] == "completed"
+    assert account["errors"] == ["Listagem interrompida após 1 campanhas: Connection reset"]
+    assert (account["campaigns_synced"], account["metrics_synced"]) == (1, 1)
+    assert account["campaigns_deleted"] == []
+    assert state.watermark is None
+    assert state.campaign_ids == {"1", "2"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_lists_without_page_cap_and_skips_reconcile_when_capped(api_client, metrics_store):
+    """More than 2,500 campaigns: the pipeline pages without a cap; a capped listing deletes nothing."""
+    state = sync_state.for_account("act_1")
+    state.campaign_ids = {str(i) for i in range(3000)}
+    calls = []
+
+    async def capped(account_id=None, **kwargs):
+        calls.append(kwargs)
+        for i in range(2500):
+            yield Campaign(str(i), f"Campanha {i}", updated_time="2026-01-10T12:00:00+0000")
+        raise MetaListingTruncated(50)
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=capped), \
+         patch('app.sync_pipeline.get_daily_insights', FakeDailyInsights()), \
+         patch.object(settings, 'sync_metrics_chunk_size', 500):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    account = job["result"]["accounts"]["act_1"]
+    assert calls == [{"max_pages": None}]
+    assert account["total"] == 2500
+    assert account["campaigns_deleted"] == []
+    assert len(state.campaign_ids) == 3000
+    assert state.watermark is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_sync_fails_when_listing_fails(api_client):
+    async def broken(account_id=None, **kwargs):
+        raise RuntimeError("(#190) Invalid OAuth access token")
+        yield
+
+    with patch('app.sync_pipeline.iter_campaigns', side_effect=broken):
+        job = await _sync(api_client, "/api/sync/full?account_ids=1")
+
+    assert job["status"] == "failed"
+    assert job["error"] == "(#190) Invalid OAuth access token"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scheduler_skips_a_round_while_the_last_job_runs(api_client):
+    listing, release = _blocked_listing()
+    scheduler = SyncScheduler()
+    scheduler.every("campaigns", 60, lambda: start_campaign_sync("1"))
+    scheduler.every("metrics", 0, lambda: start_metrics_sync())
+
+    with patch('app.api.sync.iter_campaigns', side_effect=listing):
+        job = scheduler.run_once("campaigns")
+        assert scheduler.run_once("campaigns") is None
+
+        release.set()
+        await _wait_for_job(api_client, job.id)
+        assert scheduler.run_once("campaigns") is not None
+        await _wait_for_job(api_client, scheduler.stats()["campaigns"]["last_job_id"])
+
+    stats = scheduler.stats()
+    assert set(stats) == {"campaigns"}
+    assert (stats["campaigns"]["runs"], stats["campaigns"]["skipped"]) == (2, 1)
@@ -0,0 +1,156 @@
+"""
+Unit tests for multi-account fan-out (app.tools.meta_accounts) and the
+per-account limits applied by app.tools.meta_client.send.
+
+Run tests:
+    pytest backend/tests/test_meta_accounts.py -v
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.tools import meta_client
+from app.tools.meta_accounts import fan_out, parse_accounts
+from app.tools.meta_client import account_scope, scoped_account, send
+from app.tools.meta_rate_limit import rate_limiters
+from app.tools.meta_api import list_campaigns
+
+
+@pytest.mark.unit
+def test_parse_accounts_normalizes_and_dedupes():
+    """IDs get the act_ prefix, blanks are dropped and order is kept."""
+    assert parse_accounts(" 123, act_456 ,,123") == ["act_123", "act_456"]
+    assert parse_accounts(["act_1", "2"]) == ["act_1", "act_2"]
+
+
+@pytest.mark.unit
+def test_account_scope_is_restored():
+    """account_scope only applies inside its block."""
+    assert scoped_account() is None
+
+    with account_scope("42"):
+        assert scoped_account() == "act_42"
+
+    assert scoped_account() is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fan_out_runs_accounts_concurrently_in_their_own_scope():
+    """Each account sees its own scope and one failure does not stop the rest."""
+    running = 0
+    peak = 0
+
+    async def call(account_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+        assert scoped_account() == account_id
+        if account_id == "act_2":
+            raise RuntimeError("token expirado")
+        return {"success": True, "account": account_id}
+
+    results = await fan_out(call, ["1", "2", "3", "4"], max_concurrency=2)
+
+    assert list(results) == ["act_1", "act_2", "act_3", "act_4"]
+    assert results["act_1"] == {"success": True, "account": "act_1"}
+    assert results["act_2"] == {"success": False, "error": "token expirado"}
+    assert peak == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_account_level_calls_use_the_requested_account(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """list_campaigns(account_id=...) reads that account, explicitly or via the scope."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(json_data=mock_meta_campaigns_response)
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            await list_campaigns(account_id="777")
+            with account_scope("888"):
+                await list_campaigns()
+
+            urls = [call.args[0] for call in mock_async_client.get.call_args_list]
+            assert urls[0].endswith("/act_777/campaigns")
+            assert urls[1].endswith("/act_888/campaigns")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_throttled_account_does_not_slow_other_accounts(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """Pacing is per account: an account at 100% usage leaves others alone."""
+    rate_limiters.for_account("act_noisy").usage_pct = 100
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(json_data=mock_meta_campaigns_response)
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            with patch('app.tools.meta_rate_limit.asyncio.sleep', new_callable=AsyncMock) as sleep:
+                for _ in range(3):
+                    result = await list_campaigns(account_id="act_quiet")
+                    assert result['success'] is True
+
+                sleep.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_requests_in_flight_are_capped_per_account():
+    """A busy account is held to meta_account_max_concurrency; others still get through."""
+    in_flight = {}
+    peak = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        account = request.url.path.split("/")[-1]
+        in_flight[account] = in_flight.get(account, 0) + 1
+        peak[account] = max(peak.get(account, 0), in_flight[account])
+        await asyncio.sleep(0.01)
+        in_flight[account] -= 1
+        return httpx.Response(200, content=json.dumps({"id": account}).encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch.object(meta_client.settings, 'meta_account_max_concurrency', 3):
+        await asyncio.gather(
+            *(send(client, "get", "https://graph.test/act_busy", "act_busy") for _ in range(12)),
+            send(client, "get", "https://graph.test/act_other", "act_other"),
+        )
+
+    await client.aclose()
+
+    assert peak["act_busy"] == 3
+    assert peak["act_other"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unprefixed_account_setting_shares_one_limiter_and_breaker():
+    """Calls without an account use the act_ key, like the reads in meta_api."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+
+    with patch.object(meta_client.settings, 'meta_ad_account_id', "123456789"):
+        await send(client, "post", "https://graph.test/1")
+        await send(client, "get", "https://graph.test/2", "act_123456789")
+
+    await client.aclose()
+
+    assert list(rate_limiters.stats()) == ["act_123456789"]
+    assert list(meta_client.breakers.stats()) == ["act_123456789"]
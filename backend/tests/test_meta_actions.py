@@ -0,0 +1,119 @@
+"""
+Unit tests for conversion/revenue extraction (app.tools.meta_actions).
+
+Run tests:
+    pytest backend/tests/test_meta_actions.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.tools.meta_actions import ActionExtractor, extractor_for
+from app.tools.meta_client import account_scope
+from app.tools.meta_records import InsightRow
+
+
+def make_row(spend: str, purchases: str, leads: str, revenue: str) -> dict:
+    return {
+        "campaign_id": "c1",
+        "spend": spend,
+        "actions": [
+            {"action_type": "purchase", "value": purchases},
+            {"action_type": "lead", "value": leads},
+            {"action_type": "link_click", "value": "99"},
+        ],
+        "action_values": [{"action_type": "purchase", "value": revenue}],
+    }
+
+
+@pytest.fixture
+def action_settings(mock_settings):
+    mock_settings.meta_conversion_mapping = (
+        '{"999": {"conversions": "lead, complete_registration", "revenue": ""}}'
+    )
+    with patch('app.tools.meta_actions.settings', mock_settings):
+        yield mock_settings
+
+
+@pytest.mark.unit
+def test_extract_returns_aligned_columns():
+    """One pass over a page yields conversions, revenue and ROAS per row."""
+    extractor = ActionExtractor(["purchase"], ["purchase"])
+    rows = [
+        make_row("50.00", "3", "7", "150.00"),
+        {"spend": "10.00"},
+        make_row("0", "1", "0", "20.00"),
+    ]
+
+    conversions, revenue, roas = extractor.extract(rows)
+
+    assert list(conversions) == [3.0, 0.0, 1.0]
+    assert list(revenue) == [150.0, 0.0, 20.0]
+    # No spend: ROAS stays 0 instead of dividing by zero
+    assert list(roas) == [3.0, 0.0, 0.0]
+
+
+@pytest.mark.unit
+def test_from_rows_matches_from_graph():
+    """Batch conversion gives the same records as row-by-row conversion."""
+    extractor = ActionExtractor(["purchase", "lead"], ["purchase"])
+    rows = [make_row("40", str(i), "1", f"{i * 10}.5") for i in range(5)]
+
+    batch = InsightRow.from_rows(rows, "spend,actions,action_values", "campaign", extractor)
+    single = [InsightRow.from_graph(row, "spend,actions,action_values", "campaign", extractor) for row in rows]
+
+    assert batch == single
+    assert batch[2].conversions == 3
+    assert batch[2].cpc is None
+
+
+@pytest.mark.unit
+def test_extractor_is_compiled_once_per_mapping(action_settings):
+    """Accounts sharing a mapping share the same compiled extractor."""
+    default = extractor_for("act_123")
+
+    assert extractor_for("123") is default
+    assert extractor_for("act_456") is default
+    assert default.conversion_actions == {"purchase", "omni_purchase", "add_to_cart"}
+
+
+@pytest.mark.unit
+def test_extractor_for_does_not_reparse_settings(action_settings):
+    """Repeated lookups hit the cache keyed on the raw settings strings."""
+    lead_account = extractor_for("act_999")
+
+    with patch('app.tools.meta_actions._action_types', side_effect=AssertionError("re-parsed")), \
+         patch('app.tools.meta_actions.json.loads', side_effect=AssertionError("re-parsed")):
+        assert extractor_for("999") is lead_account
+        assert extractor_for("act_999") is lead_account
+
+    action_settings.meta_conversion_actions = "purchase"
+    assert extractor_for("act_123").conversion_actions == {"purchase"}
+
+
+@pytest.mark.unit
+def test_per_account_mapping_overrides_defaults(action_settings):
+    """meta_conversion_mapping changes what counts for one account only."""
+    row = make_row("25.00", "3", "7", "150.00")
+
+    lead_account = InsightRow.from_graph(row, extractor=extractor_for("act_999"))
+    shop_account = InsightRow.from_graph(row, extractor=extractor_for("act_123"))
+
+    assert (lead_account.conversions, lead_account.revenue, lead_account.roas) == (7, 0.0, 0.0)
+    assert (shop_account.conversions, shop_account.revenue, shop_account.roas) == (3, 150.0, 6.0)
+
+
+@pytest.mark.unit
+def test_extractor_follows_account_scope(action_settings):
+    """Without an explicit account, the scoped account's mapping is used."""
+    with account_scope("999"):
+        assert extractor_for().conversion_actions == {"lead", "complete_registration"}
+
+    assert "purchase" in extractor_for().conversion_actions
+
+
+@pytest.mark.unit
+def test_invalid_mapping_falls_back_to_defaults(action_settings):
+    action_settings.meta_conversion_mapping = "{not json"
+
+    assert extractor_for("act_999").conversion_actions == {"purchase", "omni_purchase", "add_to_cart"}
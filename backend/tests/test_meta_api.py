@@ -15,16 +15,30 @@ Run with coverage:
     pytest backend/tests/test_meta_api.py --cov=app.tools.meta_api --cov-report=term
 """
 
+import json
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 import httpx
+from urllib.parse import parse_qs
 
+from app.tools import meta_client
 from app.tools.meta_api import (
     list_campaigns,
     get_campaign_insights,
     duplicate_campaign,
     create_campaign,
     update_campaign_status,
+    get_campaign_insights_batch,
+    get_account_insights_by_object,
+    graph_batch,
+    update_campaigns_status,
+    copy_campaign_in_chunks,
+    iter_campaigns,
+    run_insights_report,
+    resolve_fields,
+    FIELD_PROFILES,
+    MetaAPIError,
+    MetaListingTruncated,
     _get_auth_headers,
 )
 
@@ -74,9 +88,9 @@ async def test_list_campaigns_success(
 
             # Assert: Verify campaign data
             first_campaign = result['campaigns'][0]
-            assert first_campaign['id'] == "123456789"
-            assert first_campaign['name'] == "Test Campaign"
-            assert first_campaign['status'] == "ACTIVE"
+            assert first_campaign.id == "123456789"
+            assert first_campaign.name == "Test Campaign"
+            assert first_campaign.status == "ACTIVE"
 
             # Assert: Verify API call was made correctly
             mock_async_client.get.assert_called_once()
@@ -128,7 +142,7 @@ async def test_list_campaigns_with_status_filter(
             # Assert
             assert result['success'] is True
             assert len(result['campaigns']) == 1
-            assert result['campaigns'][0]['status'] == "ACTIVE"
+            assert result['campaigns'][0].status == "ACTIVE"
 
             # Verify filtering parameter was sent
             call_args = mock_async_client.get.call_args
@@ -164,7 +178,7 @@ async def test_list_campaigns_exclude_drafts(
 
             # Verify no PREVIEW campaigns
             for campaign in result['campaigns']:
-                assert campaign.get('effective_status') != 'PREVIEW'
+                assert campaign.effective_status != 'PREVIEW'
 
 
 @pytest.mark.unit
@@ -303,11 +317,13 @@ async def test_get_insights_success(
 
             # Verify metrics
             insights = result['insights']
-            assert insights['impressions'] == 10000
-            assert insights['clicks'] == 500
-            assert insights['spend'] == 250.50
-            assert insights['ctr'] == 5.0
-            assert insights['conversions'] == 50
+            assert insights.impressions == 10000
+            assert insights.clicks == 500
+            assert insights.spend == 250.50
+            assert insights.ctr == 5.0
+            assert insights.conversions == 50
+            assert insights.revenue == 1002.0
+            assert insights.roas == pytest.approx(4.0)
 
             # Verify API call
             call_args = mock_async_client.get.call_args
@@ -374,9 +390,9 @@ async def test_get_insights_empty_data(
             # Assert
             assert result['success'] is True
             # Should return zeros for all metrics
-            assert result['insights']['impressions'] == 0
-            assert result['insights']['clicks'] == 0
-            assert result['insights']['spend'] == 0.0
+            assert result['insights'].impressions == 0
+            assert result['insights'].clicks == 0
+            assert result['insights'].spend == 0.0
 
 
 @pytest.mark.unit
@@ -553,6 +569,948 @@ async def test_duplicate_campaign_timeout(mock_settings):
             assert 'Timeout' in result['error'] or 'timeout' in result['error'].lower()
 
 
+# =============================================================================
+# TDD CYCLE 4: Graph API /batch requests
+# =============================================================================
+
+def _batch_item(body: dict, code: int = 200) -> dict:
+    """Build one sub-response as returned by the Graph /batch endpoint."""
+    return {"code": code, "body": json.dumps(body)}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_batch_chunks_fifty_per_request(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 4 - RED Phase
+
+    120 campaigns must be fetched in 3 /batch calls (50 + 50 + 20).
+    """
+    campaign_ids = [f"camp_{i}" for i in range(120)]
+
+    def batch_response(url, data, **kwargs):
+        chunk = json.loads(data["batch"])
+        return mock_httpx_response(
+            json_data=[_batch_item(mock_meta_insights_response) for _ in chunk]
+        )
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.side_effect = batch_response
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            result = await get_campaign_insights_batch(campaign_ids, "last_7d")
+
+            # Assert: 3 HTTP round trips, one result per campaign
+            assert mock_async_client.post.call_count == 3
+            assert result['success'] is True
+            assert result['batch_requests'] == 3
+            assert len(result['results']) == 120
+
+            # Same shape as get_campaign_insights
+            first = result['results']['camp_0']
+            assert first['success'] is True
+            assert first['period'] == "last_7d"
+            assert first['insights'].impressions == 10000
+            assert first['insights'].spend == 250.50
+
+            # Sub-requests point at each campaign's insights edge
+            sizes = []
+            for call in mock_async_client.post.call_args_list:
+                chunk = json.loads(call[1]['data']['batch'])
+                sizes.append(len(chunk))
+                assert chunk[0]['method'] == "GET"
+                assert '/insights?' in chunk[0]['relative_url']
+                assert 'date_preset=last_7d' in chunk[0]['relative_url']
+                assert call[1]['headers']['Authorization'] == 'Bearer test_token_123'
+            assert sorted(sizes) == [20, 50, 50]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_batch_maps_partial_failures(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_meta_error_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 4 - GREEN Phase
+
+    A failed or missing sub-response only affects its own campaign.
+    """
+    batch_body = [
+        _batch_item(mock_meta_insights_response),
+        _batch_item(mock_meta_error_response, code=400),
+        None,  # Meta returns null for sub-requests that timed out
+    ]
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.return_value = mock_httpx_response(json_data=batch_body)
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            result = await get_campaign_insights_batch(["ok", "bad", "late"])
+
+            # Assert
+            results = result['results']
+            assert results['ok']['success'] is True
+            assert results['bad']['success'] is False
+            assert 'Invalid OAuth' in results['bad']['error']
+            assert results['late']['success'] is False
+            assert 'timeout' in results['late']['error'].lower()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_graph_batch_whole_chunk_error(
+    mock_settings,
+    mock_meta_rate_limit_error,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 4 - Edge Case
+
+    An error for the whole /batch call is reported on every operation.
+    """
+    operations = [
+        {"method": "POST", "relative_url": "1", "body": {"status": "PAUSED"}},
+        {"method": "POST", "relative_url": "2", "body": {"status": "PAUSED"}},
+    ]
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.return_value = mock_httpx_response(
+                json_data=mock_meta_rate_limit_error
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            results = await graph_batch(operations)
+
+            # Assert
+            assert len(results) == 2
+            assert all(r['success'] is False for r in results)
+            assert all(r['error_code'] == 80004 for r in results)
+
+
+# =============================================================================
+# TDD CYCLE 5: get_account_insights_by_object() - level=campaign fan-in
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_by_object_walks_all_pages(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 5 - RED Phase
+
+    All pages of /act_x/insights?level=campaign are merged, keyed by ID.
+    """
+    page1 = {
+        "data": [
+            {
+                "campaign_id": "1",
+                "campaign_name": "Campaign 1",
+                "spend": "100.0",
+                "impressions": "1000",
+                "clicks": "20",
+                "ctr": "2.0",
+                "actions": [{"action_type": "purchase", "value": "4"}],
+                "action_values": [{"action_type": "purchase", "value": "300.0"}],
+            },
+        ],
+        "paging": {"next": "https://graph.facebook.com/v24.0/next_insights_page"},
+    }
+    page2 = {
+        "data": [
+            {"campaign_id": "2", "campaign_name": "Campaign 2", "spend": "50.0", "ctr": "0.4"},
+        ],
+        "paging": {},
+    }
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=page1),
+                mock_httpx_response(json_data=page2),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            result = await get_account_insights_by_object("campaign", "last_7d", status="ACTIVE")
+
+            # Assert
+            assert result['success'] is True
+            assert result['pages_fetched'] == 2
+            assert set(result['insights']) == {"1", "2"}
+
+            first = result['insights']["1"]
+            assert first.name == "Campaign 1"
+            assert first.conversions == 4
+            assert first.revenue == 300.0
+            assert first.roas == 3.0
+            assert result['insights']["2"].ctr == 0.4
+
+            # Verify request: account-level edge, level and status filter
+            first_call = mock_async_client.get.call_args_list[0]
+            assert 'act_123456789/insights' in first_call[0][0]
+            params = first_call[1]['params']
+            assert params['level'] == "campaign"
+            assert 'campaign_id' in params['fields']
+            assert 'campaign.effective_status' in params['filtering']
+
+            # Next page keeps the Authorization header
+            second_call = mock_async_client.get.call_args_list[1]
+            assert second_call[0][0].endswith("next_insights_page")
+            assert 'Authorization' in second_call[1]['headers']
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_by_object_page_error(
+    mock_settings,
+    mock_meta_error_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 5 - Edge Case
+
+    An error on any page fails the call instead of returning partial data.
+    """
+    page1 = {
+        "data": [{"campaign_id": "1", "spend": "1.0"}],
+        "paging": {"next": "https://graph.facebook.com/v24.0/next"},
+    }
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=page1),
+                mock_httpx_response(json_data=mock_meta_error_response),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await get_account_insights_by_object("campaign")
+
+            assert result['success'] is False
+            assert 'Invalid OAuth' in result['error']
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_by_object_invalid_level(mock_settings):
+    """
+    TDD CYCLE 5 - Validation
+
+    Only campaign, adset and ad produce one row per object.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        result = await get_account_insights_by_object("account")
+
+        assert result['success'] is False
+        assert 'level' in result['error']
+
+
+# =============================================================================
+# TDD CYCLE 6: iter_campaigns() - Streaming pagination
+# =============================================================================
+
+def _campaign_page(start: int, size: int, has_next: bool = True) -> dict:
+    """Build one page of /campaigns with sequential IDs."""
+    page = {
+        "data": [
+            {"id": str(i), "name": f"Campaign {i}", "status": "ACTIVE", "effective_status": "ACTIVE"}
+            for i in range(start, start + size)
+        ],
+        "paging": {},
+    }
+    if has_next:
+        page["paging"]["next"] = f"https://graph.facebook.com/v24.0/page_{start + size}"
+    return page
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_stops_at_limit(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - RED Phase
+
+    Once the caller's limit is met, no further pages are requested.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=_campaign_page(0, 5)),
+                mock_httpx_response(json_data=_campaign_page(5, 5)),
+                mock_httpx_response(json_data=_campaign_page(10, 5)),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            ids = [c.id async for c in iter_campaigns(limit=7, page_size=5)]
+
+            # Assert: 2 pages were enough for 7 campaigns
+            assert ids == [str(i) for i in range(7)]
+            assert mock_async_client.get.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_break_stops_paging(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - GREEN Phase
+
+    Breaking out of the loop early does not fetch the next page.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=_campaign_page(0, 3)),
+                mock_httpx_response(json_data=_campaign_page(3, 3)),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            async for campaign in iter_campaigns():
+                if campaign.id == "1":
+                    break
+
+            assert mock_async_client.get.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_skips_drafts(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - REFACTOR Phase
+
+    include_drafts=False filters drafts without counting them toward limit.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=mock_meta_campaigns_response
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            campaigns = [c async for c in iter_campaigns(include_drafts=False)]
+
+            assert len(campaigns) == 2
+            assert all(c.effective_status != "PREVIEW" for c in campaigns)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_pages_past_the_cap_without_max_pages(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - Page cap
+
+    3,000 campaigns (60 pages of 50) are all listed with max_pages=None;
+    with the default cap the listing raises instead of stopping at 2,500.
+    """
+    pages = [mock_httpx_response(json_data=_campaign_page(i, 50, has_next=i < 2950)) for i in range(0, 3000, 50)]
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = list(pages)
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            ids = [c.id async for c in iter_campaigns(max_pages=None)]
+
+            assert len(ids) == 3000
+            assert mock_async_client.get.call_count == 60
+
+            mock_async_client.get.side_effect = list(pages)
+            listed = []
+            with pytest.raises(MetaListingTruncated):
+                async for campaign in iter_campaigns():
+                    listed.append(campaign.id)
+
+            assert len(listed) == 2500
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_raises_meta_error(
+    mock_settings,
+    mock_meta_error_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - Error Handling
+
+    Graph API errors surface as MetaAPIError with the Meta error code.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=mock_meta_error_response
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            with pytest.raises(MetaAPIError) as exc_info:
+                async for _ in iter_campaigns():
+                    pass
+
+            assert exc_info.value.code == 190
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_campaigns_limit_stops_paging(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - Regression
+
+    list_campaigns(limit=5) no longer downloads every page of the account.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=_campaign_page(0, 5)),
+                mock_httpx_response(json_data=_campaign_page(5, 5)),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await list_campaigns(limit=5)
+
+            assert result['success'] is True
+            assert result['total'] == 5
+            assert result['pages_fetched'] == 1
+            assert result['has_more'] is True
+            assert mock_async_client.get.call_count == 1
+            assert mock_async_client.get.call_args[1]['params']['limit'] == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_filters_on_updated_time(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 6 - Incremental sync
+
+    updated_since becomes an updated_time filter next to the status filter.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=_campaign_page(0, 2, has_next=False)
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            campaigns = [c async for c in iter_campaigns(status="ACTIVE", updated_since=1768478400)]
+
+            assert len(campaigns) == 2
+            filtering = json.loads(mock_async_client.get.call_args[1]['params']['filtering'])
+            assert filtering == [
+                {"field": "effective_status", "operator": "IN", "value": ["ACTIVE"]},
+                {"field": "updated_time", "operator": "GREATER_THAN", "value": 1768478400},
+            ]
+
+
+# =============================================================================
+# TDD CYCLE 7: run_insights_report() - Async report runs
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_report_polls_with_backoff_and_streams_rows(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 7 - RED Phase
+
+    Create the report run, poll until "Job Completed" with growing waits,
+    then read every result page.
+    """
+    progress = []
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.return_value = mock_httpx_response(
+                json_data={"report_run_id": "run_42"}
+            )
+            mock_async_client.get.side_effect = [
+                # Polling
+                mock_httpx_response(json_data={"async_status": "Job Started", "async_percent_completion": 0}),
+                mock_httpx_response(json_data={"async_status": "Job Running", "async_percent_completion": 60}),
+                mock_httpx_response(json_data={"async_status": "Job Completed", "async_percent_completion": 100}),
+                # Result pages
+                mock_httpx_response(json_data={
+                    "data": [{"ad_id": "a1", "ad_name": "Ad 1", "spend": "10.0"}],
+                    "paging": {"next": "https://graph.facebook.com/v24.0/run_42/insights?after=x"},
+                }),
+                mock_httpx_response(json_data={
+                    "data": [{"ad_id": "a2", "ad_name": "Ad 2", "spend": "5.0"}],
+                }),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            with patch('app.tools.meta_api.asyncio.sleep', new_callable=AsyncMock) as sleep:
+                result = await run_insights_report("ad", "last_30d", on_progress=progress.append)
+
+            # Assert: report created with a POST on the account insights edge
+            post_call = mock_async_client.post.call_args
+            assert 'act_123456789/insights' in post_call[0][0]
+            assert post_call[1]['data']['level'] == "ad"
+
+            # Polling backed off between checks
+            waits = [call.args[0] for call in sleep.call_args_list]
+            assert waits == [1.0, 2.0]
+
+            # Rows from both pages, keyed by ad ID
+            assert result['success'] is True
+            assert result['report_run_id'] == "run_42"
+            assert set(result['insights']) == {"a1", "a2"}
+            assert result['insights']["a1"].spend == 10.0
+
+            assert {"stage": "running", "percent": 60, "rows": 0} in progress
+            assert progress[-1] == {"stage": "completed", "percent": 100, "rows": 2}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_report_job_failed(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 7 - Error Handling
+
+    A report that ends as "Job Failed" returns success=False.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.return_value = mock_httpx_response(
+                json_data={"report_run_id": "run_1"}
+            )
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data={"async_status": "Job Failed", "async_percent_completion": 10}
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await run_insights_report("campaign")
+
+            assert result['success'] is False
+            assert 'Job Failed' in result['error']
+
+
+# =============================================================================
+# TDD CYCLE 8: Field projection profiles
+# =============================================================================
+
+@pytest.mark.unit
+def test_resolve_fields_profiles_and_lists():
+    """
+    TDD CYCLE 8 - RED Phase
+
+    Profiles resolve to their field strings, explicit lists pass through
+    and None keeps the full (original) field set.
+    """
+    assert resolve_fields("campaign") == FIELD_PROFILES["campaign"]["full"]
+    assert resolve_fields("campaign", "minimal") == "id,name,status,effective_status"
+    assert resolve_fields("campaign", ["id", "name"]) == "id,name"
+    assert resolve_fields("campaign", "id, name") == "id,name"
+
+    # Dashboard details skip the heavy targeting/creative blobs
+    dashboard = resolve_fields("campaign_details", "dashboard")
+    assert "targeting" not in dashboard
+    assert "creative" not in dashboard
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_campaigns_requests_projected_fields(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 8 - GREEN Phase
+
+    The requested profile is sent to Meta as the fields parameter.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=mock_meta_campaigns_response
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await list_campaigns(fields="minimal")
+
+            assert result['success'] is True
+            params = mock_async_client.get.call_args[1]['params']
+            assert params['fields'] == "id,name,status,effective_status"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_campaign_insights_only_returns_requested_metrics(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 8 - REFACTOR Phase
+
+    Metrics that were not requested are left unset, not sent back as zeros.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=mock_meta_insights_response
+            )
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await get_campaign_insights("123", fields="minimal")
+
+            params = mock_async_client.get.call_args[1]['params']
+            assert params['fields'] == "impressions,clicks,spend"
+            assert result['insights'].cpc is None
+            assert result['insights'].to_dict() == {
+                "impressions": 10000,
+                "clicks": 500,
+                "spend": 250.50,
+            }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_insights_by_object_keeps_key_fields_with_projection(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 8 - Edge Case
+
+    Object ID/name are always requested; derived metrics (roas) follow
+    their source field (action_values).
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(json_data={
+                "data": [{
+                    "campaign_id": "c1",
+                    "campaign_name": "Camp 1",
+                    "spend": "20.0",
+                    "action_values": [{"action_type": "purchase", "value": "60.0"}],
+                }]
+            })
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await get_account_insights_by_object(
+                "campaign", fields=["spend", "action_values"]
+            )
+
+            params = mock_async_client.get.call_args[1]['params']
+            assert params['fields'] == "campaign_id,campaign_name,spend,action_values"
+            assert result['insights']["c1"].to_dict() == {
+                "object_id": "c1",
+                "name": "Camp 1",
+                "spend": 20.0,
+                "revenue": 60.0,
+                "roas": 3.0,
+            }
+
+
+# =============================================================================
+# TDD CYCLE 9: update_campaigns_status() - Bulk status writes
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_status_reports_per_campaign(
+    mock_settings,
+    mock_meta_error_response,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 9 - RED Phase
+
+    80 campaigns are paused in 2 /batch calls and each ID gets its own result.
+    """
+    campaign_ids = [str(i) for i in range(80)]
+
+    def batch_response(url, data, **kwargs):
+        chunk = json.loads(data["batch"])
+        return mock_httpx_response(json_data=[
+            _batch_item(mock_meta_error_response, code=400)
+            if op["relative_url"] == "7" else _batch_item({"success": True})
+            for op in chunk
+        ])
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.side_effect = batch_response
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act (duplicated IDs are sent once)
+            result = await update_campaigns_status(campaign_ids + ["1"], "PAUSED")
+
+            # Assert
+            assert mock_async_client.post.call_count == 2
+            assert result['batch_requests'] == 2
+            assert result['total'] == 80
+            assert result['updated'] == 79
+            assert result['failed'] == 1
+            assert result['success'] is False
+            assert result['results']['0'] == {"success": True}
+            assert result['results']['7']['success'] is False
+            assert 'Invalid OAuth' in result['results']['7']['error']
+
+            chunk = json.loads(mock_async_client.post.call_args_list[0][1]['data']['batch'])
+            assert chunk[0] == {"method": "POST", "relative_url": "0", "body": "status=PAUSED"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_graph_batch_bounds_concurrent_chunks(
+    mock_settings,
+    mock_httpx_response,
+):
+    """
+    TDD CYCLE 9 - GREEN Phase
+
+    No more than max_concurrency /batch calls are in flight at once.
+    """
+    import asyncio
+
+    in_flight = 0
+    peak = 0
+
+    async def batch_response(url, data, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        chunk = json.loads(data["batch"])
+        return mock_httpx_response(json_data=[_batch_item({"success": True}) for _ in chunk])
+
+    operations = [
+        {"method": "POST", "relative_url": str(i), "body": {"status": "PAUSED"}}
+        for i in range(500)
+    ]
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.side_effect = batch_response
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # Act
+            results = await graph_batch(operations, max_concurrency=3)
+
+            # Assert
+            assert mock_async_client.post.call_count == 10
+            assert peak == 3
+            assert all(r['success'] for r in results)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_status_requires_ids(mock_settings):
+    """
+    TDD CYCLE 9 - Edge Case
+
+    An empty list fails without calling the API.
+    """
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            result = await update_campaigns_status([], "PAUSED")
+
+            assert result['success'] is False
+            assert 'error' in result
+            mock_client.assert_not_called()
+
+
+# =============================================================================
+# TDD CYCLE 10: copy_campaign_in_chunks() - Chunked deep copy
+# =============================================================================
+
+class FakeCopyGraph:
+    """
+    Minimal Graph API for /copies: campaign c1 has ad sets a1 (small),
+    a2 (too large for one copy, ads x1/x2) and a3 (fails while `broken`).
+    """
+
+    def __init__(self, too_large_error: dict):
+        self.too_large_error = too_large_error
+        self.broken = {"a3"}
+        self.copies = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rsplit("/", 2)[-2:]
+
+        if request.method == "GET":
+            children = {"adsets": ["a1", "a2", "a3"], "ads": ["x1", "x2"]}[path[1]]
+            return self._json({"data": [{"id": i} for i in children]})
+
+        source = path[0]
+        form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        self.copies.append((source, form))
+
+        if source in self.broken:
+            return self._json({"error": {"message": "Temporary failure", "code": 2}})
+        if source == "a2" and form.get("deep_copy") == "true":
+            return self._json(self.too_large_error)
+        if source == "c1":
+            return self._json({"copied_campaign_id": "new_c1"})
+        if source.startswith("a"):
+            ads = [{"ad_object_type": "ad", "source_id": f"{source}_ad", "copied_id": f"new_{source}_ad"}]
+            return self._json({"copied_adset_id": f"new_{source}", "ad_object_ids": ads})
+        return self._json({"copied_ad_id": f"new_{source}"})
+
+    @staticmethod
+    def _json(body: dict) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chunked_copy_splits_large_adsets(
+    mock_settings,
+    mock_meta_duplicate_error_large_request,
+):
+    """
+    TDD CYCLE 10 - RED Phase
+
+    The campaign is copied empty, ad sets are copied into it, and an ad set
+    that is too large is copied empty with its ads copied one by one.
+    """
+    graph = FakeCopyGraph(mock_meta_duplicate_error_large_request)
+    graph.broken = set()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+    progress = {}
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            result = await copy_campaign_in_chunks("c1", on_progress=progress.update)
+
+    await client.aclose()
+
+    assert result['success'] is True
+    assert result['campaign_id'] == "new_c1"
+    assert result['adsets_copied'] == 3
+    # a1 and a3 ads come from the deep copy, x1/x2 were copied one by one
+    assert result['ads_copied'] == 4
+    assert result['checkpoint']['ads']['x1'] == "new_x1"
+
+    copies = dict((source, form) for source, form in graph.copies if source != "a2")
+    assert copies["c1"]["deep_copy"] == "false"
+    assert copies["c1"]["rename_suffix"] == "- Cópia"
+    assert copies["a1"] == {"campaign_id": "new_c1", "deep_copy": "true", "status_option": "PAUSED"}
+    assert copies["x1"] == {"adset_id": "new_a2", "status_option": "PAUSED"}
+    assert progress["stage"] == "completed"
+    assert progress["adsets_copied"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chunked_copy_resumes_from_checkpoint(
+    mock_settings,
+    mock_meta_duplicate_error_large_request,
+):
+    """
+    TDD CYCLE 10 - GREEN Phase
+
+    A failed ad set is reported, and resuming with the checkpoint copies
+    only what is missing.
+    """
+    graph = FakeCopyGraph(mock_meta_duplicate_error_large_request)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            first = await copy_campaign_in_chunks("c1")
+
+            assert first['success'] is False
+            assert list(first['failed']) == ["a3"]
+
+            graph.broken = set()
+            graph.copies.clear()
+            second = await copy_campaign_in_chunks("c1", checkpoint=first['checkpoint'])
+
+    await client.aclose()
+
+    assert second['success'] is True
+    assert second['campaign_id'] == "new_c1"
+    assert second['adsets_copied'] == 3
+    assert [source for source, _ in graph.copies] == ["a3"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chunked_copy_stops_when_campaign_copy_fails(
+    mock_settings,
+    mock_meta_duplicate_error_large_request,
+):
+    """
+    TDD CYCLE 10 - Error Handling
+
+    If the campaign itself cannot be copied, nothing else is attempted.
+    """
+    graph = FakeCopyGraph(mock_meta_duplicate_error_large_request)
+    graph.broken = {"c1"}
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            result = await copy_campaign_in_chunks("c1")
+
+    await client.aclose()
+
+    assert result['success'] is False
+    assert result['error_code'] == 2
+    assert result['checkpoint']['campaign_id'] is None
+    assert [source for source, _ in graph.copies] == ["c1"]
+
+
 # =============================================================================
 # Helper Function Tests
 # =============================================================================
@@ -0,0 +1,116 @@
+"""
+Unit tests for breakdown insights (app.tools.meta_breakdowns) and their
+streaming ingestion in meta_api.
+
+Run tests:
+    pytest backend/tests/test_meta_breakdowns.py -v
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+import httpx
+
+from app.tools import meta_client
+from app.tools.meta_breakdowns import BreakdownStore, resolve_breakdowns
+from app.tools.meta_records import InsightRow
+from app.tools.meta_api import get_breakdown_insights
+
+
+@pytest.mark.unit
+def test_resolve_breakdowns_expands_aliases():
+    """Aliases expand to Graph breakdowns without duplicates."""
+    assert resolve_breakdowns("placement") == ("publisher_platform", "platform_position")
+    assert resolve_breakdowns(["demographic", "age"]) == ("age", "gender")
+
+    with pytest.raises(ValueError):
+        resolve_breakdowns("favorite_color")
+
+
+@pytest.mark.unit
+def test_store_interns_dimension_values():
+    """Repeated dimension values are stored once; rows keep only codes."""
+    store = BreakdownStore(("age", "gender"))
+    for i in range(1000):
+        store.add("c1", {"age": "25-34", "gender": "female" if i % 2 else "male"}, InsightRow(spend=1.0))
+
+    assert len(store) == 1000
+    assert store.values("age") == ["25-34"]
+    assert sorted(store.values("gender")) == ["female", "male"]
+    # 3 code columns (4 bytes) + 5 metric columns (8 bytes) per row
+    assert store.nbytes() == 1000 * (3 * 4 + 5 * 8)
+
+
+@pytest.mark.unit
+def test_store_query_groups_and_filters():
+    """query() aggregates by any subset of dimensions, sorted by spend."""
+    store = BreakdownStore(("age", "gender"))
+    store.add("c1", {"age": "18-24", "gender": "male"}, InsightRow(spend=10, impressions=1000, clicks=20))
+    store.add("c1", {"age": "18-24", "gender": "female"}, InsightRow(spend=30, impressions=1000, clicks=10))
+    store.add("c2", {"age": "25-34", "gender": "female"}, InsightRow(spend=5, revenue=20))
+
+    by_gender = store.query(group_by=["gender"])
+    assert [g["gender"] for g in by_gender] == ["female", "male"]
+    assert by_gender[0]["spend"] == 35
+
+    c1_by_age = store.query(group_by=["age"], campaign_id="c1")
+    assert c1_by_age == [{
+        "age": "18-24", "spend": 40.0, "impressions": 2000.0, "clicks": 30.0,
+        "conversions": 0.0, "revenue": 0.0, "ctr": 1.5, "cpc": 40 / 30, "roas": 0.0,
+    }]
+
+    assert store.query(campaign_id="unknown") == []
+    assert len(store.query(top=1)) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_breakdown_insights_streams_all_pages(mock_settings):
+    """Every page is read and loaded into the store."""
+    pages = {
+        "first": {
+            "data": [
+                {"campaign_id": "c1", "publisher_platform": "facebook", "platform_position": "feed", "spend": "10"},
+                {"campaign_id": "c1", "publisher_platform": "instagram", "platform_position": "story", "spend": "4"},
+            ],
+            "paging": {"next": "https://graph.facebook.com/v24.0/c1/insights?after=x"},
+        },
+        "second": {
+            "data": [
+                {"campaign_id": "c1", "publisher_platform": "facebook", "platform_position": "feed", "spend": "6"},
+            ],
+        },
+    }
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = pages["second"] if "after=x" in str(request.url) else pages["first"]
+        return httpx.Response(200, content=json.dumps(page).encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            result = await get_breakdown_insights("placement", campaign_id="c1")
+
+    await client.aclose()
+
+    assert result['success'] is True
+    assert result['rows'] == 3
+    assert requests[0].url.path.endswith("/c1/insights")
+    assert requests[0].url.params["breakdowns"] == "publisher_platform,platform_position"
+
+    top = result['store'].query()[0]
+    assert (top["publisher_platform"], top["platform_position"], top["spend"]) == ("facebook", "feed", 16.0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_breakdown_insights_rejects_unknown_breakdown(mock_settings):
+    """Invalid breakdowns fail before calling Meta."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        result = await get_breakdown_insights("shoe_size")
+
+    assert result['success'] is False
+    assert "shoe_size" in result['error']
@@ -0,0 +1,248 @@
+"""
+Unit tests for the Graph API response cache and single-flight coalescing
+(app.tools.meta_cache).
+
+Run tests:
+    pytest backend/tests/test_meta_cache.py -v
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.tools.meta_cache import (
+    MetaResponseCache,
+    SingleFlight,
+    response_cache,
+    single_flight,
+    cache_key,
+)
+from app.tools.meta_api import (
+    list_campaigns,
+    get_campaign_insights,
+    get_campaign_insights_batch,
+    update_campaign_status,
+)
+
+
+@pytest.mark.unit
+def test_cache_key_ignores_param_order_and_isolates_accounts():
+    """Same call, same key; a different account never shares entries."""
+    url = "https://graph.facebook.com/v24.0/123/insights"
+
+    assert cache_key(url, {"a": 1, "b": 2}, "act_1") == cache_key(url, {"b": 2, "a": 1}, "act_1")
+    assert cache_key(url, {"a": 1}, "act_1") != cache_key(url, {"a": 1}, "act_2")
+
+
+@pytest.mark.unit
+def test_entries_expire_after_resource_ttl():
+    """Each resource uses its own TTL."""
+    cache = MetaResponseCache()
+
+    with patch('app.tools.meta_cache.time.monotonic', return_value=1000.0):
+        cache.set("campaigns", {"data": []}, "campaign")
+        cache.set("insights", {"data": []}, "insights")
+
+    # After the campaign TTL (60 s) but before the insights TTL (300 s)
+    with patch('app.tools.meta_cache.time.monotonic', return_value=1061.0):
+        assert cache.get("campaigns") is None
+        assert cache.get("insights") == {"data": []}
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.unit
+def test_lru_eviction_keeps_recently_used_entries():
+    """Past max_entries the least recently used entry is dropped."""
+    cache = MetaResponseCache()
+
+    with patch('app.tools.meta_cache.settings.meta_cache_max_entries', 2):
+        cache.set("a", 1, "campaign")
+        cache.set("b", 2, "campaign")
+        cache.get("a")
+        cache.set("c", 3, "campaign")
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_the_cache(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """The second identical read is answered without calling Meta."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=mock_meta_campaigns_response),
+                mock_httpx_response(json_data=mock_meta_insights_response),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            first = await list_campaigns()
+            second = await list_campaigns()
+            await get_campaign_insights("123", "today")
+            cached = await get_campaign_insights("123", "today")
+
+            assert mock_async_client.get.call_count == 2
+            assert second['campaigns'] == first['campaigns']
+            assert cached['insights'].spend == 250.50
+            assert response_cache.stats()["hits"] == 2
+            assert response_cache.stats()["hit_rate"] == 0.5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(
+    mock_settings,
+    mock_meta_error_response,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """A failed read is retried on the next call."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=mock_meta_error_response, status_code=400),
+                mock_httpx_response(json_data=mock_meta_insights_response),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            assert (await get_campaign_insights("123"))['success'] is False
+            assert (await get_campaign_insights("123"))['success'] is True
+            assert mock_async_client.get.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_status_update_invalidates_campaign_reads(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """Our own writes drop the cached lists and the campaign's insights."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=mock_meta_campaigns_response),
+                mock_httpx_response(json_data=mock_meta_insights_response),
+                mock_httpx_response(json_data=mock_meta_insights_response),
+                mock_httpx_response(json_data=mock_meta_campaigns_response),
+            ]
+            mock_async_client.post.return_value = mock_httpx_response(json_data={"success": True})
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            await list_campaigns()
+            await get_campaign_insights("123")
+            await get_campaign_insights("456")
+
+            await update_campaign_status("123", "PAUSED")
+
+            # 456 is untouched and still cached; the list and 123 are refetched
+            await get_campaign_insights("456")
+            await list_campaigns()
+            assert mock_async_client.get.call_count == 4
+            assert response_cache.stats()["invalidations"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_only_requests_uncached_campaigns(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """Campaigns already in the cache are left out of the /batch call."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = mock_httpx_response(
+                json_data=mock_meta_insights_response
+            )
+            mock_async_client.post.return_value = mock_httpx_response(json_data=[
+                {"code": 200, "body": json.dumps(mock_meta_insights_response)},
+            ])
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            await get_campaign_insights("c1", "last_7d")
+            result = await get_campaign_insights_batch(["c1", "c2"], "last_7d")
+
+            batch = json.loads(mock_async_client.post.call_args[1]['data']['batch'])
+            assert [op["relative_url"].split("/")[0] for op in batch] == ["c2"]
+            assert list(result['results']) == ["c1", "c2"]
+            assert all(r['success'] for r in result['results'].values())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_call(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """Simultaneous identical GETs make a single upstream request."""
+    release = asyncio.Event()
+
+    async def slow_get(*args, **kwargs):
+        await release.wait()
+        return mock_httpx_response(json_data=mock_meta_insights_response)
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = slow_get
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            pending = [
+                asyncio.create_task(get_campaign_insights("123", "last_7d"))
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*pending)
+
+            assert mock_async_client.get.call_count == 1
+            assert all(r == results[0] for r in results)
+            assert single_flight.stats()["upstream_calls"] == 1
+            assert single_flight.stats()["coalesced"] == 4
+            assert single_flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_cancellation():
+    """Waiters get the leader's error; cancelling one waiter keeps the call alive."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        raise RuntimeError("boom")
+
+    first = asyncio.create_task(flight.run("k", failing))
+    second = asyncio.create_task(flight.run("k", failing))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await second
+
+    assert calls == 1
+    assert flight.stats()["coalesced"] == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for the shared Graph API HTTP client (app.tools.meta_client).
+
+Run tests:
+    pytest backend/tests/test_meta_client.py -v
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.tools import meta_client
+from app.tools.meta_client import (
+    init_meta_client,
+    close_meta_client,
+    graph_client,
+    graph_url,
+    endpoint_timeout,
+)
+from app.tools.meta_api import get_campaign_insights
+
+
+@pytest.fixture
+async def shared_client():
+    """Initialize the process-wide client and close it after the test."""
+    client = await init_meta_client()
+    yield client
+    await close_meta_client()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_init_is_idempotent_and_close_resets(shared_client):
+    """Calling init twice returns the same client; close clears it."""
+    assert await init_meta_client() is shared_client
+
+    await close_meta_client()
+
+    assert shared_client.is_closed
+    assert meta_client._client is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_graph_client_yields_shared_client(shared_client):
+    """Inside the app lifespan every caller gets the same client."""
+    async with graph_client() as first:
+        async with graph_client() as second:
+            assert first is shared_client
+            assert second is shared_client
+
+    # Leaving the block must not close the shared client
+    assert not shared_client.is_closed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_graph_client_falls_back_to_ephemeral_client():
+    """Outside the lifespan a temporary client is created and closed."""
+    async with graph_client() as client:
+        assert isinstance(client, httpx.AsyncClient)
+        assert client is not meta_client._client
+
+    assert client.is_closed
+
+
+@pytest.mark.unit
+def test_endpoint_timeouts():
+    """Insights and copies get longer read timeouts than plain reads."""
+    default = endpoint_timeout()
+    insights = endpoint_timeout("insights")
+    copies = endpoint_timeout("copies")
+
+    assert insights.read > default.read
+    assert copies.read > insights.read
+    assert endpoint_timeout("unknown").read == default.read
+
+
+@pytest.mark.unit
+def test_graph_url_joins_paths():
+    """graph_url builds URLs on top of the configured API version."""
+    assert graph_url("act_1/campaigns").endswith("/v24.0/act_1/campaigns")
+    assert graph_url("/123/insights").endswith("/v24.0/123/insights")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_meta_api_reuses_shared_client(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """meta_api functions use the shared client instead of creating one."""
+    shared = AsyncMock()
+    shared.is_closed = False
+    shared.get.return_value = mock_httpx_response(json_data=mock_meta_insights_response)
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', shared):
+            with patch('httpx.AsyncClient') as mock_client:
+                await get_campaign_insights("123")
+                await get_campaign_insights("456")
+
+                mock_client.assert_not_called()
+                assert shared.get.call_count == 2
@@ -0,0 +1,175 @@
+"""
+Unit tests for the campaign hierarchy (app.tools.meta_hierarchy) and the
+nested-edge pagination in meta_api.load_campaign_hierarchy.
+
+Run tests:
+    pytest backend/tests/test_meta_hierarchy.py -v
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+import httpx
+
+from app.tools import meta_client
+from app.tools.meta_hierarchy import CampaignTree, split_nested_fields, join_nested_fields
+from app.tools.meta_records import Campaign, AdSet, Ad
+from app.tools.meta_api import get_campaign_details, load_campaign_hierarchy
+
+
+@pytest.mark.unit
+def test_split_nested_fields_round_trip():
+    """Nested edges are split from plain fields and re-joined with a page size."""
+    plain, nested = split_nested_fields("id,name,adsets.limit(10){id,targeting{geo}},ads{id,name}")
+
+    assert plain == "id,name"
+    assert nested == {"adsets": "id,targeting{geo}", "ads": "id,name"}
+    assert join_nested_fields(plain, nested, 100) == (
+        "id,name,adsets.limit(100){id,targeting{geo}},ads.limit(100){id,name}"
+    )
+
+
+@pytest.mark.unit
+def test_campaign_tree_indexes_by_id_and_parent():
+    """Ads hang under their ad set; repeated objects are not duplicated."""
+    tree = CampaignTree(Campaign("c1", "Campanha"), ("adsets", "ads"))
+    tree.add(AdSet("a1"))
+    tree.add(AdSet("a2"))
+    tree.add(Ad("x1", adset_id="a1"))
+    tree.add(Ad("x2"), "a2")
+    tree.add(Ad("x2", "atualizado"), "a2")
+
+    assert [a.id for a in tree.adsets()] == ["a1", "a2"]
+    assert [a.id for a in tree.ads("a1")] == ["x1"]
+    assert tree.get("x2").name == "atualizado"
+    assert tree.parent("x2").id == "a2"
+    assert len(tree.ads()) == 2
+
+    campaign = tree.to_dict()
+    assert campaign["name"] == "Campanha"
+    assert [a.id for a in campaign["ads"]["data"]] == ["x1", "x2"]
+    assert "paging" not in campaign["adsets"]
+
+
+class FakeHierarchyGraph:
+    """
+    Campaign c1 with 4 ad sets (2 per page) and 3 ads per ad set (2 per
+    page). Nested edges only carry their first page, like the Graph API.
+    """
+
+    def __init__(self, fail_adset: str = None):
+        self.fail_adset = fail_adset
+        self.paths = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        parts = request.url.path.strip("/").split("/")
+        page = int(request.url.params.get("page", 1))
+
+        if parts[-1] == "c1":
+            return self._json({
+                "id": "c1",
+                "name": "Black Friday",
+                "status": "ACTIVE",
+                "adsets": self._page("c1/adsets", ["a1", "a2"], 2),
+                "ads": self._page("c1/ads", ["a1_x1", "a1_x2"], 2),
+            })
+        if parts[-1] == "adsets":
+            return self._json(self._page("c1/adsets", ["a3", "a4"], None))
+
+        adset_id = parts[-2]
+        if adset_id == self.fail_adset:
+            return self._json({"error": {"message": "Invalid parameter", "code": 100}}, 400)
+        if page == 1:
+            return self._json(self._page(f"{adset_id}/ads", [f"{adset_id}_x1", f"{adset_id}_x2"], 2))
+        return self._json(self._page(f"{adset_id}/ads", [f"{adset_id}_x3"], None))
+
+    @staticmethod
+    def _page(path: str, ids: list, next_page) -> dict:
+        page = {"data": [{"id": i, "name": i, "status": "ACTIVE"} for i in ids], "paging": {}}
+        if next_page:
+            page["paging"]["next"] = f"https://graph.test/{path}?page={next_page}"
+        return page
+
+    @staticmethod
+    def _json(body: dict, status_code: int = 200) -> httpx.Response:
+        return httpx.Response(status_code, content=json.dumps(body).encode())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hierarchy_follows_nested_cursors(mock_settings):
+    """Every ad set and ad is loaded, ads fetched per ad set under the concurrency cap."""
+    graph = FakeHierarchyGraph()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            result = await load_campaign_hierarchy("c1", max_concurrency=2)
+
+    await client.aclose()
+
+    assert result["success"] is True
+    assert result["partial"] is False
+    assert result["adsets_total"] == 4
+    assert result["ads_total"] == 12
+
+    tree = result["tree"]
+    assert [a.id for a in tree.adsets()] == ["a1", "a2", "a3", "a4"]
+    assert [a.id for a in tree.ads("a3")] == ["a3_x1", "a3_x2", "a3_x3"]
+    assert tree.parent("a4_x3").id == "a4"
+    # The campaign-level ads cursor is replaced by per-ad-set cursors
+    assert not any(path.endswith("/c1/ads") for path in graph.paths)
+    assert graph.peak == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hierarchy_requests_large_nested_pages(mock_settings):
+    """The first request asks for meta_hierarchy_page_size items per nested edge."""
+    graph = FakeHierarchyGraph()
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return graph(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            await load_campaign_hierarchy("c1", fields="dashboard")
+
+    await client.aclose()
+
+    fields = requests[0].url.params["fields"]
+    assert "adsets.limit(100){id,name,status,daily_budget}" in fields
+    assert "ads.limit(100){id,name,status,adset_id}" in fields
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_campaign_details_reports_partial_hierarchy(mock_settings):
+    """A failing ad set cursor keeps the rest and flags the result as partial."""
+    graph = FakeHierarchyGraph(fail_adset="a2")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            result = await get_campaign_details("c1")
+
+    await client.aclose()
+
+    assert result["success"] is True
+    assert result["partial"] is True
+    assert result["error"] == "Invalid parameter"
+    assert len(result["campaign"]["adsets"]["data"]) == 4
+    assert result["ads_total"] == 9
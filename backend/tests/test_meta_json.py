@@ -0,0 +1,133 @@
+"""
+Unit tests for JSON decoding of Graph API responses (app.tools.meta_json)
+and the streaming paginated readers built on it.
+
+Run tests:
+    pytest backend/tests/test_meta_json.py -v
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+import httpx
+
+from app.tools import meta_client
+from app.tools.meta_json import StreamedPage, decode_json
+from app.tools.meta_api import iter_campaigns, MetaAPIError
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body delivered in small chunks, like a slow network."""
+
+    def __init__(self, body: bytes, chunk_size: int = 7):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+def _page(campaigns: list, next_url: str = None) -> bytes:
+    payload = {"data": campaigns}
+    if next_url:
+        payload["paging"] = {"cursors": {"after": "x"}, "next": next_url}
+    return json.dumps(payload).encode()
+
+
+@pytest.mark.unit
+def test_decode_json_matches_stdlib(mock_httpx_response):
+    """The fast decoder returns the same objects as response.json()."""
+    response = mock_httpx_response(json_data={"data": [{"id": "1", "spend": 1.5}]})
+
+    assert decode_json(response) == {"data": [{"id": "1", "spend": 1.5}]}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_streamed_page_yields_records_across_chunks():
+    """Records split over many chunks are rebuilt intact, paging is captured."""
+    campaigns = [{"id": str(i), "name": f"Camp {i}", "daily_budget": 1000 + i} for i in range(20)]
+    response = httpx.Response(200, stream=ChunkedStream(_page(campaigns, "https://next")))
+
+    page = StreamedPage(response)
+    records = [r async for r in page.records()]
+
+    assert records == campaigns
+    assert page.next_url == "https://next"
+    assert page.error is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_streamed_page_reports_graph_error():
+    """An error body is exposed on page.error instead of records."""
+    body = json.dumps({"error": {"message": "Invalid", "code": 100, "error_subcode": 33}}).encode()
+    page = StreamedPage(httpx.Response(400, stream=ChunkedStream(body)))
+
+    assert [r async for r in page.records()] == []
+    assert page.error == {"message": "Invalid", "code": 100, "error_subcode": 33}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_streamed_page_without_ijson_falls_back():
+    """Without ijson the page is read whole and behaves the same."""
+    campaigns = [{"id": "1"}, {"id": "2"}]
+    response = httpx.Response(200, stream=ChunkedStream(_page(campaigns, "https://next")))
+
+    with patch('app.tools.meta_json.HAS_IJSON', False):
+        page = StreamedPage(response)
+        records = [r async for r in page.records()]
+
+    assert records == campaigns
+    assert page.next_url == "https://next"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_streams_all_pages(mock_settings):
+    """The streaming reader follows paging.next and yields every campaign."""
+    first = [{"id": str(i), "status": "ACTIVE"} for i in range(3)]
+    second = [{"id": str(i), "status": "ACTIVE"} for i in range(3, 5)]
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "after=x" in str(request.url):
+            return httpx.Response(200, stream=ChunkedStream(_page(second)))
+        next_url = "https://graph.facebook.com/v24.0/act_123456789/campaigns?after=x"
+        return httpx.Response(200, stream=ChunkedStream(_page(first, next_url)))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            ids = [c.id async for c in iter_campaigns(page_size=3, stream=True)]
+
+    await client.aclose()
+
+    assert ids == ["0", "1", "2", "3", "4"]
+    assert len(requests) == 2
+    assert requests[0].url.params["limit"] == "3"
+    assert requests[0].headers["Authorization"].startswith("Bearer ")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_campaigns_stream_raises_meta_error(mock_settings):
+    """A Graph error on a streamed page is raised as MetaAPIError."""
+    body = json.dumps({"error": {"message": "Invalid token", "code": 190}}).encode()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(400, content=body)
+    ))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch.object(meta_client, '_client', client):
+            with pytest.raises(MetaAPIError) as exc:
+                async for _ in iter_campaigns(stream=True):
+                    pass
+
+    await client.aclose()
+
+    assert exc.value.code == 190
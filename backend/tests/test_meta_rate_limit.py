@@ -0,0 +1,189 @@
+"""
+Unit tests for the adaptive Meta rate limiter (app.tools.meta_rate_limit).
+
+Run tests:
+    pytest backend/tests/test_meta_rate_limit.py -v
+"""
+
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.tools.meta_rate_limit import rate_limiters, MetaRateLimiter, MetaRateLimitError
+from app.tools.meta_api import list_campaigns
+
+
+def _buc_header(call_count: float, regain_minutes: float = 0) -> dict:
+    """Build an X-Business-Use-Case-Usage header."""
+    return {
+        "X-Business-Use-Case-Usage": json.dumps({
+            "1234": [{
+                "type": "ads_management",
+                "call_count": call_count,
+                "total_cputime": 1,
+                "total_time": 1,
+                "estimated_time_to_regain_access": regain_minutes,
+            }]
+        })
+    }
+
+
+@pytest.mark.unit
+def test_reads_highest_usage_from_all_headers(mock_httpx_response):
+    """The limiter tracks the highest percentage across the usage headers."""
+    limiter = MetaRateLimiter()
+    response = mock_httpx_response(
+        json_data={"data": []},
+        headers={
+            "X-App-Usage": json.dumps({"call_count": 12, "total_cputime": 30, "total_time": 8}),
+            "X-Ad-Account-Usage": json.dumps({"acc_id_util_pct": 41.5, "reset_time_duration": 0}),
+        },
+    )
+
+    assert limiter.observe(response) is None
+    assert limiter.usage_pct == 41.5
+
+
+@pytest.mark.unit
+def test_pacing_is_free_at_low_usage_and_grows_smoothly():
+    """No delay below the slowdown threshold, then a monotonic ramp."""
+    limiter = MetaRateLimiter()
+    delays = []
+    for usage in (10, 50, 60, 75, 90, 100):
+        limiter.usage_pct = usage
+        delays.append(limiter.pacing_delay())
+
+    assert delays[0] == 0
+    assert delays[1] == 0
+    assert delays == sorted(delays)
+    assert delays[-1] > delays[2] > 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_acquire_does_not_wait_at_low_usage():
+    """At low usage acquire() never sleeps."""
+    rate_limiter = MetaRateLimiter()
+
+    with patch('app.tools.meta_rate_limit.asyncio.sleep', new_callable=AsyncMock) as sleep:
+        for _ in range(10):
+            await rate_limiter.acquire()
+
+        sleep.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_acquire_spaces_calls_under_pressure():
+    """Concurrent callers are spaced out instead of bursting together."""
+    rate_limiter = MetaRateLimiter()
+    rate_limiter.usage_pct = 100
+
+    with patch('app.tools.meta_rate_limit.asyncio.sleep', new_callable=AsyncMock) as sleep:
+        for _ in range(3):
+            await rate_limiter.acquire()
+
+        waits = [call.args[0] for call in sleep.call_args_list]
+        assert len(waits) == 2
+        assert waits[1] > waits[0] > 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_throttled_call_waits_and_retries(
+    mock_settings,
+    mock_meta_rate_limit_error,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """
+    When Meta sends estimated_time_to_regain_access, the call waits that
+    long and is retried instead of failing.
+    """
+    throttled = mock_httpx_response(
+        json_data=mock_meta_rate_limit_error,
+        status_code=400,
+        headers=_buc_header(100, regain_minutes=1),
+    )
+    ok = mock_httpx_response(json_data=mock_meta_campaigns_response, headers=_buc_header(20))
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [throttled, ok]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            with patch('app.tools.meta_rate_limit.asyncio.sleep', new_callable=AsyncMock) as sleep:
+                result = await list_campaigns()
+
+            assert result['success'] is True
+            assert len(result['campaigns']) == 3
+            assert mock_async_client.get.call_count == 2
+
+            # Waited for the regain time (1 minute) before retrying
+            sleep.assert_called_once()
+            assert 59 <= sleep.call_args.args[0] <= 60
+            assert rate_limiters.for_account("act_123456789").throttled_responses == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_throttled_call_without_regain_time_is_not_retried(
+    mock_settings,
+    mock_meta_rate_limit_error,
+    mock_httpx_response,
+):
+    """Without a regain estimate the error is surfaced as before."""
+    throttled = mock_httpx_response(json_data=mock_meta_rate_limit_error, status_code=400)
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = throttled
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await list_campaigns()
+
+            assert result['success'] is False
+            assert result['error_code'] == 80004
+            assert mock_async_client.get.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_long_block_fails_fast_instead_of_hanging(
+    mock_settings,
+    mock_meta_rate_limit_error,
+    mock_httpx_response,
+):
+    """
+    A regain time longer than meta_rate_limit_max_wait is not waited for,
+    neither by the throttled call nor by the next calls for the account.
+    """
+    throttled = mock_httpx_response(
+        json_data=mock_meta_rate_limit_error,
+        status_code=400,
+        headers=_buc_header(100, regain_minutes=30),
+    )
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.return_value = throttled
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            with patch('app.tools.meta_rate_limit.asyncio.sleep', new_callable=AsyncMock) as sleep:
+                first = await list_campaigns()
+                second = await list_campaigns()
+
+            assert first['success'] is False
+            assert second['success'] is False
+            assert 'Limite de requisições' in second['error']
+            assert mock_async_client.get.call_count == 1
+            sleep.assert_not_called()
+
+            limiter = rate_limiters.for_account("act_123456789")
+            assert limiter.stats()["rejected_calls"] == 1
+            with pytest.raises(MetaRateLimitError) as exc_info:
+                await limiter.acquire()
+            assert exc_info.value.retry_in > 1700
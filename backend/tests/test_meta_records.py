@@ -0,0 +1,99 @@
+"""
+Unit tests for the typed Meta records (app.tools.meta_records).
+
+Run tests:
+    pytest backend/tests/test_meta_records.py -v
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.main import app
+from app.tools.meta_records import Campaign, InsightRow
+
+
+@pytest.mark.unit
+def test_campaign_from_graph_converts_once():
+    """Budgets become integers (cents) and unknown keys are dropped."""
+    campaign = Campaign.from_graph({
+        "id": "1",
+        "name": "Black Friday",
+        "status": "PREPAUSED",
+        "daily_budget": "5000",
+        "adsets": {"data": []},
+    })
+
+    assert campaign.daily_budget == 5000
+    assert campaign.lifetime_budget is None
+    assert campaign.is_draft is True
+    assert campaign.to_dict() == {
+        "id": "1",
+        "name": "Black Friday",
+        "status": "PREPAUSED",
+        "daily_budget": 5000,
+    }
+
+
+@pytest.mark.unit
+def test_records_have_no_instance_dict():
+    """Slotted records cannot grow ad-hoc attributes."""
+    row = InsightRow(spend=1.0)
+
+    assert not hasattr(row, "__dict__")
+    with pytest.raises(AttributeError):
+        row.campaign = "1"
+
+
+@pytest.mark.unit
+def test_insight_row_derives_conversions_revenue_and_roas():
+    """actions and action_values are folded into numeric metrics in one pass."""
+    row = InsightRow.from_graph({
+        "campaign_id": "c1",
+        "campaign_name": "Camp 1",
+        "spend": "50.00",
+        "impressions": "1000",
+        "actions": [
+            {"action_type": "purchase", "value": "3"},
+            {"action_type": "link_click", "value": "40"},
+        ],
+        "action_values": [{"action_type": "purchase", "value": "150.00"}],
+    }, level="campaign")
+
+    assert row.object_id == "c1"
+    assert row.name == "Camp 1"
+    assert row.impressions == 1000
+    assert row.conversions == 3
+    assert row.revenue == 150.0
+    assert row.roas == 3.0
+    assert row.values(("spend", "conversions")) == (50.0, 3.0)
+
+
+@pytest.mark.unit
+def test_insight_row_projection_leaves_unrequested_metrics_unset():
+    """Only requested metrics (and those derived from them) are filled."""
+    row = InsightRow.from_graph({"spend": "20", "clicks": "4"}, fields="spend,clicks,action_values")
+
+    assert row.to_dict() == {"spend": 20.0, "clicks": 4, "revenue": 0.0, "roas": 0.0}
+    assert row.cpc is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_api_serializes_records_directly():
+    """Routes return records as-is; FastAPI turns them into JSON objects."""
+    fake = AsyncMock(return_value={
+        "success": True,
+        "total": 1,
+        "campaigns": [Campaign("1", "Black Friday", status="ACTIVE", daily_budget=5000)],
+    })
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with patch('app.api.campaigns.list_campaigns', fake):
+            response = await client.get("/api/campaigns/")
+
+    assert response.status_code == 200
+    campaign = response.json()["campaigns"][0]
+    assert campaign["id"] == "1"
+    assert campaign["daily_budget"] == 5000
@@ -0,0 +1,216 @@
+"""
+Unit tests for retries and the per-account circuit breaker
+(app.tools.meta_resilience, wired through app.tools.meta_client.send).
+
+Run tests:
+    pytest backend/tests/test_meta_resilience.py -v
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.tools.meta_resilience import (
+    CircuitBreaker,
+    MetaCircuitOpenError,
+    RetryBudget,
+    breakers,
+    retry_delay,
+    BREAKER_OPEN,
+    BREAKER_HALF_OPEN,
+    BREAKER_CLOSED,
+)
+from app.tools.meta_client import send
+from app.tools.meta_api import (
+    list_campaigns,
+    get_campaign_insights,
+    update_campaign_status,
+)
+
+
+SERVER_ERROR = {"error": {"message": "Service temporarily unavailable", "code": 2, "is_transient": True}}
+
+
+@pytest.mark.unit
+def test_retry_delay_grows_and_is_capped():
+    """Full jitter stays between zero and the exponential ceiling."""
+    with patch('app.tools.meta_resilience.random.uniform', side_effect=lambda low, high: high):
+        assert retry_delay(1) == 0.5
+        assert retry_delay(2) == 1.0
+        assert retry_delay(10) == 8.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_is_retried_after_server_error(
+    mock_settings,
+    mock_meta_insights_response,
+    mock_httpx_response,
+):
+    """A transient 5xx on a GET is retried and the call succeeds."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=SERVER_ERROR, status_code=503),
+                httpx.ConnectError("connection reset"),
+                mock_httpx_response(json_data=mock_meta_insights_response),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await get_campaign_insights("123")
+
+            assert result['success'] is True
+            assert mock_async_client.get.call_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_post_is_not_retried(mock_settings, mock_httpx_response):
+    """Writes are not idempotent, so a 5xx on POST is returned as is."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.post.return_value = mock_httpx_response(json_data=SERVER_ERROR, status_code=500)
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await update_campaign_status("123", "PAUSED")
+
+            assert result['success'] is False
+            assert mock_async_client.post.call_count == 1
+
+
+@pytest.mark.unit
+def test_retry_budget_limits_retries():
+    """Retries stop once the budget is spent and refill with new calls."""
+    budget = RetryBudget()
+    budget.tokens = 1
+
+    assert budget.withdraw() is True
+    assert budget.withdraw() is False
+
+    for _ in range(5):
+        budget.deposit()
+
+    assert budget.withdraw() is True
+    assert budget.stats()["exhausted"] == 1
+
+
+@pytest.mark.unit
+def test_breaker_opens_then_half_opens_after_timeout():
+    """Consecutive failures open the breaker; one trial call is let through later."""
+    breaker = CircuitBreaker("act_1")
+
+    with patch('app.tools.meta_resilience.time.monotonic', return_value=100.0):
+        for _ in range(5):
+            breaker.record_failure()
+        assert breaker.state == BREAKER_OPEN
+
+        with pytest.raises(MetaCircuitOpenError):
+            breaker.before_call()
+
+    with patch('app.tools.meta_resilience.time.monotonic', return_value=131.0):
+        breaker.before_call()
+        assert breaker.state == BREAKER_HALF_OPEN
+
+        # Only one trial at a time
+        with pytest.raises(MetaCircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == BREAKER_CLOSED
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancelled_trial_reopens_the_breaker(mock_httpx_response):
+    """A half-open trial that is cancelled must not leave the account stuck."""
+    breaker = breakers.for_account("act_1")
+    breaker.state = BREAKER_OPEN
+    breaker.opened_at = 0.0
+    client = AsyncMock()
+
+    async def hang(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    client.get.side_effect = hang
+
+    trial = asyncio.create_task(send(client, "get", "https://graph.test/1", "act_1"))
+    await asyncio.sleep(0.01)
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    # Counted as a failed trial: open again, with a new trial after the timeout
+    assert breaker.state == BREAKER_OPEN
+    breaker.opened_at = 0.0
+    client.get.side_effect = None
+    client.get.return_value = mock_httpx_response(json_data={"data": []})
+
+    response = await send(client, "get", "https://graph.test/1", "act_1")
+
+    assert response.status_code == 200
+    assert breaker.state == BREAKER_CLOSED
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_without_calling_meta(
+    mock_settings,
+    mock_httpx_response,
+):
+    """While Graph is degraded, calls for the account return immediately."""
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = httpx.ReadTimeout("timed out")
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            # 2 calls x 3 attempts: enough consecutive failures to open
+            await get_campaign_insights("1")
+            await get_campaign_insights("2")
+            calls_before = mock_async_client.get.call_count
+
+            result = await list_campaigns()
+
+            assert result['success'] is False
+            assert 'instável' in result['error']
+            assert mock_async_client.get.call_count == calls_before
+
+            state = breakers.stats()
+            assert any(b["state"] == BREAKER_OPEN for b in state.values())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_campaigns_flags_partial_results(
+    mock_settings,
+    mock_meta_campaigns_response,
+    mock_httpx_response,
+):
+    """A page that keeps failing after retries marks the result as partial."""
+    first_page = {
+        **mock_meta_campaigns_response,
+        "paging": {"next": "https://graph.facebook.com/v24.0/act_123456789/campaigns?after=x"},
+    }
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=first_page),
+                httpx.ReadTimeout("timed out"),
+                httpx.ReadTimeout("timed out"),
+                httpx.ReadTimeout("timed out"),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await list_campaigns(limit=100)
+
+            assert result['success'] is True
+            assert result['partial'] is True
+            assert result['has_more'] is True
+            assert len(result['campaigns']) == 3
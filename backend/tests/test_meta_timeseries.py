@@ -0,0 +1,127 @@
+"""
+Unit tests for daily insights series (app.tools.meta_timeseries) and the
+time_increment=1 fetcher in meta_api.
+
+Run tests:
+    pytest backend/tests/test_meta_timeseries.py -v
+"""
+
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.tools.meta_timeseries import DailySeries, DAILY_METRICS
+from app.tools.meta_api import get_daily_insights
+
+
+def _values(spend, impressions=0, clicks=0, reach=0, conversions=0, revenue=0):
+    return (spend, impressions, clicks, reach, conversions, revenue)
+
+
+@pytest.fixture
+def series():
+    """Two campaigns over four days, with a gap on 2026-01-02 for c2."""
+    return DailySeries.from_rows([
+        ("c1", "2026-01-01", _values(10, 1000, 10)),
+        ("c1", "2026-01-02", _values(20, 2000, 30)),
+        ("c1", "2026-01-04", _values(40, 1000, 10, revenue=120)),
+        ("c2", "2026-01-01", _values(5, 500, 5)),
+        ("c2", "2026-01-03", _values(15, 500, 5)),
+    ])
+
+
+@pytest.mark.unit
+def test_series_fills_day_range_and_missing_days(series):
+    """Days are contiguous and days without delivery read as zero."""
+    assert series.days == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]
+    assert series.series("c1", "spend") == [10, 20, 0, 40]
+    assert series.series("c2", "spend") == [5, 0, 15, 0]
+    assert series.value("c1", "2026-01-03", "clicks") == 0
+    assert series.value("unknown", "2026-01-01", "spend") == 0
+
+
+@pytest.mark.unit
+def test_series_rows_round_trip(series):
+    """rows() yields the days with delivery, in the from_rows format."""
+    rows = list(series.rows())
+
+    assert len(rows) == 5
+    assert rows[2] == ("c1", "2026-01-04", _values(40, 1000, 10, revenue=120))
+    assert DailySeries.from_rows(rows).to_dict() == series.to_dict()
+    assert len(list(series.rows(skip_empty=False))) == 8
+
+
+@pytest.mark.unit
+def test_series_is_a_single_flat_array(series):
+    """Storage is one float64 array: campaigns x days x metrics."""
+    assert len(series.data) == 2 * 4 * len(DAILY_METRICS)
+    assert series.nbytes() == len(series.data) * 8
+
+
+@pytest.mark.unit
+def test_totals_and_windows(series):
+    """Totals slice by campaign and by day window, with derived ratios."""
+    last_two = series.totals("c1", last=2)
+    assert last_two["spend"] == 40
+    assert last_two["days"] == 2
+    assert last_two["roas"] == 3.0
+
+    first_two = series.totals("c1", start="2026-01-01", end="2026-01-02")
+    assert first_two["spend"] == 30
+    assert first_two["ctr"] == pytest.approx(40 / 3000 * 100)
+    assert first_two["cpc"] == pytest.approx(30 / 40)
+
+    account = series.totals()
+    assert account["spend"] == 90
+    assert series.series("c2", "spend", last=2) == [15, 0]
+
+
+@pytest.mark.unit
+def test_requested_campaign_order_is_kept():
+    """Campaigns without rows still get a (zeroed) slot in the given order."""
+    series = DailySeries.from_rows(
+        [("c2", "2026-01-01", _values(1))],
+        campaign_ids=["c1", "c2"],
+    )
+
+    assert series.campaign_ids == ["c1", "c2"]
+    assert series.series("c1", "spend") == [0]
+    assert series.to_dict()["campaigns"]["c2"]["spend"] == [1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_daily_insights_requests_time_increment(mock_settings, mock_httpx_response):
+    """One paginated level=campaign call with time_increment=1 builds the series."""
+    page_1 = {
+        "data": [
+            {"campaign_id": "c1", "date_start": "2026-01-01", "spend": "10", "impressions": "100", "clicks": "2"},
+            {"campaign_id": "c1", "date_start": "2026-01-02", "spend": "12", "impressions": "120", "clicks": "3",
+             "action_values": [{"action_type": "purchase", "value": "48"}]},
+        ],
+        "paging": {"next": "https://graph.facebook.com/v24.0/act_123456789/insights?after=x"},
+    }
+    page_2 = {"data": [{"campaign_id": "c2", "date_start": "2026-01-02", "spend": "7"}]}
+
+    with patch('app.tools.meta_api.settings', mock_settings):
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.get.side_effect = [
+                mock_httpx_response(json_data=page_1),
+                mock_httpx_response(json_data=page_2),
+            ]
+            mock_client.return_value.__aenter__.return_value = mock_async_client
+
+            result = await get_daily_insights("last_7d", campaign_ids=["c1", "c2"])
+
+            params = mock_async_client.get.call_args_list[0][1]['params']
+            assert params['time_increment'] == 1
+            assert params['level'] == "campaign"
+            assert json.loads(params['filtering'])[0]['value'] == ["c1", "c2"]
+
+            assert result['success'] is True
+            assert result['pages_fetched'] == 2
+            series = result['series']
+            assert series.series("c1", "spend") == [10, 12]
+            assert series.series("c2", "spend") == [0, 7]
+            assert series.totals("c1")["revenue"] == 48
@@ -0,0 +1,48 @@
+"""
+Unit tests for the optimizer agent tools (app.agents.optimizer).
+
+Run tests:
+    pytest backend/tests/test_optimizer.py -v
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.agents.optimizer import create_optimizer_tools
+from app.tools.meta_records import Campaign, InsightRow
+
+
+def _tool(name: str):
+    return next(tool for tool in create_optimizer_tools() if tool.__name__ == name)
+
+
+def _insights(spend: float, ctr: float, revenue: float) -> InsightRow:
+    return InsightRow(spend=spend, ctr=ctr, revenue=revenue, roas=revenue / spend if spend else 0.0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_underperformers_ignore_roas_without_revenue():
+    """Lead-gen/traffic campaigns (no revenue actions) are judged by CTR, not by ROAS 0x."""
+    campaigns = [
+        Campaign("1", "Leads - bom CTR"),
+        Campaign("2", "Leads - CTR baixo"),
+        Campaign("3", "Loja - ROAS baixo"),
+    ]
+    insights = {
+        "1": _insights(100.0, 2.0, 0.0),
+        "2": _insights(100.0, 0.3, 0.0),
+        "3": _insights(100.0, 2.0, 50.0),
+    }
+
+    with patch('app.agents.optimizer.list_campaigns',
+               AsyncMock(return_value={"success": True, "campaigns": campaigns})), \
+         patch('app.agents.optimizer.get_account_insights_by_object',
+               AsyncMock(return_value={"success": True, "insights": insights})):
+        report = await _tool("tool_identify_underperformers")()
+
+    assert "2 campanha(s)" in report
+    assert "Leads - bom CTR" not in report
+    assert "Motivo: CTR muito baixo" in report
+    assert "ROAS 0.50x abaixo da meta" in report
+    assert "ROAS 0.00x" not in report
@@ -0,0 +1,230 @@
+"""
+Tests for the Meta webhook receiver (app.api.webhooks, app.webhooks).
+
+Notifications come from a local simulator that builds and signs payloads
+the way Meta does, so no public endpoint is needed.
+
+Run tests:
+    pytest backend/tests/test_webhooks.py -v
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+import httpx
+
+from app.config import settings
+from app.main import app
+from app.sync_state import sync_state
+from app.webhooks import ChangeRefresher, change_refresher, parse_notification, verify_signature
+
+
+APP_SECRET = "test-app-secret"
+VERIFY_TOKEN = "test-verify-token"
+
+
+class MetaWebhookSimulator:
+    """Builds signed ad-account change notifications and posts them to the app."""
+
+    def __init__(self, client: httpx.AsyncClient, secret: str = APP_SECRET):
+        self.client = client
+        self.secret = secret
+
+    @staticmethod
+    def notification(account_id: str, *objects: tuple) -> dict:
+        """objects: (object_id, level) pairs, level as Meta sends it (CAMPAIGN, AD_SET, AD)."""
+        return {
+            "object": "ad_account",
+            "entry": [{
+                "id": account_id,
+                "time": 1768046400,
+                "changes": [
+                    {
+                        "field": "in_process_ad_objects",
+                        "value": {"id": object_id, "level": level, "status_name": "Em processamento"},
+                    }
+                    for object_id, level in objects
+                ],
+            }],
+        }
+
+    def sign(self, body: bytes) -> str:
+        return "sha256=" + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+
+    async def send(self, payload: dict, signature: str = None) -> httpx.Response:
+        body = json.dumps(payload).encode()
+        return await self.client.post(
+            "/api/webhooks/meta",
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-Hub-Signature-256": signature if signature is not None else self.sign(body),
+            },
+        )
+
+
+@pytest.fixture
+def webhook_settings():
+    with patch.object(settings, 'meta_app_secret', APP_SECRET), \
+         patch.object(settings, 'meta_webhook_verify_token', VERIFY_TOKEN), \
+         patch.object(settings, 'meta_access_token', "test_token"), \
+         patch.object(settings, 'meta_ad_account_ids', "act_1,act_2"):
+        yield settings
+
+
+@pytest.fixture
+async def simulator(webhook_settings):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield MetaWebhookSimulator(client)
+
+
+def graph_campaign(campaign_id: str, status: str = "PAUSED", daily_budget: str = "5000") -> dict:
+    return {
+        "id": campaign_id,
+        "name": f"Campanha {campaign_id}",
+        "status": status,
+        "effective_status": status,
+        "daily_budget": daily_budget,
+        "updated_time": "2026-01-10T12:00:00+0000",
+    }
+
+
+# =============================================================================
+# Handshake and signatures
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_verification_handshake_echoes_the_challenge(simulator):
+    params = {"hub.mode": "subscribe", "hub.verify_token": VERIFY_TOKEN, "hub.challenge": "1158201444"}
+    response = await simulator.client.get("/api/webhooks/meta", params=params)
+
+    assert response.status_code == 200
+    assert response.text == "1158201444"
+
+    params["hub.verify_token"] = "wrong"
+    assert (await simulator.client.get("/api/webhooks/meta", params=params)).status_code == 403
+
+
+@pytest.mark.unit
+def test_verify_signature():
+    body = b'{"object": "ad_account"}'
+    signature = "sha256=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+    assert verify_signature(body, signature, "secret") is True
+    assert verify_signature(body + b" ", signature, "secret") is False
+    assert verify_signature(body, signature.replace("sha256=", "sha1="), "secret") is False
+    assert verify_signature(body, None, "secret") is False
+    # Without an app secret nothing is accepted
+    assert verify_signature(body, signature, "") is False
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unsigned_notifications_are_rejected(simulator):
+    payload = simulator.notification("1", ("c1", "CAMPAIGN"))
+
+    response = await simulator.send(payload, signature="sha256=" + "0" * 64)
+
+    assert response.status_code == 403
+    assert change_refresher.pending == 0
+
+
+# =============================================================================
+# Notifications -> targeted re-fetch -> store
+# =============================================================================
+
+@pytest.mark.unit
+def test_parse_notification_keeps_known_levels():
+    payload = MetaWebhookSimulator.notification(
+        "123", ("c1", "CAMPAIGN"), ("s1", "AD_SET"), ("a1", "AD"), ("x1", "CREATIVE")
+    )
+
+    changes = parse_notification(payload)
+
+    assert [(c.account_id, c.object_id, c.level) for c in changes] == [
+        ("act_123", "c1", "campaign"),
+        ("act_123", "s1", "adset"),
+        ("act_123", "a1", "ad"),
+    ]
+    assert parse_notification({"object": "page", "entry": [{"id": "1"}]}) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_notifications_refetch_only_affected_objects(simulator, metrics_store):
+    """Repeated changes are coalesced and re-read in one /batch call."""
+    await simulator.send(simulator.notification("1", ("c1", "CAMPAIGN"), ("s1", "AD_SET")))
+    response = await simulator.send(simulator.notification("1", ("c1", "CAMPAIGN")))
+
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "changes": 1, "queued": 1}
+    assert change_refresher.pending == 2
+
+    batch = AsyncMock(return_value=[
+        {"success": True, "data": graph_campaign("c1", "PAUSED")},
+        {"success": True, "data": {"id": "s1", "campaign": graph_campaign("c2", "ACTIVE", "12000")}},
+    ])
+    with patch('app.tools.meta_api.graph_batch', batch):
+        results = await change_refresher.drain()
+
+    operations = batch.call_args.args[0]
+    assert [op["relative_url"].split("?")[0] for op in operations] == ["c1", "s1"]
+    assert "fields=campaign%7B" in operations[1]["relative_url"]
+
+    assert results["act_1"]["campaigns_refreshed"] == 2
+    stored = {c["campaign_id"]: c for c in await metrics_store.campaigns("act_1")}
+    assert (stored["c1"]["status"], stored["c2"]["daily_budget"]) == ("PAUSED", 12000)
+    assert sync_state.for_account("act_1").campaign_ids == {"c1", "c2"}
+    assert change_refresher.pending == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unknown_accounts_are_ignored(simulator):
+    response = await simulator.send(simulator.notification("999", ("c1", "CAMPAIGN")))
+
+    assert response.json()["queued"] == 0
+    assert change_refresher.stats()["ignored"] == 1
+    assert await change_refresher.drain() == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_refetch_is_reported(simulator, metrics_store):
+    await simulator.send(simulator.notification("2", ("c9", "CAMPAIGN")))
+
+    batch = AsyncMock(return_value=[{"success": False, "error": "(#100) Object does not exist"}])
+    with patch('app.tools.meta_api.graph_batch', batch):
+        results = await change_refresher.drain()
+
+    assert results["act_2"] == {"success": False, "error": "(#100) Object does not exist"}
+    assert change_refresher.stats()["last_error"] == "act_2: (#100) Object does not exist"
+    assert await metrics_store.campaigns("act_2") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_background_loop_debounces_and_refreshes(webhook_settings, metrics_store):
+    refresher = ChangeRefresher()
+    batch = AsyncMock(return_value=[{"success": True, "data": graph_campaign("c1")}])
+
+    with patch('app.tools.meta_api.graph_batch', batch), \
+         patch.object(settings, 'meta_webhook_debounce', 0.01):
+        refresher.start()
+        try:
+            refresher.enqueue(parse_notification(MetaWebhookSimulator.notification("1", ("c1", "CAMPAIGN"))))
+            for _ in range(100):
+                if refresher.refreshes:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await refresher.stop()
+
+    assert refresher.refreshes == 1
+    assert refresher.campaigns_refreshed == 1
+    assert [c["campaign_id"] for c in await metrics_store.campaigns("act_1")] == ["c1"]